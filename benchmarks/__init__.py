@@ -0,0 +1,8 @@
+import os
+
+import django
+
+
+def setup():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'django_forest.tests.settings')
+    django.setup()
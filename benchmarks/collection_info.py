@@ -0,0 +1,102 @@
+"""
+Request-time schema lookups: scanning the schema dicts against the typed collection views.
+
+    python -m benchmarks.collection_info
+"""
+import tracemalloc
+
+from benchmarks import setup
+
+setup()
+
+from django_forest.resources.utils.json_api_serializer import JsonApiSerializerMixin  # noqa: E402
+from django_forest.resources.utils.smart_field import SmartFieldMixin  # noqa: E402
+from django_forest.utils.models import Models  # noqa: E402
+from django_forest.utils.schema import Schema  # noqa: E402
+from django_forest.utils.schema.collection_info import CollectionInfo, get_collection_info  # noqa: E402
+
+from benchmarks.utils import measure, print_results  # noqa: E402
+
+RESOURCE = 'tests_choice'
+
+QS = {'fields': {RESOURCE: ['id', 'choice_text', 'question'], 'question': 'question_text'}}
+
+
+class DictSerializer:
+    """The field selection on the schema dicts, as done before the typed views."""
+
+    def get_include_data(self, fields):
+        relationships = [x['field'] for x in fields if x['reference'] and x['relationship'] in ['BelongsTo', 'HasOne']]
+        smart_relationships = [x['field'] for x in fields
+                               if x['is_virtual'] and x['reference'] and not isinstance(x['type'], list)]
+        return relationships + smart_relationships
+
+    def get_fields_for_collection(self, collection, required_fields=None):
+        collection_fields = collection['fields']
+        if required_fields:
+            collection_fields = list(filter(lambda f: f['field'] in required_fields, collection_fields))
+            pk_field = Models.get_metadata(Models.get(collection['name'])).pk
+            if 'id' in required_fields and pk_field.name != 'id':
+                pk_field = next(filter(lambda f: f['field'] == pk_field.name, collection['fields']))
+                collection_fields.append(pk_field)
+        return collection_fields
+
+    def get_fields(self, collection, qs):
+        name = collection['name']
+        fields = {name: self.get_fields_for_collection(collection, qs['fields'].get(name))}
+        for field in fields[name]:
+            nested_required_fields = qs['fields'].get(field['field'])
+            if nested_required_fields and not field['is_virtual']:
+                nested = Schema.get_collection(field['reference'].split('.')[0])
+                fields[field['field']] = self.get_fields_for_collection(nested, [nested_required_fields])
+        return fields
+
+    def get_smart_fields(self, collection, params):
+        queried_fields = params.get('fields', {}).get(collection['name'])
+        return [x for x in collection['fields'] if x.get('is_virtual') and x['field'] in set(queried_fields)]
+
+
+def get_memory(build):
+    tracemalloc.start()
+    try:
+        result = build()
+        return tracemalloc.get_traced_memory()[0], result
+    finally:
+        tracemalloc.stop()
+
+
+def run(number=10000):
+    Schema.build_schema()
+    Models.build()
+    collection = Schema.get_collection(RESOURCE)
+    info = get_collection_info(RESOURCE)
+    dict_serializer, serializer, smart_fields = DictSerializer(), JsonApiSerializerMixin(), SmartFieldMixin()
+
+    lookups = {
+        'include data': (lambda: dict_serializer.get_include_data(collection['fields']),
+                         lambda: serializer.get_include_data(info.fields)),
+        'fields selection': (lambda: dict_serializer.get_fields(Schema.get_collection(RESOURCE), QS),
+                             lambda: serializer.get_fields(get_collection_info(RESOURCE), QS)),
+        'smart fields': (lambda: dict_serializer.get_smart_fields(collection, QS),
+                         lambda: smart_fields._get_smart_fields_for_request(info, QS)),
+    }
+    results = {}
+    for name, (scan, typed) in lookups.items():
+        results[f'{name} (dicts)'] = measure(scan, number=number)
+        results[f'{name} (typed)'] = measure(typed, number=number)
+    return results
+
+
+def print_memory():
+    collections = Schema.schema['collections']
+    size, _ = get_memory(lambda: Schema.build_schema())
+    info_size, _ = get_memory(lambda: [CollectionInfo(x) for x in collections])
+    fields = sum(len(x['fields']) for x in collections)
+    print(f'Schema memory ({len(collections)} collections, {fields} fields)')
+    print(f'  {"schema dicts":<40} {size / 1024:10.1f} KiB {size / fields:8.0f} B/field')
+    print(f'  {"typed views":<40} {info_size / 1024:10.1f} KiB {info_size / fields:8.0f} B/field')
+
+
+if __name__ == '__main__':
+    print_results(f'Schema lookups ({RESOURCE})', run(), unit='us')
+    print_memory()
@@ -0,0 +1,61 @@
+"""
+Compare benchmark results to a baseline, exit with an error on regressions.
+
+    python -m benchmarks.compare baseline.json results.json --threshold 0.2
+
+Timings are compared on their minimum by default, the least sensitive to the noise of the machine.
+"""
+import argparse
+import sys
+
+from benchmarks.utils import load_results
+
+
+def compare(baseline, results, threshold, stat='min'):
+    rows = []
+    for name, timing in results.items():
+        if name not in baseline:
+            rows.append((name, None, timing[stat], None, 'new'))
+            continue
+        ratio = timing[stat] / baseline[name][stat] - 1
+        status = 'ok'
+        if ratio > threshold:
+            status = 'REGRESSION'
+        elif ratio < -threshold:
+            status = 'improvement'
+        rows.append((name, baseline[name][stat], timing[stat], ratio, status))
+    return rows
+
+
+def format_ms(value):
+    return f'{value * 1000:10.3f} ms' if value is not None else f"{'-':>13}"
+
+
+def print_rows(rows):
+    print(f"  {'':<40} {'baseline':>13} {'current':>13} {'change':>8}")
+    for name, before, after, ratio, status in rows:
+        change = f'{ratio:+8.1%}' if ratio is not None else f"{'-':>8}"
+        print(f'  {name:<40} {format_ms(before)} {format_ms(after)} {change}  {status}')
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(description='Compare benchmark results to a baseline.')
+    parser.add_argument('baseline')
+    parser.add_argument('results')
+    parser.add_argument('--threshold', type=float, default=0.2, help='relative slowdown flagged as a regression')
+    parser.add_argument('--stat', choices=('min', 'median'), default='min')
+    return parser
+
+
+if __name__ == '__main__':
+    args = get_parser().parse_args()
+    baseline, results = load_results(args.baseline), load_results(args.results)
+    for key in ('environment', 'meta'):
+        if baseline[key] != results[key]:
+            print(f'Warning: different {key}, {baseline[key]} != {results[key]}')
+    rows = compare(baseline['results'], results['results'], args.threshold, args.stat)
+    print_rows(rows)
+    regressions = [x[0] for x in rows if x[4] == 'REGRESSION']
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
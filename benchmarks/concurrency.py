@@ -0,0 +1,305 @@
+"""
+Stress of the Forest Admin caches (permissions, scopes, IP whitelist) from many threads.
+
+    python -m benchmarks.concurrency --threads 32 --duration 5 --latency 0.02 --error-rate 0.05
+
+The Forest Admin API is a local HTTP server, with a latency, a rate of failed responses and payloads
+changing every `--change-interval` seconds. The caches expire every `--expiration` seconds and the scopes
+are invalidated at random, to keep the refreshes going.
+
+Each rendering allows its own user and its own live query only, and scopes its own records: any answer
+of another rendering is a leak. The IP whitelist always allows 127.0.0.1: a denial is a partial state.
+Exits with 1 on any incorrect answer.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks import setup
+
+setup()
+
+from django.conf import settings  # noqa: E402
+from django.test import RequestFactory, override_settings  # noqa: E402
+
+from django_forest.middleware.ip_whitelist import IpWhitelistMiddleware  # noqa: E402
+from django_forest.utils.ip_whitelist import IpWhitelist  # noqa: E402
+from django_forest.utils.permissions import Permission  # noqa: E402
+from django_forest.utils.scope import ScopeManager  # noqa: E402
+
+CLIENT_IP = '127.0.0.1'
+
+IP_WHITELIST_MIDDLEWARE = IpWhitelistMiddleware(None)
+
+
+def get_permissions(rendering_id, version):
+    return {
+        'data': {
+            'collections': {
+                'tests_question': {
+                    'collection': {
+                        'browseEnabled': [rendering_id],
+                        # Notice: changes with the version, never checked
+                        'exportEnabled': [rendering_id] if version % 2 else [],
+                    },
+                    'actions': {},
+                },
+            },
+            'renderings': {},
+        },
+        'stats': {'queries': [f'SELECT {rendering_id}']},
+    }
+
+
+def get_scopes(rendering_id, version, users):
+    return {
+        'tests_question': {
+            'scope': {
+                'filter': {'aggregator': 'and', 'conditions': [
+                    {'field': 'rendering', 'operator': 'equal', 'value': rendering_id},
+                    {'field': 'owner', 'operator': 'equal', 'value': '$currentUser.tags.owner'},
+                    {'field': 'version', 'operator': 'equal', 'value': version},
+                ]},
+                'dynamicScopesValues': {'users': {
+                    str(user_id): {'$currentUser.tags.owner': f'{rendering_id}:{user_id}'} for user_id in users
+                }},
+            },
+        },
+    }
+
+
+def get_ip_whitelist(version):
+    # Notice: enabled on odd versions, the client ip is always whitelisted
+    enabled = bool(version % 2)
+    return {'data': {'attributes': {
+        'use_ip_whitelist': enabled,
+        'rules': [{'type': 0, 'ip': CLIENT_IP}] if enabled else [],
+    }}}
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class StubForestApi:
+    """Local Forest Admin API, counting the calls by route."""
+
+    def __init__(self, users, latency=0.0, error_rate=0.0, change_interval=0.2):
+        self.users = users
+        self.latency = latency
+        self.error_rate = error_rate
+        self.change_interval = change_interval
+        self.started_at = time.monotonic()
+        self.calls = Counter()
+        self.lock = threading.Lock()
+        self.random = random.Random(42)
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self.get_handler())
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server.server_address[1]}'
+
+    @property
+    def version(self):
+        return int((time.monotonic() - self.started_at) / self.change_interval)
+
+    def get_data(self, route, query):
+        rendering_id = int(query.get('renderingId', ['0'])[0])
+        if route == '/liana/v3/permissions':
+            return get_permissions(rendering_id, self.version)
+        if route == '/liana/scopes':
+            return get_scopes(rendering_id, self.version, self.users)
+        if route == '/liana/v1/ip-whitelist-rules':
+            return get_ip_whitelist(self.version)
+        return None
+
+    def respond(self, path):
+        url = urlparse(path)
+        with self.lock:
+            self.calls[url.path] += 1
+            failed = self.random.random() < self.error_rate
+        time.sleep(self.latency)
+        data = self.get_data(url.path, parse_qs(url.query))
+        if data is None or failed:
+            return 500, {'errors': [{'detail': 'stub error'}]}
+        return 200, data
+
+    def get_handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status, data = api.respond(self.path)
+                body = json.dumps(data).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def check_permission(rng, renderings, users):
+    rendering_id, user_id = rng.choice(renderings), rng.choice(users)
+    allowed = Permission.is_authorized(Permission('tests_question', 'browseEnabled', rendering_id, user_id))
+    return allowed == (user_id == rendering_id)
+
+
+def check_live_query(rng, renderings, users):
+    rendering_id, query_rendering_id = rng.choice(renderings), rng.choice(renderings)
+    permission = Permission('tests_question', 'liveQueries', rendering_id, rng.choice(users),
+                            query_request_info=f'SELECT {query_rendering_id}')
+    return Permission.is_authorized(permission) == (rendering_id == query_rendering_id)
+
+
+def check_scope(rng, renderings, users):
+    rendering_id, user_id = rng.choice(renderings), rng.choice(users)
+    token = {'id': user_id, 'rendering_id': rendering_id}
+    conditions = ScopeManager.get_scope_for_user(token, 'tests_question')['conditions']
+    return conditions[0]['value'] == rendering_id and conditions[1]['value'] == f'{rendering_id}:{user_id}'
+
+
+def check_ip_whitelist(rng, renderings, users):
+    request = RequestFactory().get('/forest/tests_question', REMOTE_ADDR=CLIENT_IP)
+    response = IP_WHITELIST_MIDDLEWARE.process_view(request, None, (), {})
+    if response is not None and b'Unable to retrieve' in response.content:
+        raise Exception(response.content.decode('utf-8'))
+    return response is None
+
+
+def invalidate_scopes(rng, renderings, users):
+    ScopeManager.invalidate_scope_cache(str(rng.choice(renderings)))
+    return True
+
+
+def reset_ip_whitelist(rng, renderings, users):
+    IpWhitelist.fetched = False
+    return True
+
+
+# Notice: operations with their weight
+OPERATIONS = {
+    'permission': (check_permission, 30),
+    'live query': (check_live_query, 10),
+    'scope': (check_scope, 30),
+    'ip whitelist': (check_ip_whitelist, 25),
+    'scope invalidation': (invalidate_scopes, 3),
+    'ip whitelist reset': (reset_ip_whitelist, 2),
+}
+
+
+class Report:
+    def __init__(self):
+        self.operations = Counter()
+        self.errors = Counter()
+        self.failures = Counter()
+        self.lock = threading.Lock()
+
+    def add(self, name, correct=True, error=False):
+        with self.lock:
+            self.operations[name] += 1
+            self.errors[name] += error
+            self.failures[name] += not correct
+
+
+def run_operation(name, rng, renderings, users, report):
+    operation = OPERATIONS[name][0]
+    try:
+        correct = operation(rng, renderings, users)
+    except Exception:
+        # Notice: a failed Forest Admin API call, expected with an error rate
+        report.add(name, error=True)
+    else:
+        report.add(name, correct=correct)
+
+
+def work(seed, deadline, renderings, users, report):
+    rng = random.Random(seed)
+    names = list(OPERATIONS)
+    weights = [OPERATIONS[name][1] for name in names]
+    while time.monotonic() < deadline:
+        run_operation(rng.choices(names, weights)[0], rng, renderings, users, report)
+
+
+def reset_caches():
+    Permission.permissions_cached = {}
+    ScopeManager.cache = {}
+    IpWhitelist.fetched = False
+
+
+def run_threads(threads, duration, renderings, users):
+    report = Report()
+    deadline = time.monotonic() + duration
+    workers = [threading.Thread(target=work, args=(seed, deadline, renderings, users, report))
+               for seed in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return report
+
+
+def run(threads=32, duration=5.0, renderings=4, users=4, latency=0.02, error_rate=0.05, change_interval=0.2,
+        expiration=0.2):
+    renderings, users = list(range(1, renderings + 1)), list(range(1, users + 1))
+    api = StubForestApi(users, latency, error_rate, change_interval)
+    api.start()
+    reset_caches()
+    try:
+        with override_settings(FOREST={**settings.FOREST, 'FOREST_URL': api.url}), \
+                mock.patch.object(Permission, 'expiration_in_seconds', expiration), \
+                mock.patch('django_forest.utils.scope.SCOPE_CACHE_EXPIRATION_DELTA', expiration):
+            report = run_threads(threads, duration, renderings, users)
+    finally:
+        api.stop()
+        reset_caches()
+    return report, api.calls
+
+
+def print_report(report, calls, duration):
+    print('Operations')
+    for name in OPERATIONS:
+        print(f'  {name:<30} {report.operations[name]:>8} done {report.errors[name]:>6} API errors '
+              f'{report.failures[name]:>6} incorrect')
+    print('Forest Admin API calls')
+    for route, count in sorted(calls.items()):
+        print(f'  {route:<30} {count:>8} ({count / duration:.1f}/s)')
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(description='Stress the Forest Admin caches from many threads.')
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=5, help='seconds')
+    parser.add_argument('--renderings', type=int, default=4)
+    parser.add_argument('--users', type=int, default=4)
+    parser.add_argument('--latency', type=float, default=0.02, help='seconds per Forest Admin API call')
+    parser.add_argument('--error-rate', type=float, default=0.05, help='failed Forest Admin API calls, 0 to 1')
+    parser.add_argument('--change-interval', type=float, default=0.2, help='seconds between payload changes')
+    parser.add_argument('--expiration', type=float, default=0.2, help='seconds before the caches expire')
+    return parser
+
+
+if __name__ == '__main__':
+    args = get_parser().parse_args()
+    report, calls = run(args.threads, args.duration, args.renderings, args.users, args.latency, args.error_rate,
+                        args.change_interval, args.expiration)
+    print_report(report, calls, args.duration)
+    raise SystemExit(1 if sum(report.failures.values()) else 0)
@@ -0,0 +1,129 @@
+"""
+Synthetic dataset of the test app models, in a dedicated benchmark database.
+
+    python -m benchmarks.dataset --scale 1
+
+At scale 1, about 1M rows: topics, questions (FK to topics), choices (FK to questions),
+publications and articles (M2M to publications). The database is kept between runs,
+the data is generated again only when the scale changes.
+"""
+import argparse
+import random
+from datetime import datetime, timedelta, timezone
+
+from benchmarks import setup
+
+setup()
+
+from django.db import connection  # noqa: E402
+
+from django_forest.tests.models import Article, Choice, Publication, Question, Topic  # noqa: E402
+
+DATABASE_NAME = 'forest_benchmark'
+BATCH_SIZE = 10000
+
+SIZES = {
+    'topics': 1000,
+    'questions': 300000,
+    'choices': 600000,
+    'publications': 1000,
+    'articles': 50000,
+    'article_publications': 100000,
+}
+
+WORDS = ('color', 'music', 'travel', 'food', 'sport', 'movie', 'book', 'science', 'history', 'weather',
+         'garden', 'ocean', 'mountain', 'city', 'forest', 'river', 'planet', 'coffee', 'winter', 'summer')
+
+START_DATE = datetime(2019, 1, 1, tzinfo=timezone.utc)
+
+
+def get_sizes(scale):
+    return {name: max(int(size * scale), 1) for name, size in SIZES.items()}
+
+
+def setup_database():
+    """Create (or reuse) the benchmark database, with the migrations of the test app applied."""
+    connection.settings_dict['TEST']['NAME'] = DATABASE_NAME
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False, keepdb=True)
+
+
+def get_text(rng, size=4):
+    return ' '.join(rng.choice(WORDS) for _ in range(size))
+
+
+def get_ids(Model):
+    return list(Model.objects.order_by('pk').values_list('pk', flat=True))
+
+
+def bulk_create(Model, build, size):
+    for start in range(0, size, BATCH_SIZE):
+        Model.objects.bulk_create([build(i) for i in range(start, min(start + BATCH_SIZE, size))],
+                                  batch_size=BATCH_SIZE)
+
+
+def generate_questions(rng, sizes):
+    bulk_create(Topic, lambda i: Topic(name=f'{rng.choice(WORDS)} topic {i}'), sizes['topics'])
+    topic_ids = get_ids(Topic)
+    bulk_create(Question, lambda i: Question(
+        question_text=f'{get_text(rng)} question {i}'[:200],
+        pub_date=START_DATE + timedelta(minutes=rng.randrange(3 * 365 * 24 * 60)),
+        topic_id=rng.choice(topic_ids),
+    ), sizes['questions'])
+    question_ids = get_ids(Question)
+    bulk_create(Choice, lambda i: Choice(
+        question_id=rng.choice(question_ids),
+        choice_text=f'{get_text(rng, 2)} choice {i}',
+        votes=rng.randrange(1000),
+    ), sizes['choices'])
+
+
+def generate_articles(rng, sizes):
+    bulk_create(Publication, lambda i: Publication(title=f'{rng.choice(WORDS)} {i}'), sizes['publications'])
+    bulk_create(Article, lambda i: Article(headline=f'{get_text(rng)} article {i}'[:100]), sizes['articles'])
+    publication_ids, article_ids = get_ids(Publication), get_ids(Article)
+    pairs = {(rng.choice(article_ids), rng.choice(publication_ids)) for _ in range(sizes['article_publications'])}
+    Through = Article.publications.through
+    Through.objects.bulk_create([Through(article_id=a, publication_id=p) for a, p in pairs], batch_size=BATCH_SIZE)
+
+
+def is_generated(sizes):
+    return Question.objects.count() == sizes['questions'] and Article.objects.count() == sizes['articles']
+
+
+def clear():
+    tables = [Model._meta.db_table for Model in (Article.publications.through, Article, Publication,
+                                                 Choice, Question, Topic)]
+    with connection.cursor() as cursor:
+        cursor.execute(f"TRUNCATE {', '.join(tables)} RESTART IDENTITY CASCADE")
+
+
+def generate(sizes, seed=42):
+    rng = random.Random(seed)
+    clear()
+    generate_questions(rng, sizes)
+    generate_articles(rng, sizes)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def prepare(scale=1, force=False):
+    setup_database()
+    sizes = get_sizes(scale)
+    if force or not is_generated(sizes):
+        print(f'Generating {sum(sizes.values())} rows...')
+        generate(sizes)
+    return sizes
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(description='Generate the benchmark dataset.')
+    parser.add_argument('--scale', type=float, default=1, help='dataset size, 1 is about 1M rows')
+    parser.add_argument('--force', action='store_true', help='generate the data even if present')
+    return parser
+
+
+if __name__ == '__main__':
+    args = get_parser().parse_args()
+    sizes = prepare(args.scale, args.force)
+    for name, size in sizes.items():
+        print(f'  {name:<40} {size:>10}')
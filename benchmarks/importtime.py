@@ -0,0 +1,78 @@
+"""
+Import time of django_forest, with `python -X importtime` in a fresh interpreter for each statement.
+
+    python -m benchmarks.importtime --repeat 5 --top 8
+
+Each statement is timed against its baseline (the same interpreter without the django_forest import),
+and the slowest packages it imports on top of the baseline are listed.
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+SETUP = 'import django; django.setup()'
+
+# Notice: name -> (statement, baseline)
+STATEMENTS = {
+    'import django_forest': ('import django_forest', 'pass'),
+    'app config': (f'{SETUP}; import django_forest.apps', SETUP),
+    'schema': (f'{SETUP}; import django_forest.utils.schema', SETUP),
+    'urls': (f'{SETUP}; import django_forest.urls', SETUP),
+}
+
+LINE = re.compile(r'^import time:\s+(\d+) \|\s+\d+ \| +(\S+)$')
+
+
+def get_import_times(statement):
+    """Import time in us of each module imported by `statement`, without its nested imports."""
+    env = {'DJANGO_SETTINGS_MODULE': 'django_forest.tests.settings', **os.environ}
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement], env=env,
+                             stderr=subprocess.PIPE, stdout=subprocess.DEVNULL, check=True)
+    times = {}
+    for line in process.stderr.decode('utf-8').splitlines():
+        match = LINE.match(line)
+        if match:
+            times[match.group(2)] = int(match.group(1))
+    return times
+
+
+def get_packages(statement, baseline):
+    """Import time in us by top level package, of the modules `statement` imports on top of `baseline`."""
+    baseline_modules = get_import_times(baseline)
+    packages = {}
+    for name, self_time in get_import_times(statement).items():
+        if name not in baseline_modules:
+            package = name.split('.')[0]
+            packages[package] = packages.get(package, 0) + self_time
+    return packages
+
+
+def run(repeat=5):
+    results = {}
+    for name, (statement, baseline) in STATEMENTS.items():
+        # Notice: the fastest run, the others are slowed down by the disk cache or the machine load
+        results[name] = min((get_packages(statement, baseline) for _ in range(repeat)),
+                            key=lambda packages: sum(packages.values()))
+    return results
+
+
+def print_import_times(results, top=8):
+    print('Import time (on top of the baseline)')
+    for name, packages in results.items():
+        print(f'  {name:<40} {sum(packages.values()) / 1000:10.1f} ms')
+        for package, cumulative in sorted(packages.items(), key=lambda x: -x[1])[:top]:
+            print(f'    {package:<38} {cumulative / 1000:10.1f} ms')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=8)
+    args = parser.parse_args()
+    print_import_times(run(args.repeat), args.top)
+
+
+if __name__ == '__main__':
+    main()
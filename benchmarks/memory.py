@@ -0,0 +1,103 @@
+"""
+Peak and retained memory of the export and list views on the synthetic dataset (see benchmarks.dataset).
+
+    python -m benchmarks.memory --scale 1 --rows 10000
+
+Each endpoint is requested once to fill the caches, then measured with tracemalloc.
+"""
+import argparse
+import warnings
+from unittest import mock
+
+from benchmarks import setup
+
+setup()
+
+from django.conf import settings  # noqa: E402
+from django.test import override_settings  # noqa: E402
+
+from django_forest.utils.forest_api_requester import ForestApiRequester  # noqa: E402
+from django_forest.utils.testing import ForestApiStub, ForestClient, ForestMemory  # noqa: E402
+
+from benchmarks import dataset  # noqa: E402
+from benchmarks.views import init_schema, resource_url  # noqa: E402
+
+
+def get_association_url(name, resource, association_resource):
+    return resource_url(f'associations:{name}', resource, pk=1, association_resource=association_resource)
+
+
+def get_scenarios(rows):
+    page = {'timezone': 'Europe/Paris', 'page[number]': 1, 'page[size]': rows}
+    return {
+        'csv': (resource_url('csv', 'tests_question'), {
+            **page, 'filename': 'questions', 'fields[tests_question]': 'id,question_text,pub_date',
+            'header': 'id,question text,pub date',
+        }),
+        'csv belongsTo': (resource_url('csv', 'tests_choice'), {
+            **page, 'filename': 'choices', 'fields[tests_choice]': 'id,choice_text,votes,question',
+            'fields[question]': 'question_text', 'header': 'id,choice text,votes,question',
+        }),
+        'association csv': (get_association_url('csv', 'tests_publication', 'article_set'), {
+            **page, 'filename': 'articles', 'fields[tests_article]': 'id,headline', 'header': 'id,headline',
+        }),
+        'list': (resource_url('list', 'tests_question'), page),
+        'list belongsTo': (resource_url('list', 'tests_choice'), {
+            **page, 'fields[tests_choice]': 'id,choice_text,votes,question', 'fields[question]': 'question_text',
+        }),
+        'association list': (get_association_url('list', 'tests_publication', 'article_set'), page),
+    }
+
+
+def get_rows(response):
+    if response['Content-Type'].startswith('text/csv'):
+        # Notice: without the header
+        return len(response.content.splitlines()) - 1
+    return len(response.json()['data'])
+
+
+def measure_memory(client, url, params):
+    # Notice: the first request fills the caches
+    response = client.get(url, params)
+    if response.status_code != 200:
+        raise Exception(f'{url} failed ({response.status_code}): {response.content[:200]}')
+    with ForestMemory() as memory:
+        client.get(url, params)
+    memory.rows = get_rows(response)
+    return memory
+
+
+def run(rows, only=None):
+    init_schema()
+    client = ForestClient()
+    results = {}
+    with override_settings(MIDDLEWARE=['django_forest.middleware.ForestMiddleware', *settings.MIDDLEWARE],
+                           ALLOWED_HOSTS=['testserver'], DEBUG=False), \
+            mock.patch.object(ForestApiRequester, 'get', ForestApiStub().get), \
+            warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for name, (url, params) in get_scenarios(rows).items():
+            if only is None or only in name:
+                results[name] = measure_memory(client, url, params)
+    return results
+
+
+def print_memory(results):
+    print('Forest Admin views memory')
+    for name, memory in results.items():
+        print(f'  {name:<25} peak {memory.peak / 1024 / 1024:8.2f} MiB {memory.per_row(memory.peak):8.0f} B/row   '
+              f'retained {memory.retained / 1024:8.1f} KiB {memory.per_row(memory.retained):6.0f} B/row')
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(description='Peak and retained memory of the Forest Admin views.')
+    parser.add_argument('--scale', type=float, default=1, help='dataset size, 1 is about 1M rows')
+    parser.add_argument('--rows', type=int, default=10000, help='records per request')
+    parser.add_argument('--only', help='run the scenarios containing this text only')
+    return parser
+
+
+if __name__ == '__main__':
+    args = get_parser().parse_args()
+    dataset.prepare(args.scale)
+    print_memory(run(args.rows, args.only))
@@ -0,0 +1,68 @@
+"""
+Latency added by the Forest Admin middleware to requests of the host application.
+
+    python -m benchmarks.middleware
+"""
+from benchmarks import setup
+
+setup()
+
+from unittest import mock  # noqa: E402
+
+from django.http import HttpResponse  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+
+from django_forest.middleware import ForestMiddleware, IpWhitelistMiddleware, PermissionMiddleware  # noqa: E402
+from django_forest.utils.ip_whitelist import IpWhitelist  # noqa: E402
+
+from benchmarks.utils import measure, print_results  # noqa: E402
+
+
+RESPONSE = HttpResponse('ok')
+
+
+def get_response(request):
+    return RESPONSE
+
+
+def build_chain(middlewares):
+    instances = [middleware(get_response) for middleware in middlewares]
+
+    def run(request):
+        for instance in instances:
+            response = instance.process_view(request, None, (), {})
+            if response is not None:
+                return response
+        return get_response(request)
+    return run
+
+
+WHITELISTS = {
+    'no whitelist': [],
+    'whitelisted range': [{'type': 1, 'ipMinimum': '127.0.0.1', 'ipMaximum': '127.0.0.255'}],
+}
+
+
+def run(number=10000):
+    request = RequestFactory().get('/shop/products/42')
+    request.resolver_match = mock.Mock(app_name='shop', url_name='product', kwargs={'pk': 42})
+
+    chains = {
+        'no middleware': build_chain([]),
+        'previous chain': build_chain([IpWhitelistMiddleware, PermissionMiddleware]),
+        'ForestMiddleware': build_chain([ForestMiddleware]),
+    }
+
+    results = {}
+    # Notice: rules already fetched, the client ip always matches
+    IpWhitelist.fetched = True
+    for whitelist, rules in WHITELISTS.items():
+        IpWhitelist.use_ip_whitelist = bool(rules)
+        IpWhitelist.rules = rules
+        for name, chain in chains.items():
+            results[f'{name}, {whitelist}'] = measure(lambda: chain(request), number=number)
+    return results
+
+
+if __name__ == '__main__':
+    print_results('Host application request', run(), unit='us')
@@ -0,0 +1,55 @@
+"""
+Request-time model lookups: scanning `_meta` against the Models registry.
+
+    python -m benchmarks.model_metadata
+"""
+from benchmarks import setup
+
+setup()
+
+from django.apps import apps  # noqa: E402
+
+from django_forest.tests.models import Question  # noqa: E402
+from django_forest.utils import get_accessor_name, get_association_field  # noqa: E402
+from django_forest.utils.models import Models  # noqa: E402
+from django_forest.utils.type_mapping import get_type  # noqa: E402
+
+from benchmarks.utils import measure, print_results  # noqa: E402
+
+
+def scan_model(resource):
+    for model in Models.list():
+        if resource.lower() in (model._meta.db_table.lower(), f'{model._meta.db_table.lower()}s'):
+            return model
+
+
+def scan_association_field(Model, association_resource):
+    return next((x for x in Model._meta.get_fields()
+                 if x.is_relation and get_accessor_name(x) == association_resource), None)
+
+
+def scan_pk(name):
+    return next(filter(lambda m: m._meta.db_table == name, apps.get_models()))._meta.pk
+
+
+def run(number=1000):
+    resource = Models.list()[-1]._meta.db_table
+    Models.build()
+    lookups = {
+        'model': (lambda: scan_model(resource), lambda: Models.get(resource)),
+        'association field': (lambda: scan_association_field(Question, 'choice_set'),
+                              lambda: get_association_field(Question, 'choice_set')),
+        'field type': (lambda: get_type(Question._meta.get_field('pub_date')),
+                       lambda: Models.get_metadata(Question).get_field_type('pub_date')),
+        'pk': (lambda: scan_pk(resource), lambda: Models.get_metadata(Models.get(resource)).pk),
+    }
+
+    results = {}
+    for name, (scan, registry) in lookups.items():
+        results[f'{name} (scan)'] = measure(scan, number=number)
+        results[f'{name} (registry)'] = measure(registry, number=number)
+    return results
+
+
+if __name__ == '__main__':
+    print_results(f'Model lookups ({len(Models.list())} models)', run(), unit='us')
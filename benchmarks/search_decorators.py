@@ -0,0 +1,60 @@
+"""
+Search decorators on wide, string-heavy collections.
+
+    python -m benchmarks.search_decorators
+"""
+from benchmarks import setup
+
+setup()
+
+from django_forest.resources.utils.decorators import DecoratorsMixin  # noqa: E402
+from django_forest.utils.schema import Schema  # noqa: E402
+from django_forest.utils.schema.definitions import COLLECTION, FIELD  # noqa: E402
+
+from benchmarks.utils import measure, print_results  # noqa: E402
+
+COLLECTION_NAME = 'bench_wide'
+
+
+class Meta:
+    db_table = COLLECTION_NAME
+
+
+class Model:
+    _meta = Meta
+
+
+def build_collection(width):
+    fields = [Schema.get_default({'field': 'id', 'type': 'Number'}, FIELD)]
+    fields += [Schema.get_default({'field': f'text_{i}', 'type': 'String'}, FIELD) for i in range(width)]
+    return Schema.get_default({'name': COLLECTION_NAME, 'fields': fields}, COLLECTION)
+
+
+def build_data(width, page_size):
+    return {
+        'data': [{
+            'id': record_id,
+            'type': COLLECTION_NAME,
+            'attributes': {f'text_{i}': f'lorem ipsum {record_id} dolor {i} needle sit amet' for i in range(width)},
+        } for record_id in range(page_size)]
+    }
+
+
+def run(widths=(10, 50, 200), page_sizes=(15, 100)):
+    mixin = DecoratorsMixin()
+    results = {}
+    for width in widths:
+        Schema.schema['collections'] = [build_collection(width)]
+        for page_size in page_sizes:
+            data = build_data(width, page_size)
+
+            def decorate():
+                data.pop('meta', None)
+                mixin.decorators(data, Model, {'search': 'Needle'})
+
+            results[f'{width} fields x {page_size} records'] = measure(decorate)
+    return results
+
+
+if __name__ == '__main__':
+    print_results('Search decorators', run())
@@ -0,0 +1,144 @@
+"""
+Phases of `init_forest` on a generated project of N models x M fields.
+
+    python -m benchmarks.startup --models 100 500 1000 --fields 20
+
+The models are written to a throwaway app in a temporary directory, and Django is configured
+with it on an in-memory SQLite database.
+
+The totals are reported with the models introspection, then with a fresh schema artifact
+(see `manage.py forest_schema_artifact`) loaded instead.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+import django
+from django.conf import settings
+
+from benchmarks.utils import measure, print_results
+
+APP_NAME = 'forest_startup_app'
+
+FIELD_TYPES = (
+    'models.CharField(max_length=100)',
+    'models.IntegerField(default=0)',
+    'models.DateTimeField(null=True)',
+    'models.BooleanField(default=False)',
+    'models.TextField(blank=True)',
+    'models.DecimalField(max_digits=10, decimal_places=2, null=True)',
+    "models.CharField(max_length=2, choices=[('A', 'a'), ('B', 'b')], default='A')",
+)
+
+
+def get_model_source(index, fields):
+    lines = [f'class Model{index}(models.Model):']
+    lines += [f'    field_{i} = {FIELD_TYPES[i % len(FIELD_TYPES)]}' for i in range(fields)]
+    if index:
+        lines.append(f"    parent = models.ForeignKey('Model{index - 1}', null=True, on_delete=models.CASCADE)")
+    if index % 10 == 9:
+        lines.append(f"    others = models.ManyToManyField('Model{index - 5}', related_name='+')")
+    return '\n'.join(lines)
+
+
+def write_app(directory, models, fields):
+    app_directory = os.path.join(directory, APP_NAME)
+    os.makedirs(app_directory)
+    with open(os.path.join(app_directory, '__init__.py'), 'w') as f:
+        f.write('')
+    with open(os.path.join(app_directory, 'models.py'), 'w') as f:
+        f.write('from django.db import models\n\n\n')
+        f.write('\n\n\n'.join(get_model_source(i, fields) for i in range(models)))
+        f.write('\n')
+
+
+def setup(directory, models, fields):
+    write_app(directory, models, fields)
+    sys.path.insert(0, directory)
+    settings.configure(
+        DEBUG=True,
+        INSTALLED_APPS=['django.contrib.contenttypes', APP_NAME],
+        DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}},
+        DEFAULT_AUTO_FIELD='django.db.models.AutoField',
+        FOREST={'FOREST_DISABLE_AUTO_SCHEMA_APPLY': True},
+    )
+    django.setup()
+
+
+def get_phases():
+    from django_forest.utils.models import Models
+    from django_forest.utils.schema import Schema
+    from django_forest.utils.search_plan import search_plans
+
+    # Notice: same phases as init_forest, the apimap is not sent
+    return {
+        'build_schema': Schema.build_schema,
+        'Models.build': Models.build,
+        'add_smart_features': Schema.add_smart_features,
+        'handle_json_api_schema': Schema.handle_json_api_schema,
+        'search_plans.warm': lambda: search_plans.warm(Schema.schema['collections']),
+        'handle_schema_file': Schema.handle_schema_file,
+    }
+
+
+def select_models(count):
+    from django_forest.utils.models import Models
+
+    settings.FOREST['INCLUDED_MODELS'] = [f'{APP_NAME}_model{i}' for i in range(count)]
+    Models.list(force=True)
+
+
+def measure_artifact(count, repeat):
+    """Time `load_artifact`, which replaces `build_schema` and `Models.build` when the artifact is fresh."""
+    from django_forest.utils.schema.artifact import build_artifact, load_artifact
+
+    file_path = os.path.abspath(f'artifact-{count}.json')
+    with open(file_path, 'w') as f:
+        json.dump(build_artifact(), f)
+    settings.FOREST['SCHEMA_ARTIFACT'] = file_path
+    try:
+        if not load_artifact():
+            raise Exception('The schema artifact is not loaded')
+        return measure(load_artifact, repeat=repeat, number=1)
+    finally:
+        del settings.FOREST['SCHEMA_ARTIFACT']
+
+
+def run(models, fields, repeat=3):
+    results = {}
+    phases = get_phases()
+    for count in models:
+        select_models(count)
+        total = 0
+        for name, phase in phases.items():
+            timing = measure(phase, repeat=repeat, number=1)
+            results[f'{count} models, {name}'] = timing
+            total += timing['min']
+        results[f'{count} models, total'] = {'min': total, 'median': total}
+
+        timing = measure_artifact(count, repeat)
+        results[f'{count} models, load_artifact'] = timing
+        total += timing['min'] - results[f'{count} models, build_schema']['min'] \
+            - results[f'{count} models, Models.build']['min']
+        results[f'{count} models, total with artifact'] = {'min': total, 'median': total}
+    return results
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(description='Time the init_forest phases on a generated project.')
+    parser.add_argument('--models', type=int, nargs='+', default=[100, 500, 1000])
+    parser.add_argument('--fields', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=3)
+    return parser
+
+
+if __name__ == '__main__':
+    args = get_parser().parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        setup(directory, max(args.models), args.fields)
+        # Notice: the schema file is written in the working directory
+        os.chdir(directory)
+        results = run(sorted(args.models), args.fields, args.repeat)
+        print_results(f'init_forest phases ({args.fields} fields per model)', results)
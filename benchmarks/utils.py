@@ -0,0 +1,59 @@
+import json
+import platform
+import statistics
+import time
+from datetime import datetime, timezone
+
+
+def measure(func, repeat=5, number=10):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+
+    return {
+        'min': min(timings),
+        'median': statistics.median(timings),
+    }
+
+
+UNITS = {
+    'ms': 1000,
+    'us': 1000 * 1000,
+}
+
+
+def print_results(title, results, unit='ms'):
+    print(title)
+    scale = UNITS[unit]
+    for name, timing in results.items():
+        print(f"  {name:<40} min {timing['min'] * scale:10.3f} {unit}   median {timing['median'] * scale:10.3f} {unit}")
+
+
+def get_environment():
+    import django
+    from django.db import connection
+
+    return {
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'machine': platform.machine(),
+    }
+
+
+def save_results(path, results, meta=None):
+    with open(path, 'w') as f:
+        json.dump({
+            'date': datetime.now(timezone.utc).isoformat(),
+            'environment': get_environment(),
+            'meta': meta or {},
+            'results': results,
+        }, f, indent=2)
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)
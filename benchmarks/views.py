@@ -0,0 +1,193 @@
+"""
+End-to-end timings of the Forest Admin views on the synthetic dataset (see benchmarks.dataset).
+
+    python -m benchmarks.views --scale 1 --output results.json
+    python -m benchmarks.compare baseline.json results.json
+
+Requests go through the Django test client and ForestMiddleware, with a stubbed Forest Admin API.
+"""
+import argparse
+import json
+from unittest import mock
+
+from benchmarks import setup
+
+setup()
+
+from django.conf import settings  # noqa: E402
+from django.test import override_settings  # noqa: E402
+from django.urls import reverse  # noqa: E402
+
+from django_forest.utils.forest_api_requester import ForestApiRequester  # noqa: E402
+from django_forest.utils.models import Models  # noqa: E402
+from django_forest.utils.schema import Schema  # noqa: E402
+from django_forest.utils.search_plan import search_plans  # noqa: E402
+from django_forest.utils.testing import ForestApiStub, ForestClient, get_permissions  # noqa: E402
+
+from benchmarks import dataset  # noqa: E402
+from benchmarks.utils import measure, print_results, save_results  # noqa: E402
+
+PAGE_SIZE = 15
+LIVE_QUERY = 'SELECT COUNT(*) AS value FROM tests_question'
+
+
+def resource_url(name, resource, **kwargs):
+    return reverse(f'django_forest:resources:{name}', kwargs={'resource': resource, **kwargs})
+
+
+def get_list_scenarios(sizes):
+    url = resource_url('list', 'tests_question')
+    pages = {1, max(sizes['questions'] // PAGE_SIZE // 10, 1), max(sizes['questions'] // PAGE_SIZE, 1)}
+    scenarios = {
+        f'list page {page}': ('get', url, {'page[number]': page, 'page[size]': PAGE_SIZE, 'sort': '-id'})
+        for page in sorted(pages)
+    }
+    scenarios['list belongsTo'] = ('get', resource_url('list', 'tests_choice'), {
+        'page[number]': 1, 'page[size]': PAGE_SIZE,
+        'fields[tests_choice]': 'id,choice_text,votes,question', 'fields[question]': 'question_text',
+    })
+    return scenarios
+
+
+def get_search_scenarios():
+    url = resource_url('list', 'tests_question')
+    params = {'page[number]': 1, 'page[size]': PAGE_SIZE, 'search': 'ocean coffee'}
+    return {
+        'search': ('get', url, params),
+        'search extended': ('get', url, {**params, 'searchExtended': 1}),
+        'search count': ('get', resource_url('count', 'tests_question'), {'search': 'ocean coffee'}),
+    }
+
+
+def get_count_scenarios():
+    filters = {'aggregator': 'and', 'conditions': [
+        {'field': 'question_text', 'operator': 'contains', 'value': 'travel'},
+        {'field': 'pub_date', 'operator': 'after', 'value': '2020-06-01T00:00:00.000Z'},
+    ]}
+    return {
+        'count': ('get', resource_url('count', 'tests_question'), {}),
+        'count filtered': ('get', resource_url('count', 'tests_question'), {'filters': json.dumps(filters)}),
+    }
+
+
+def get_csv_scenarios():
+    return {
+        'csv export 1000 records': ('get', resource_url('csv', 'tests_question'), {
+            'page[number]': 1, 'page[size]': 1000, 'filename': 'questions',
+            'fields[tests_question]': 'id,question_text,pub_date', 'header': 'id,question text,pub date',
+        }),
+    }
+
+
+def get_association_scenarios():
+    return {
+        'hasMany list': ('get', resource_url('associations:list', 'tests_question', pk=1,
+                                             association_resource='choice_set'),
+                         {'page[number]': 1, 'page[size]': PAGE_SIZE}),
+        'manyToMany list': ('get', resource_url('associations:list', 'tests_publication', pk=1,
+                                                association_resource='article_set'),
+                            {'page[number]': 1, 'page[size]': PAGE_SIZE}),
+        'hasMany count': ('get', resource_url('associations:count', 'tests_question', pk=1,
+                                              association_resource='choice_set'), {}),
+    }
+
+
+STATS = {
+    'Value': {'type': 'Value', 'collection': 'tests_question', 'aggregate': 'Count'},
+    'Value sum filtered': {'type': 'Value', 'collection': 'tests_choice', 'aggregate': 'Sum',
+                           'aggregate_field': 'votes',
+                           'filters': json.dumps({'field': 'choice_text', 'operator': 'contains', 'value': 'city'})},
+    'Objective': {'type': 'Objective', 'collection': 'tests_question', 'aggregate': 'Count'},
+    'Pie': {'type': 'Pie', 'collection': 'tests_choice', 'aggregate': 'Count', 'group_by_field': 'votes'},
+    'Line': {'type': 'Line', 'collection': 'tests_question', 'aggregate': 'Count', 'time_range': 'Month',
+             'group_by_date_field': 'pub_date'},
+    'Leaderboard': {'type': 'Leaderboard', 'collection': 'tests_topic', 'aggregate': 'Count', 'limit': 5,
+                    'label_field': 'name', 'relationship_field': 'question_set'},
+}
+
+
+def get_stats_scenarios():
+    scenarios = {
+        f'stats {name}': ('post', reverse('django_forest:stats:statsWithParameters',
+                                          kwargs={'resource': body['collection']}), body)
+        for name, body in STATS.items()
+    }
+    scenarios['stats live query'] = ('post', reverse('django_forest:stats:liveQueries'),
+                                     {'type': 'Value', 'query': LIVE_QUERY})
+    return scenarios
+
+
+def get_scenarios(sizes):
+    return {
+        **get_list_scenarios(sizes),
+        **get_search_scenarios(),
+        **get_count_scenarios(),
+        **get_csv_scenarios(),
+        **get_association_scenarios(),
+        **get_stats_scenarios(),
+    }
+
+
+def get_api():
+    # Notice: every stat of the scenarios is allowed, as a pool with its own values
+    stats = {f"{x['type'].lower()}s": list(STATS.values()) for x in STATS.values()}
+    stats['queries'] = [LIVE_QUERY]
+    return ForestApiStub(permissions=get_permissions(stats))
+
+
+def init_schema():
+    Schema.build_schema()
+    Models.build()
+    Schema.add_smart_features()
+    Schema.handle_json_api_schema()
+    search_plans.warm(Schema.schema['collections'])
+
+
+def get_request(client, method, url, params):
+    url = f'{url}?timezone=Europe%2FParis'
+    if method == 'post':
+        return lambda: client.post(url, json.dumps(params), content_type='application/json')
+    return lambda: client.get(url, params)
+
+
+def run_scenario(client, name, scenario, repeat):
+    request = get_request(client, *scenario)
+    # Notice: the first request fills the Forest Admin caches
+    response = request()
+    if response.status_code != 200:
+        raise Exception(f'{name} failed ({response.status_code}): {response.content[:200]}')
+    return measure(request, repeat=repeat, number=1)
+
+
+def run(sizes, repeat=5, only=None):
+    init_schema()
+    client = ForestClient()
+    api = get_api()
+    results = {}
+    # Notice: DEBUG would keep every query in memory
+    with override_settings(MIDDLEWARE=['django_forest.middleware.ForestMiddleware', *settings.MIDDLEWARE],
+                           ALLOWED_HOSTS=['testserver'], DEBUG=False), \
+            mock.patch.object(ForestApiRequester, 'get', api.get), \
+            mock.patch.object(ForestApiRequester, 'post', api.post):
+        for name, scenario in get_scenarios(sizes).items():
+            if only is None or only in name:
+                results[name] = run_scenario(client, name, scenario, repeat)
+    return results
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(description='Time the Forest Admin views on a synthetic dataset.')
+    parser.add_argument('--scale', type=float, default=1, help='dataset size, 1 is about 1M rows')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--only', help='run the scenarios containing this text only')
+    parser.add_argument('--output', help='JSON file to write the results to')
+    return parser
+
+
+if __name__ == '__main__':
+    args = get_parser().parse_args()
+    sizes = dataset.prepare(args.scale)
+    results = run(sizes, args.repeat, args.only)
+    print_results('Forest Admin views', results)
+    if args.output:
+        save_results(args.output, results, {'scale': args.scale, 'sizes': sizes, 'repeat': args.repeat})
@@ -1,15 +1,46 @@
-from django_forest.utils.cors import set_cors
-from django_forest.utils.middlewares import set_middlewares
-from django_forest.utils.schema import Schema
+# Notice: the imports are done in the functions, importing django_forest (the app config, the management
+# commands) does not load the schema, the database backend, nor the HTTP, JWT and OIDC dependencies
 
 
-def init_forest():
+def init_forest(send_apimap=True):
+    from django_forest.utils.cors import set_cors
+    from django_forest.utils.middlewares import set_middlewares
+    from django_forest.utils.models import Models
+    from django_forest.utils.schema import Schema
+    from django_forest.utils.schema.artifact import load_artifact
+    from django_forest.utils.search_plan import search_plans
+
     set_cors()
     set_middlewares()
 
     # schema
-    Schema.build_schema()
+    # Notice: the collections of a fresh artifact, built at deploy time, spare the models introspection
+    if not load_artifact():
+        Schema.build_schema()
+        Models.build()
     Schema.add_smart_features()
     Schema.handle_json_api_schema()
+    search_plans.warm(Schema.schema['collections'])
     Schema.handle_schema_file()
-    Schema.send_apimap()
+    # Notice: the workers are ready without waiting on the Forest Admin API
+    if send_apimap:
+        Schema.send_apimap_in_background()
+
+
+def preload_forest():
+    """
+    init_forest for the master process of a pre-forking server (gunicorn --preload, uwsgi without lazy-apps).
+
+    Everything built on first use is built once, before the workers fork, and shared copy-on-write with them.
+    The per-process state is reset in each worker, the forks of the master run
+    django_forest.utils.lifecycle.after_fork.
+    """
+    from django_forest.utils.lifecycle import freeze, prebuild, register_after_fork
+    from django_forest.utils.schema import Schema
+
+    init_forest(send_apimap=False)
+    prebuild()
+    freeze()
+    register_after_fork()
+    # Notice: last, its thread objects are not frozen
+    Schema.send_apimap_in_background()
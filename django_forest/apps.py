@@ -1,9 +1,9 @@
 import os
-import urllib3
-from distutils.util import strtobool
 
 from django.apps import AppConfig
 
+from django_forest.utils.forest_setting import strtobool
+
 disable_warnings = os.getenv('URLLIB3_DISABLE_WARNINGS', 'False')
 try:
     disable_warnings = strtobool(disable_warnings)
@@ -11,6 +11,8 @@ except Exception:
     disable_warnings = False
 finally:
     if disable_warnings:
+        # Notice: only imported when needed, it is otherwise loaded with requests on first use
+        import urllib3
         urllib3.disable_warnings()
 
 
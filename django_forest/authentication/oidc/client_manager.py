@@ -1,9 +1,7 @@
 import logging
+import threading
 from urllib.parse import urljoin
 
-from oic.oic import Client
-from oic.oic.message import ProviderConfigurationResponse
-
 from .configuration_retriever import retrieve
 from .dynamic_client_registrator import register
 
@@ -11,12 +9,30 @@ logger = logging.getLogger(__name__)
 
 class OidcClientManager:
     client = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def reset(cls):
+        cls.client = None
+        cls._lock = threading.Lock()
 
     @classmethod
     def get_client_for_callback_url(cls, callback_url):
         if cls.client:
             return cls.client
 
+        # Notice: concurrent first logins register a single client
+        with cls._lock:
+            if not cls.client:
+                cls.client = cls.create_client(callback_url)
+        return cls.client
+
+    @staticmethod
+    def create_client(callback_url):
+        # Notice: oic is slow to import, it is only loaded on the first login
+        from oic.oic import Client
+        from oic.oic.message import ProviderConfigurationResponse
+
         configuration = retrieve()
         client_credentials = register({
             'token_endpoint_auth_method': 'none',
@@ -38,7 +54,7 @@ class OidcClientManager:
             jwks_uri=urljoin(client_data['issuer'], 'oidc/jwks')
         )
 
-        cls.client = Client(client_data['client_id'], verify_ssl=False)
-        cls.client.handle_provider_config(op_info, op_info['issuer'])
+        client = Client(client_data['client_id'], verify_ssl=False)
+        client.handle_provider_config(op_info, op_info['issuer'])
 
-        return cls.client
+        return client
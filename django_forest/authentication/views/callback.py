@@ -4,7 +4,6 @@ import requests
 
 from datetime import timedelta, datetime
 from jose import jwt
-from oic.oauth2 import AuthorizationResponse
 from django.http import JsonResponse
 from django.views.generic import View
 from django_forest.authentication.exception import AuthenticationClientException, AuthenticationThirdPartyException
@@ -63,6 +62,9 @@ class CallbackView(View):
         )
 
     def parse_authorization_response(self, client, state, full_path_info):
+        # Notice: oic is only loaded on login, see OidcClientManager.create_client
+        from oic.oauth2 import AuthorizationResponse
+
         return client.parse_response(
             AuthorizationResponse,
             info=full_path_info,
@@ -1,8 +1,6 @@
 import json
 import logging
 
-from oic.oic.message import AuthorizationRequest
-
 from django.http import JsonResponse
 from django.views.generic import View
 from django_forest.authentication.exception import AuthenticationClientException
@@ -11,7 +9,6 @@ from django_forest.authentication.oidc.client_manager import OidcClientManager
 from django_forest.authentication.utils import authentication_exception, get_callback_url
 from django_forest.utils.error_handler import MESSAGES
 
-
 logger = logging.getLogger(__name__)
 
 # Based on https://pyoidc.readthedocs.io/en/latest/examples/rp.html
@@ -49,7 +46,7 @@ class IndexView(View):
             'state': json.dumps(state),
             'redirect_uri': redirect_url,
         }
-        auth_req: AuthorizationRequest = client.construct_AuthorizationRequest(request_args=args)
+        auth_req = client.construct_AuthorizationRequest(request_args=args)
         authorization_url = auth_req.request(client.authorization_endpoint)
 
         return authorization_url
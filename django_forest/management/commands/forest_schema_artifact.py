@@ -0,0 +1,24 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from django_forest.utils.forest_setting import get_forest_setting
+from django_forest.utils.schema.artifact import build_artifact
+
+
+class Command(BaseCommand):
+    help = 'Build the Forest schema artifact, loaded at startup instead of introspecting the models.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help="artifact file, defaults to FOREST['SCHEMA_ARTIFACT']")
+
+    def handle(self, *args, **options):
+        file_path = options['output'] or get_forest_setting('SCHEMA_ARTIFACT')
+        if not file_path:
+            raise CommandError("Set FOREST['SCHEMA_ARTIFACT'] or pass --output.")
+
+        artifact = build_artifact()
+        with open(file_path, 'w') as f:
+            json.dump(artifact, f)
+        collections = len(artifact['collections'])
+        self.stdout.write(f'Forest schema artifact written to {file_path} ({collections} collections).')
@@ -1,5 +1,6 @@
 from django_forest.middleware.ip_whitelist import IpWhitelistMiddleware
 from django_forest.middleware.permissions import PermissionMiddleware
 from django_forest.middleware.deactivate_count import DeactivateCountMiddleware
+from django_forest.middleware.forest import ForestMiddleware
 
-__all__ = ['PermissionMiddleware', 'IpWhitelistMiddleware', 'DeactivateCountMiddleware']
+__all__ = ['PermissionMiddleware', 'IpWhitelistMiddleware', 'DeactivateCountMiddleware', 'ForestMiddleware']
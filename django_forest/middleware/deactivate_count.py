@@ -17,7 +17,7 @@ class DeactivateCountMiddleware:
         is_count_request = request.resolver_match.url_name == 'count'
         deactivated_count = get_forest_setting(
             'DEACTIVATED_COUNT',
-            list
+            []
         )
         resolver_kwargs = request.resolver_match.kwargs
         association_resource = resolver_kwargs.get('association_resource')
@@ -0,0 +1,75 @@
+from django.urls import NoReverseMatch, get_script_prefix, reverse
+
+from django_forest.middleware.deactivate_count import DeactivateCountMiddleware
+from django_forest.middleware.ip_whitelist import IpWhitelistMiddleware
+from django_forest.middleware.permissions import PermissionMiddleware
+from django_forest.utils.forest_setting import get_forest_setting
+from django_forest.utils.profiler import profiler
+from django_forest.utils.server_timing import record_server_timing
+
+
+def get_forest_path_prefix():
+    try:
+        path = reverse('django_forest:index')
+    except NoReverseMatch:
+        return None
+    # Notice: compared to path_info, which does not contain the script prefix
+    return f'/{path[len(get_script_prefix()):]}'
+
+
+class ForestMiddleware:
+    """
+    Run the Forest Admin checks on Forest Admin requests only.
+
+    Other requests of the application leave on a path prefix check.
+    """
+    middlewares = (IpWhitelistMiddleware, PermissionMiddleware, DeactivateCountMiddleware)
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.checks = [middleware(get_response) for middleware in self.middlewares]
+        self.prefix = None
+        self.server_timing = get_forest_setting('SERVER_TIMING', False)
+        self.profiler = bool(profiler.get_directory())
+
+    def __call__(self, request):
+        if not (self.server_timing or self.profiler) or not self.is_forest_request(request):
+            return self.get_response(request)
+
+        # Notice: the profile covers the whole request, the Forest Admin checks included
+        if self.profiler and profiler.is_requested(request):
+            return profiler.profile(self.get_timed_response, request)
+        return self.get_timed_response(request)
+
+    def get_timed_response(self, request):
+        if not self.server_timing:
+            return self.get_response(request)
+
+        with record_server_timing() as server_timing:
+            response = self.get_response(request)
+        response['Server-Timing'] = server_timing.get_header()
+        # Notice: browsers only expose the timings of cross-origin requests allowed by this header
+        if 'Access-Control-Allow-Origin' in response:
+            response['Timing-Allow-Origin'] = response['Access-Control-Allow-Origin']
+        return response
+
+    def is_forest_request(self, request):
+        if self.prefix is None:
+            # Notice: a failed reverse is not cached, the URLconf may not be ready yet
+            self.prefix = get_forest_path_prefix()
+        if self.prefix is None:
+            # Notice: fails closed, the checks run on the views of the django_forest app, or when unresolved
+            resolver_match = getattr(request, 'resolver_match', None)
+            return resolver_match is None or 'django_forest' in resolver_match.app_names
+        path = request.path_info
+        return path == self.prefix or path.startswith(f'{self.prefix}/')
+
+    def process_view(self, request, view_func, *args, **kwargs):
+        if not self.is_forest_request(request) or \
+                getattr(getattr(view_func, 'view_class', None), 'forest_checks_exempt', False):
+            return None
+
+        for check in self.checks:
+            response = check.process_view(request, view_func, *args, **kwargs)
+            if response is not None:
+                return response
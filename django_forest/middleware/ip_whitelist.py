@@ -2,6 +2,7 @@ from django.http import HttpResponse
 from ipware import get_client_ip
 
 from django_forest.utils.ip_whitelist import IpWhitelist
+from django_forest.utils.metrics import ip_whitelist_cache
 
 
 class IpWhitelistMiddleware:
@@ -25,21 +26,25 @@ class IpWhitelistMiddleware:
         return client_ip
 
     def is_ip_valid(self, request):
-        if IpWhitelist.use_ip_whitelist:
+        use_ip_whitelist, rules = IpWhitelist.get_state()
+        if use_ip_whitelist:
             client_ip = self.get_client_ip(request)
             if client_ip is None:
                 return False
-            return IpWhitelist.is_ip_matches_any_rule(client_ip)
+            return IpWhitelist.is_ip_matches_any_rule(client_ip, rules)
         return True
 
     def process_view(self, request, view_func, *args, **kwargs):
-
+        generation = IpWhitelist.generation
         # if invalid ip, fetch again
         if not IpWhitelist.fetched or not self.is_ip_valid(request):
+            ip_whitelist_cache.inc(result='miss')
             try:
-                IpWhitelist.get_rules()
+                IpWhitelist.refresh_rules(generation)
             except Exception as e:
                 return HttpResponse(f'Unable to retrieve the ip white list ({e})', status=403)
+        else:
+            ip_whitelist_cache.inc(result='hit')
 
         if not self.is_ip_valid(request):
             return HttpResponse('IP client is invalid', status=403)
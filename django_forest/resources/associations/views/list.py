@@ -1,5 +1,3 @@
-from distutils.util import strtobool
-
 from django.http import JsonResponse, HttpResponse
 
 from django_forest.resources.associations.utils import AssociationView
@@ -7,6 +5,7 @@ from django_forest.resources.utils.json_api_serializer import JsonApiSerializerM
 from django_forest.resources.utils.query_parameters import parse_qs
 from django_forest.resources.utils.smart_field import SmartFieldMixin
 from django_forest.utils import get_association_field
+from django_forest.utils.forest_setting import strtobool
 
 
 class ListView(SmartFieldMixin, JsonApiSerializerMixin, AssociationView):
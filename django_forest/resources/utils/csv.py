@@ -2,6 +2,8 @@ from datetime import datetime
 
 from django.http import HttpResponse
 
+from django_forest.utils.server_timing import timed
+
 
 class CsvMixin:
     def get_related_res(self, data, value):
@@ -22,6 +24,7 @@ class CsvMixin:
                     res[name] = related_res['id']
         return res
 
+    @timed('csv')
     def fill_csv(self, data, writer, params):
         for record in data['data']:
             res = record['attributes']
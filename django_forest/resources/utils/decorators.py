@@ -1,36 +1,46 @@
 from .in_search_fields import in_search_fields
+from django_forest.utils.collection_cache import CollectionCache
 from django_forest.utils.schema import Schema
 
 
+def get_fields_for_decorator_search(collection):
+    fields_to_search = []
+    for x in collection['fields']:
+        if x['type'] in ('String', 'Number', 'Enum') \
+                and not x['reference'] \
+                and in_search_fields(x['field'], collection['search_fields']):
+            fields_to_search.append(x['field'])
+    return tuple(fields_to_search)
+
+
+# Notice: searchable attributes only change when the schema changes
+decorator_fields = CollectionCache(get_fields_for_decorator_search)
+
+
 class DecoratorsMixin:
     def get_fields_for_decorator_search(self, collection):
-        fields_to_search = []
-        for x in collection['fields']:
-            if x['type'] in ('String', 'Number', 'Enum') \
-                    and not x['reference'] \
-                    and in_search_fields(x['field'], collection['search_fields']):
-                fields_to_search.append(x)
-        return fields_to_search
-
-    def handle_search_decorator_field(self, field, record, data, search):
-        if field['field'] in record['attributes'] \
-           and search.upper() in str(record['attributes'][field['field']]).upper():
-            decorator_instance = next((x for x in self.get_meta_decorators(data) if x['id'] == record['id']), None)
-            if decorator_instance is None:
-                self.get_meta_decorators(data).append({
-                    'id': record['id'],
-                    'search': [field['field']]
-                })
-            else:
-                decorator_instance['search'].append(field['field'])
+        return decorator_fields.get(collection)
+
+    def get_record_search_decorator(self, record, fields_to_search, needle):
+        attributes = record.get('attributes', {})
+        return [field for field in fields_to_search
+                if field in attributes and needle in str(attributes[field]).upper()]
 
     def handle_search_decorator(self, data, Model, search):
         collection = Schema.get_collection(Model._meta.db_table)
         fields_to_search = self.get_fields_for_decorator_search(collection)
+        needle = search.upper()
 
+        decorators = {}
         for record in data['data']:
-            for field in fields_to_search:
-                self.handle_search_decorator_field(field, record, data, search)
+            matches = self.get_record_search_decorator(record, fields_to_search, needle)
+            if matches:
+                decorators.setdefault(record['id'], []).extend(matches)
+
+        if decorators:
+            self.get_meta_decorators(data).extend(
+                {'id': record_id, 'search': matches} for record_id, matches in decorators.items()
+            )
 
     def get_meta_decorators(self, data):
         if 'meta' not in data or 'decorators' not in data['meta']:
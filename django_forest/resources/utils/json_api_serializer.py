@@ -1,26 +1,25 @@
-from django.apps import apps
-from django_forest.utils.schema import Schema
+from django_forest.utils.metrics import serialized_records
+from django_forest.utils.models import Models
+from django_forest.utils.schema.collection_info import get_collection_info
 from django_forest.utils.schema.json_api_schema import JsonApiSchema
+from django_forest.utils.server_timing import timed
+from django_forest.utils.tracing import set_span_attributes
 from django_forest.resources.utils.query_parameters import parse_qs
 
 class JsonApiSerializerMixin:
 
     def get_smart_relationships(self, fields):
-        return [x['field'] for x in fields
-                if x['is_virtual'] and x['reference'] and not isinstance(x['type'], list)]
+        return [x.name for x in fields if x.is_virtual and x.reference and not isinstance(x.type, list)]
 
     def get_include_data(self, fields):
-        relationships = [x['field'] for x in fields if x['reference'] and x['relationship'] in ['BelongsTo', 'HasOne']]
+        relationships = [x.name for x in fields if x.is_to_one]
         smart_relationships = self.get_smart_relationships(fields)
         return relationships + smart_relationships
 
     def serialize_field(self, field, parent=None):
-        res = field['field']
-        if field['is_virtual'] and field['reference']:
-            res = field['reference'].split('_')[1]
         if parent:
-            res = f'{parent}.{res}'
-        return res
+            return f'{parent}.{field.serialized_name}'
+        return field.serialized_name
 
     def build_only(self, fields, current_name):
         only = [self.serialize_field(f) for f in fields.pop(current_name)]
@@ -31,34 +30,26 @@ class JsonApiSerializerMixin:
         return only
 
     def get_fields_for_collection(self, collection, required_fields=None):
-        collection_fields = collection['fields']
+        collection_fields = collection.fields
         if required_fields:
-            collection_fields = list(
-                filter(
-                    lambda f: f['field'] in required_fields,
-                    collection_fields
-                )
-            )
-            Model = next(filter(lambda m: m._meta.db_table == collection['name'], apps.get_models()))
-            pk_field = Model._meta.pk
+            collection_fields = [f for f in collection.fields if f.name in required_fields]
+            pk_field = Models.get_metadata(Models.get(collection.name)).pk
             if 'id' in required_fields and pk_field.name != 'id':
-                pk_field = next(filter(lambda f: f['field'] == pk_field.name, collection['fields']))
-                collection_fields.append(pk_field)
+                collection_fields.append(collection.fields_by_name[pk_field.name])
         return collection_fields
 
     def build_nested_fields(self, field, required_fields):
-        if not field['is_virtual']:
+        if not field.is_virtual:
             if not isinstance(required_fields, list):
                 required_fields = [required_fields]  # need if only one field in the qs
 
-            nested_name = field['reference'].split('.')[0]
             return self.get_fields_for_collection(
-                Schema.get_collection(nested_name),
+                get_collection_info(field.reference_collection),
                 required_fields
             )
 
     def get_fields(self, current_collection, qs):
-        current_name = current_collection['name']
+        current_name = current_collection.name
         qs_fields = qs.get('fields')
         if not qs_fields:
             return {
@@ -73,19 +64,20 @@ class JsonApiSerializerMixin:
             )
         }
         for field in fields[current_name]:
-            nested_required_fields = qs_fields.get(field['field'])
+            nested_required_fields = qs_fields.get(field.name)
             if nested_required_fields:
                 res = self.build_nested_fields(
                     field,
                     nested_required_fields
                 )
                 if res:
-                    fields[field['field']] = res
+                    fields[field.name] = res
         return fields
 
+    @timed('serialize')
     def serialize(self, queryset, Model, params):
         db_name = Model._meta.db_table
-        current_collection = Schema.get_collection(db_name)
+        current_collection = get_collection_info(db_name)
         JsonSchema = JsonApiSchema.get(db_name)
         qs = parse_qs(params)
         fields = self.get_fields(current_collection, qs)
@@ -99,4 +91,6 @@ class JsonApiSerializerMixin:
         data = {'data': []}
         if queryset:
             data = JsonSchema(**kwargs).dump(queryset, many=True)
+        serialized_records.observe(len(data['data']), collection=db_name)
+        set_span_attributes(collection=db_name, rows=len(data['data']))
         return data
@@ -1,4 +1,6 @@
 from django_forest.utils.collection import Collection
+from django_forest.utils.server_timing import timed
+from django_forest.utils.tracing import set_span_attributes
 from .filters import FiltersMixin
 from .limit_fields import LimitFieldsMixin
 from .pagination import PaginationMixin
@@ -25,7 +27,9 @@ class QuerysetMixin(PaginationMixin, FiltersMixin, SearchMixin, ScopeMixin, Deco
                 queryset = queryset.filter(method(params, Model))
         return queryset
 
+    @timed('queryset')
     def enhance_queryset(self, queryset, Model, params, request):
+        set_span_attributes(collection=Model._meta.db_table)
         # scopes + filter + search
         queryset = self.filter_queryset(queryset, Model, params, request)
 
@@ -47,3 +51,9 @@ class QuerysetMixin(PaginationMixin, FiltersMixin, SearchMixin, ScopeMixin, Deco
         queryset = self.get_pagination(params, queryset)
 
         return queryset
+
+    @timed('query')
+    def evaluate_queryset(self, queryset):
+        # Notice: fetch the records once, smart fields and serialization then use the queryset cache
+        set_span_attributes(collection=queryset.model._meta.db_table, rows=len(queryset))
+        return queryset
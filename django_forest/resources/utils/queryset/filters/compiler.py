@@ -0,0 +1,143 @@
+import json
+import threading
+from collections import OrderedDict
+
+from django.db.models import Q
+
+from django_forest.utils.collection import Collection
+from django_forest.utils.collection_cache import CollectionCache
+from django_forest.utils.forest_setting import get_forest_setting
+from django_forest.utils.tracing import set_span_attributes
+
+
+class LookupNode:
+    is_static = True
+
+    def __init__(self, lookup, value, is_negated):
+        self.lookup = lookup
+        self.value = value
+        self.is_negated = is_negated
+
+    def bind(self, view, tz):
+        q_object = Q(**{self.lookup: self.value})
+        if self.is_negated:
+            return ~q_object
+        return q_object
+
+
+class ExpressionNode:
+    is_static = True
+
+    def __init__(self, method, *args):
+        self.method = method
+        self.args = args
+
+    def bind(self, view, tz):
+        return getattr(view, self.method)(*self.args)
+
+
+class DateNode:
+    # Notice: date operators are relative to "now" and the timezone, they are computed on each bind
+    is_static = False
+
+    def __init__(self, operator, field, value):
+        self.operator = operator
+        self.field = field
+        self.value = value
+
+    def bind(self, view, tz):
+        return view.handle_date_operator(self.operator, self.field, self.value, tz)
+
+
+class SmartFieldNode:
+    is_static = False
+
+    def __init__(self, resource, method, operator, value):
+        self.resource = resource
+        self.method = method
+        self.operator = operator
+        self.value = value
+
+    def bind(self, view, tz):
+        if isinstance(self.method, str):
+            return getattr(Collection._registry[self.resource], self.method)(self.operator, self.value)
+        elif callable(self.method):
+            return self.method(self.operator, self.value)
+
+
+class AggregatorNode:
+    def __init__(self, aggregator, nodes):
+        self.aggregator = aggregator
+        self.nodes = nodes
+        self.is_static = all(node.is_static for node in nodes)
+
+    def bind(self, view, tz):
+        q_objects = Q()
+        for node in self.nodes:
+            if self.aggregator == 'or':
+                q_objects |= node.bind(view, tz)
+            else:
+                q_objects &= node.bind(view, tz)
+        return q_objects
+
+
+def normalize_filters(filters):
+    return json.dumps(filters, sort_keys=True, separators=(',', ':'))
+
+
+class CompiledFilters:
+    """
+    Compiled filter trees of a collection, by normalized filter JSON.
+
+    Raw JSON strings (as sent in the `filters` parameter) are also kept as is, in their own map,
+    so that a repeated request does not even parse them. Each map holds FOREST['FILTERS_CACHE_SIZE']
+    entries at most.
+    """
+
+    def __init__(self, collection):
+        self.smart_fields = {x['field']: x for x in collection['fields'] if x['is_virtual']}
+        self.max_size = int(get_forest_setting('FILTERS_CACHE_SIZE', 256))
+        self.plans = OrderedDict()
+        self.strings = OrderedDict()
+        # Notice: the reads are not locked, the inserts and evictions of concurrent requests are
+        self.lock = threading.Lock()
+
+    def add(self, entries, key, plan):
+        with self.lock:
+            # Notice: filters are user provided, drop the oldest entries when full
+            while entries and len(entries) >= self.max_size:
+                entries.popitem(last=False)
+            entries[key] = plan
+
+    def set(self, key, plan):
+        self.add(self.plans, key, plan)
+
+    def get_from_string(self, filters, compile):
+        plan = self.strings.get(filters)
+        if plan is None:
+            plan = self.get(json.loads(filters), compile)
+            self.add(self.strings, filters, plan)
+        else:
+            set_span_attributes(cache_hit=True)
+        return plan
+
+    def get(self, filters, compile):
+        if isinstance(filters, str):
+            return self.get_from_string(filters, compile)
+
+        key = normalize_filters(filters)
+        plan = self.plans.get(key)
+        set_span_attributes(cache_hit=plan is not None)
+        if plan is None:
+            plan = compile(filters, self.smart_fields)
+            self.set(key, plan)
+        return plan
+
+
+compiled_filters = CollectionCache(CompiledFilters)
+
+
+def reset_locks():
+    # Notice: the plans are kept after a fork, see django_forest.utils.lifecycle.after_fork
+    for _, filters in list(compiled_filters.entries.values()):
+        filters.lock = threading.Lock()
@@ -1,4 +1,3 @@
-import pandas as pd
 from datetime import datetime
 try:
     import zoneinfo
@@ -13,6 +12,9 @@ def get_date_range(
     previous: bool = True,
     offset: int = 0,
 ) -> tuple:
+    # Notice: pandas (and numpy) is slow to import, it is only loaded by the first relative date filter
+    import pandas as pd
+
     tzinfo = current_datetime.tzinfo
     current_datetime = current_datetime.replace(tzinfo=zoneinfo.ZoneInfo('UTC'))
     current_dt = pd.to_datetime(current_datetime)
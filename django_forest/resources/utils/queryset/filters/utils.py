@@ -2,10 +2,13 @@ from django.db.models import Q
 
 from django_forest.resources.utils.queryset.filters.date import DatesMixin
 from django_forest.resources.utils.queryset.filters.date.factory import ConditionFactory as DateConditionFactory
+from django_forest.resources.utils.queryset.filters.compiler import AggregatorNode, DateNode, ExpressionNode, \
+    LookupNode, SmartFieldNode, compiled_filters
 from django_forest.utils import get_association_field
-from django_forest.utils.type_mapping import get_type
-from django_forest.utils.collection import Collection
+from django_forest.utils.models import Models
 from django_forest.utils.schema import Schema
+from django_forest.utils.server_timing import timed
+from django_forest.utils.tracing import set_span_attributes
 
 
 OPERATORS = {
@@ -42,40 +45,36 @@ INSENSITIVE_OPERATORS = {
 
 
 class ConditionsMixin(DatesMixin):
-    def get_basic_expression(self, field, operator, value):
+    def get_lookup(self, field, operator, value):
         operators = INSENSITIVE_OPERATORS if isinstance(value, str) else OPERATORS
         try:
             lookup_field = f"{field}{operators[operator]}"
         except Exception:
             raise Exception(f'Unknown provided operator {operator}')
         else:
-            is_negated = operator.startswith('not')
-            kwargs = {lookup_field: value}
+            return lookup_field, operator.startswith('not')
+
+    def get_basic_expression(self, field, operator, value):
+        lookup_field, is_negated = self.get_lookup(field, operator, value)
+        kwargs = {lookup_field: value}
 
-            if is_negated:
-                return ~Q(**kwargs)
+        if is_negated:
+            return ~Q(**kwargs)
 
-            return Q(**kwargs)
+        return Q(**kwargs)
 
     def handle_blank(self, field_type, field):
         if field_type == 'String':
             return Q(Q(**{f'{field}__isnull': True}) | Q(**{f'{field}__exact': ''}))
         return Q(**{f'{field}__isnull': True})
 
-    def get_expression_smart_field(self, smart_fields, condition, resource):
-        operator = condition['operator']
-        field = condition['field'].replace(':', '__')
-        value = condition['value']
+    def handle_present(self, field):
+        return Q(**{f'{field}__isnull': False})
 
-        smart_field = smart_fields[field]
-        if 'filter' in smart_field:
-            method = smart_field['filter']
-            if isinstance(method, str):
-                return getattr(Collection._registry[resource], method)(operator, value)
-            elif callable(method):
-                return method(operator, value)
+    def compile_expression_smart_field(self, smart_field, condition, resource):
+        return SmartFieldNode(resource, smart_field.get('filter'), condition['operator'], condition['value'])
 
-    def get_expression_field(self, condition, Model, tz):
+    def compile_expression_field(self, condition, Model):
         operator = condition['operator']
         field = condition['field'].replace(':', '__')
         value = condition['value']
@@ -84,40 +83,47 @@ class ConditionsMixin(DatesMixin):
 
         # special case date, blank and present
         if operator in DateConditionFactory.OPERATORS:
-            return self.handle_date_operator(operator, field, value, tz)
+            return DateNode(operator, field, value)
         if operator == 'blank':
-            return self.handle_blank(field_type, field)
+            return ExpressionNode('handle_blank', field_type, field)
         elif operator == 'present':
-            return Q(**{f'{field}__isnull': False})
+            return ExpressionNode('handle_present', field)
         else:
-            return self.get_basic_expression(field, operator, value)
+            lookup_field, is_negated = self.get_lookup(field, operator, value)
+            return LookupNode(lookup_field, value, is_negated)
+
+    def compile_expression(self, condition, Model, smart_fields):
+        if 'aggregator' in condition:
+            return AggregatorNode(condition['aggregator'], [
+                self.compile_expression(x, Model, smart_fields) for x in condition['conditions']
+            ])
 
-    def get_expression(self, condition, Model, tz):
         field = condition['field'].replace(':', '__')
+        if field in smart_fields:
+            return self.compile_expression_smart_field(smart_fields[field], condition, Model._meta.db_table)
+        return self.compile_expression_field(condition, Model)
+
+    @timed('filters')
+    def get_compiled_filters(self, filters, Model):
+        set_span_attributes(collection=Model._meta.db_table)
+        collection = Schema.get_collection(Model._meta.db_table)
+        return compiled_filters.get(collection).get(
+            filters,
+            lambda x, smart_fields: self.compile_expression(x, Model, smart_fields)
+        )
 
-        resource = Model._meta.db_table
-        collection = Schema.get_collection(resource)
-        smart_fields = {x['field']: x for x in collection['fields'] if x['is_virtual']}
-        if field in smart_fields.keys():
-            return self.get_expression_smart_field(smart_fields, condition, resource)
-        else:
-            return self.get_expression_field(condition, Model, tz)
+    def get_expression(self, condition, Model, tz):
+        return self.get_compiled_filters(condition, Model).bind(self, tz)
 
     def handle_aggregator(self, filters, Model, tz):
-        q_objects = Q()
-        for condition in filters['conditions']:
-            if filters['aggregator'] == 'or':
-                q_objects |= self.get_expression(condition, Model, tz)
-            else:
-                q_objects &= self.get_expression(condition, Model, tz)
-        return q_objects
+        return self.get_compiled_filters(filters, Model).bind(self, tz)
 
     def get_field_type(self, field, Model):
         if ':' in field:
             fields = field.split(':')
             RelatedModel = get_association_field(Model, fields[0]).related_model
-            field_type = get_type(RelatedModel._meta.get_field(fields[1]))
+            field_type = Models.get_metadata(RelatedModel).get_field_type(fields[1])
         else:
-            field_type = get_type(Model._meta.get_field(field))
+            field_type = Models.get_metadata(Model).get_field_type(field)
 
         return field_type
@@ -7,7 +7,16 @@ from django_forest.utils.date import get_timezone
 class ScopeMixin(ConditionsMixin):
     def get_scope(self, request, Model):
         token = get_token(request)
-        filters = ScopeManager.get_scope_for_user(token, Model._meta.db_table)
-        if filters is not None:
-            tz = get_timezone(request.GET['timezone'])
-            return self.handle_aggregator(filters, Model, tz)
+        user_scope = ScopeManager.get_user_scope(token, Model._meta.db_table)
+        if user_scope is None:
+            return None
+        if user_scope.q_object is not None:
+            return user_scope.q_object
+
+        tz = get_timezone(request.GET['timezone'])
+        plan = self.get_compiled_filters(user_scope.filter, Model)
+        q_object = plan.bind(self, tz)
+        # Notice: date operators and smart fields are bound on each request
+        if plan.is_static:
+            user_scope.q_object = q_object
+        return q_object
@@ -1,5 +1,7 @@
 from django_forest.utils.collection import Collection
-from django_forest.utils.schema import Schema
+from django_forest.utils.schema.collection_info import get_collection_info
+from django_forest.utils.server_timing import timed
+from django_forest.utils.tracing import set_span_attributes
 
 
 class SmartFieldMixin:
@@ -22,29 +24,26 @@ class SmartFieldMixin:
 
     def _add_smart_fields(self, item, smart_fields, resource):
         for smart_field in smart_fields:
-            self._handle_get_method(smart_field, item, resource)
+            self._handle_get_method(smart_field.schema, item, resource)
 
     def _get_smart_fields_for_request(self, collection, params):
-
-        def is_virtual(field):
-            return field.get('is_virtual')
-
-        def include_field(field, required_fields):
-            return is_virtual(field) and field['field'] in required_fields
-
         # Either none provided, or a list of smart field names
-        queried_fields = (params or {}).get('fields', {}).get(collection.get('name'))
+        queried_fields = (params or {}).get('fields', {}).get(collection.name)
 
-        if queried_fields is None:
-            return [field for field in collection['fields'] if is_virtual(field)]
+        # Notice: most collections have no smart fields, no lookup of the queried ones then
+        if queried_fields is None or not collection.smart_fields:
+            return collection.smart_fields
 
-        return [field for field in collection['fields'] if include_field(field, set(queried_fields))]
+        queried_fields = set(queried_fields)
+        return [field for field in collection.smart_fields if field.name in queried_fields]
 
+    @timed('smart_fields')
     def handle_smart_fields(self, queryset, resource, params, many=False):
-        collection = Schema.get_collection(resource)
+        collection = get_collection_info(resource)
 
         # Rather than calculate and then filter out smart fields, we want to ignore them entirely
         smart_fields = self._get_smart_fields_for_request(collection, params)
+        set_span_attributes(collection=resource, smart_fields=len(smart_fields))
 
         # Don't bother adding anything if there are no smart fields
         if smart_fields and many:
@@ -54,10 +53,8 @@ class SmartFieldMixin:
             self._add_smart_fields(queryset, smart_fields, resource)
 
     def update_smart_fields(self, instance, body, resource):
-        collection = Schema.get_collection(resource)
-        smart_fields = [x for x in collection['fields'] if x['is_virtual']]
-        for smart_field in smart_fields:
-            if smart_field['field'] in body['data']['attributes'].keys():
-                value = body['data']['attributes'][smart_field['field']]
-                instance = self._handle_set_method(smart_field, instance, value, resource)
+        for smart_field in get_collection_info(resource).smart_fields:
+            if smart_field.name in body['data']['attributes'].keys():
+                value = body['data']['attributes'][smart_field.name]
+                instance = self._handle_set_method(smart_field.schema, instance, value, resource)
         return instance
@@ -1,7 +1,9 @@
 from django_forest.resources.utils.resource import ResourceView
+from django_forest.utils.slow_queries import record_slow_queries
 
 
 class CountView(ResourceView):
+    @record_slow_queries
     def get(self, request):
         queryset = self.Model.objects.all()
         params = request.GET.dict()
@@ -6,9 +6,11 @@ from django_forest.resources.utils.json_api_serializer import JsonApiSerializerM
 from django_forest.resources.utils.query_parameters import parse_qs
 from django_forest.resources.utils.resource import ResourceView
 from django_forest.resources.utils.smart_field import SmartFieldMixin
+from django_forest.utils.slow_queries import record_slow_queries
 
 
 class CsvView(FormatFieldMixin, SmartFieldMixin, JsonApiSerializerMixin, CsvMixin, ResourceView):
+    @record_slow_queries
     def get(self, request):
         # default
         queryset = self.Model.objects.all()
@@ -18,6 +20,7 @@ class CsvView(FormatFieldMixin, SmartFieldMixin, JsonApiSerializerMixin, CsvMixi
         try:
             # enhance queryset
             queryset = self.enhance_queryset(queryset, self.Model, params, request)
+            queryset = self.evaluate_queryset(queryset)
 
             # handle smart fields
             self.handle_smart_fields(queryset, self.Model._meta.db_table, parse_qs(params), many=True)
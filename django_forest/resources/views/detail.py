@@ -1,7 +1,7 @@
 from django.http import JsonResponse, HttpResponse
 
 from django_forest.resources.utils.format import FormatFieldMixin
-from django_forest.utils.schema import Schema
+from django_forest.utils.schema.collection_info import get_collection_info
 from django_forest.resources.utils.json_api_serializer import JsonApiSerializerMixin
 from django_forest.resources.utils.resource import ResourceView
 from django_forest.resources.utils.smart_field import SmartFieldMixin
@@ -38,8 +38,8 @@ class DetailView(SmartFieldMixin, FormatFieldMixin, JsonApiSerializerMixin, Reso
             self.handle_smart_fields(instance, self.Model._meta.db_table, None)
 
             # json api serializer
-            include_data = self.get_include_data(Schema.get_collection(self.Model._meta.db_table)['fields'])
-            JsonSchema = JsonApiSchema._registry[f'{self.Model._meta.db_table}Schema']
+            include_data = self.get_include_data(get_collection_info(self.Model._meta.db_table).fields)
+            JsonSchema = JsonApiSchema.get(self.Model._meta.db_table)
             data = JsonSchema(include_data=include_data).dump(instance)
 
             return JsonResponse(data, safe=False)
@@ -63,7 +63,7 @@ class DetailView(SmartFieldMixin, FormatFieldMixin, JsonApiSerializerMixin, Reso
                 self.Model.objects.filter(pk=pk).delete()
 
             # json api serializer
-            Schema = JsonApiSchema._registry[f'{self.Model._meta.db_table}Schema']
+            Schema = JsonApiSchema.get(self.Model._meta.db_table)
             data = Schema().dump(instance)
             return JsonResponse(data, safe=False)
 
@@ -6,9 +6,11 @@ from django_forest.resources.utils.query_parameters import parse_qs
 from django_forest.resources.utils.resource import ResourceView
 from django_forest.resources.utils.smart_field import SmartFieldMixin
 from django_forest.utils.schema.json_api_schema import JsonApiSchema
+from django_forest.utils.slow_queries import record_slow_queries
 
 
 class ListView(FormatFieldMixin, SmartFieldMixin, JsonApiSerializerMixin, ResourceView):
+    @record_slow_queries
     def get(self, request):
         # default
         queryset = self.Model.objects.all()
@@ -18,6 +20,7 @@ class ListView(FormatFieldMixin, SmartFieldMixin, JsonApiSerializerMixin, Resour
         try:
             # enhance queryset
             queryset = self.enhance_queryset(queryset, self.Model, params, request)
+            queryset = self.evaluate_queryset(queryset)
 
             # handle smart fields
             self.handle_smart_fields(queryset, self.Model._meta.db_table, parse_qs(params), many=True)
@@ -42,7 +45,7 @@ class ListView(FormatFieldMixin, SmartFieldMixin, JsonApiSerializerMixin, Resour
             return self.error_response(e)
         else:
             # json api serializer
-            Schema = JsonApiSchema._registry[f'{self.Model._meta.db_table}Schema']
+            Schema = JsonApiSchema.get(self.Model._meta.db_table)
             data = Schema().dump(instance)
             return JsonResponse(data, safe=False)
 
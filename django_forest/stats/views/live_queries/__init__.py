@@ -1,6 +1,7 @@
 from django_forest.utils.views.base import BaseView
 from .utils import get_row, execute_query
 from django_forest.stats.utils.stats import StatsMixin
+from django_forest.utils.server_timing import timed
 
 # TODO: support scopes once specification is achieved
 
@@ -46,6 +47,7 @@ class LiveQueriesView(StatsMixin, BaseView):
             'value': v
         } for k, v in data.items() if v is not None]
 
+    @timed('stats')
     def post(self, request, *args, **kwargs):
         params = self.get_body(request.body)
         return self.chart(params, request)
@@ -3,6 +3,8 @@ import json
 from django_forest.resources.utils.resource import ResourceView
 from django_forest.stats.utils.stats import StatsMixin
 from django_forest.utils import get_association_field
+from django_forest.utils.server_timing import timed
+from django_forest.utils.slow_queries import record_slow_queries
 
 from .utils import get_annotated_queryset, get_format_time_frame, compute_value, compute_line_values, get_periods, \
     contains_previous_date_operator
@@ -94,6 +96,8 @@ class StatsWithParametersView(StatsMixin, ResourceView):
 
         return self.compute_data(label_field, f'{name}__{aggregate}', queryset)
 
+    @timed('stats')
+    @record_slow_queries
     def post(self, request, *args, **kwargs):
         params = self.get_body(request.body)
         params.update(request.GET.dict())
@@ -1,3 +1,4 @@
+import time
 from unittest import mock
 
 from django.test import TestCase
@@ -6,6 +7,12 @@ from oic.oic import Client
 from django_forest.tests.authentication.oidc.test_configuration_retriever import mocked_config
 from django_forest.tests.authentication.oidc.test_dynamic_client_registrator import mocked_client_credentials
 from django_forest.authentication.oidc.client_manager import OidcClientManager
+from django_forest.utils.testing import run_in_threads
+
+
+def register_slowly(data):
+    time.sleep(0.05)
+    return mocked_client_credentials
 
 
 class AuthenticationOidcClientManagerTests(TestCase):
@@ -44,3 +51,10 @@ class AuthenticationOidcClientManagerTests(TestCase):
         with self.assertRaises(Exception) as cm:
             OidcClientManager.get_client_for_callback_url(self.callback_url)
         self.assertEqual(cm.exception.args[0], 'foo')
+
+    @mock.patch('django_forest.authentication.oidc.client_manager.retrieve', return_value=mocked_config)
+    @mock.patch('django_forest.authentication.oidc.client_manager.register', side_effect=register_slowly)
+    def test_client_manager_concurrent(self, mocked_register, mocked_retrieve):
+        clients = run_in_threads(lambda: OidcClientManager.get_client_for_callback_url(self.callback_url))
+        mocked_register.assert_called_once()
+        self.assertTrue(all(x is clients[0] for x in clients))
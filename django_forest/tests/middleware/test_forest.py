@@ -0,0 +1,84 @@
+from unittest import mock
+
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import resolve, set_script_prefix
+
+from django_forest.middleware import ForestMiddleware
+from django_forest.utils.ip_whitelist import IpWhitelist
+
+
+def get_response(request):
+    return HttpResponse('ok')
+
+
+class MiddlewareForestTests(TestCase):
+
+    def setUp(self):
+        self.middleware = ForestMiddleware(get_response)
+        self.factory = RequestFactory()
+
+    def tearDown(self):
+        IpWhitelist.fetched = False
+
+    def process_view(self, path):
+        request = self.factory.get(path)
+        request.resolver_match = mock.Mock(app_name='', url_name='index', kwargs={})
+        return self.middleware.process_view(request, None, (), {})
+
+    @mock.patch.object(IpWhitelist, 'get_rules', side_effect=Exception('should not be called'))
+    def test_other_path(self, mocked_get_rules):
+        for path in ('/', '/admin/forest', '/forestry', '/forest-api/tests_question'):
+            self.assertIsNone(self.process_view(path))
+        mocked_get_rules.assert_not_called()
+
+    @mock.patch.object(IpWhitelist, 'get_rules', side_effect=Exception('server error'))
+    def test_forest_path(self, mocked_get_rules):
+        for path in ('/forest', '/forest/tests_question'):
+            response = self.process_view(path)
+            self.assertEqual(response.status_code, 403)
+        self.assertEqual(mocked_get_rules.call_count, 2)
+
+    @mock.patch.object(IpWhitelist, 'get_rules', side_effect=Exception('should not be called'))
+    def test_checks_exempt(self, mocked_get_rules):
+        request = self.factory.get('/forest/_ready')
+        request.resolver_match = resolve('/forest/_ready')
+        self.assertIsNone(self.middleware.process_view(request, request.resolver_match.func, (), {}))
+        mocked_get_rules.assert_not_called()
+
+    @mock.patch('django_forest.middleware.forest.get_forest_path_prefix', return_value=None)
+    @mock.patch.object(IpWhitelist, 'get_rules', side_effect=Exception('server error'))
+    def test_no_prefix(self, mocked_get_rules, mocked_get_forest_path_prefix):
+        request = self.factory.get('/forest/tests_question')
+        request.resolver_match = resolve('/forest/tests_question')
+        response = self.middleware.process_view(request, None, (), request.resolver_match.kwargs)
+        self.assertEqual(response.status_code, 403)
+
+        request = self.factory.get('/other')
+        request.resolver_match = mock.Mock(app_names=[])
+        self.assertIsNone(self.middleware.process_view(request, None, (), {}))
+        mocked_get_rules.assert_called_once_with()
+        # Notice: not cached, tried again on each request
+        self.assertIsNone(self.middleware.prefix)
+        self.assertEqual(mocked_get_forest_path_prefix.call_count, 2)
+
+    def test_script_prefix(self):
+        set_script_prefix('/app/')
+        try:
+            request = self.factory.get('/forest/tests_question', SCRIPT_NAME='/app')
+            self.assertTrue(self.middleware.is_forest_request(request))
+            self.assertEqual(self.middleware.prefix, '/forest')
+        finally:
+            set_script_prefix('/')
+
+    @mock.patch('jose.jwt.decode', return_value={'id': 1, 'rendering_id': 1})
+    @mock.patch('django_forest.middleware.permissions.PermissionMiddleware.is_authorized')
+    @override_settings(FOREST={'DEACTIVATED_COUNT': ['tests_question']})
+    def test_deactivated_count(self, mocked_is_authorized, mocked_decode):
+        IpWhitelist.fetched = True
+        IpWhitelist.use_ip_whitelist = False
+        request = self.factory.get('/forest/tests_question/count', HTTP_AUTHORIZATION='Bearer token')
+        request.resolver_match = resolve('/forest/tests_question/count')
+        response = self.middleware.process_view(request, None, (), request.resolver_match.kwargs)
+        self.assertEqual(response.content, b'{"meta": {"count": "deactivated "}}')
+        mocked_is_authorized.assert_called_once()
@@ -1,19 +1,23 @@
 import copy
+import time
 from unittest import mock
 
 from django.conf import settings
-from django.test import TestCase
+from django.test import RequestFactory, TestCase
 from django.urls import reverse
 
 from django_forest.tests.fixtures.schema import test_schema
 from django_forest.tests.middleware import mocked_ip_whitelist, mocked_config, \
     mocked_requests_permission
+from django_forest.middleware.ip_whitelist import IpWhitelistMiddleware
+from django_forest.utils.forest_api_requester import ForestApiRequester
 from django_forest.utils.ip_whitelist import IpWhitelist
 from django_forest.utils.middlewares import set_middlewares
 from django_forest.utils.permissions import Permission
 from django_forest.utils.schema import Schema
 from django_forest.utils.schema.json_api_schema import JsonApiSchema
 from django_forest.utils.scope import ScopeManager
+from django_forest.utils.testing import StubResponse, run_in_threads
 
 
 mocked_ip_whitelist_ip = copy.deepcopy(mocked_ip_whitelist)
@@ -81,8 +85,7 @@ class MiddlewareIpWhitelistTests(TestCase):
         Permission.renderings_cached = {}
         ScopeManager.cache = {}
         IpWhitelist.fetched = False
-        settings.MIDDLEWARE.remove('django_forest.middleware.PermissionMiddleware')
-        settings.MIDDLEWARE.remove('django_forest.middleware.IpWhitelistMiddleware')
+        settings.MIDDLEWARE.remove('django_forest.middleware.ForestMiddleware')
 
     @mock.patch('requests.get', side_effect=mocked_requests_permission(mocked_config_server_error))
     @mock.patch('django_forest.middleware.ip_whitelist.IpWhitelistMiddleware.get_client_ip', return_value='123.12.34.0')
@@ -163,3 +166,32 @@ class MiddlewareIpWhitelistTests(TestCase):
     def test_subnet_invalid(self, mocked_ip, mocked_requests, mocked_decode):
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, 403)
+
+
+def get_ip_whitelist_slowly(url, query=None, headers=None):
+    time.sleep(0.05)
+    return StubResponse(mocked_ip_whitelist_ip_loopback)
+
+
+class IpWhitelistConcurrencyTests(TestCase):
+    def tearDown(self):
+        IpWhitelist.fetched = False
+        IpWhitelist.use_ip_whitelist = False
+        IpWhitelist.rules = []
+
+    def process_view(self):
+        request = RequestFactory().get('/forest/tests_question', REMOTE_ADDR='127.0.0.1')
+        return IpWhitelistMiddleware(None).process_view(request, None, (), {})
+
+    @mock.patch.object(ForestApiRequester, 'get', side_effect=get_ip_whitelist_slowly)
+    def test_concurrent_fetch(self, mocked_get):
+        self.assertEqual(run_in_threads(self.process_view), [None] * 8)
+        mocked_get.assert_called_once()
+        self.assertEqual(IpWhitelist.get_state(), (True, [{'type': 0, 'ip': '127.0.0.1'}]))
+
+    @mock.patch.object(ForestApiRequester, 'get', side_effect=get_ip_whitelist_slowly)
+    def test_fetch_again(self, mocked_get):
+        self.process_view()
+        IpWhitelist.fetched = False
+        self.process_view()
+        self.assertEqual(mocked_get.call_count, 2)
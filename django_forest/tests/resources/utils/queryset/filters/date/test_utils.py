@@ -675,7 +675,9 @@ def test_get_next_x_hours(current: datetime, period: int, expected: Tuple[dateti
     )
 )
 def test_get_date_range(current: datetime, frequency: str, period: int, previous: bool, offset: int, expected: Tuple[datetime]):
-    with mock.patch('django_forest.resources.utils.queryset.filters.date.utils.pd') as pd:
+    # Notice: pandas is imported by get_date_range
+    pd = mock.MagicMock()
+    with mock.patch.dict('sys.modules', {'pandas': pd}):
         pd.date_range.return_value = [
             pandas.Timestamp(2022, 1, 1),
             pandas.Timestamp(2012, 1, 1),
@@ -0,0 +1,105 @@
+import copy
+import json
+import threading
+from unittest import mock
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+from freezegun import freeze_time
+
+from django_forest.resources.utils.queryset.filters import FiltersMixin
+from django_forest.resources.utils.queryset.filters.compiler import compiled_filters
+from django_forest.resources.utils.queryset.filters.utils import ConditionsMixin
+from django_forest.tests.fixtures.schema import test_schema
+from django_forest.tests.models import Question
+from django_forest.utils.schema import Schema
+from django_forest.utils.testing import run_in_threads
+
+FILTERS = {
+    'aggregator': 'and',
+    'conditions': [
+        {'field': 'question_text', 'operator': 'contains', 'value': 'you'},
+        {'field': 'pub_date', 'operator': 'today', 'value': None},
+    ]
+}
+
+
+class FilterCompilerTests(TestCase):
+    fixtures = ['question.json']
+
+    def setUp(self):
+        Schema.schema = copy.deepcopy(test_schema)
+        compiled_filters.invalidate()
+
+    def tearDown(self):
+        compiled_filters.invalidate()
+
+    def get_filters(self, filters, timezone='Europe/Paris'):
+        params = {'filters': filters, 'timezone': timezone}
+        return FiltersMixin().get_filters(params, Question)
+
+    @mock.patch.object(ConditionsMixin, 'get_field_type', return_value='String')
+    def test_compiled_once(self, mocked_get_field_type):
+        q_object = self.get_filters(json.dumps(FILTERS))
+        self.assertEqual(self.get_filters(json.dumps(FILTERS)), q_object)
+        self.assertEqual(mocked_get_field_type.call_count, 2)
+
+        # Notice: the same filters with another key order are normalized
+        self.assertEqual(self.get_filters(json.dumps(FILTERS, sort_keys=True, indent=2)), q_object)
+        scope_filters = {'conditions': FILTERS['conditions'], 'aggregator': 'and'}
+        ConditionsMixin().handle_aggregator(scope_filters, Question, None)
+        self.assertEqual(mocked_get_field_type.call_count, 2)
+
+    @mock.patch.object(ConditionsMixin, 'get_field_type', return_value='String')
+    def test_schema_rebuild(self, mocked_get_field_type):
+        self.get_filters(json.dumps(FILTERS))
+        Schema.schema = copy.deepcopy(test_schema)
+        self.get_filters(json.dumps(FILTERS))
+        self.assertEqual(mocked_get_field_type.call_count, 4)
+
+    def test_date_operator(self):
+        with freeze_time('2021-06-01 12:00:00'):
+            q_object = self.get_filters(json.dumps(FILTERS))
+            self.assertEqual(len(Question.objects.filter(q_object)), 0)
+            self.assertEqual(self.get_filters(json.dumps(FILTERS), 'UTC'), self.get_filters(json.dumps(FILTERS), 'UTC'))
+            self.assertNotEqual(self.get_filters(json.dumps(FILTERS), 'UTC'), q_object)
+        with freeze_time('2021-06-02 12:00:00'):
+            q_object = self.get_filters(json.dumps(FILTERS))
+            self.assertEqual(len(Question.objects.filter(q_object)), 2)
+
+    def test_result(self):
+        filters = {'field': 'question_text', 'operator': 'not_contains', 'value': 'color'}
+        queryset = Question.objects.filter(self.get_filters(json.dumps(filters))).order_by('pk')
+        self.assertEqual([x.pk for x in queryset], [2, 3])
+        queryset = Question.objects.filter(self.get_filters(json.dumps(filters))).order_by('pk')
+        self.assertEqual([x.pk for x in queryset], [2, 3])
+
+    def test_unknown_operator(self):
+        filters = {'field': 'question_text', 'operator': 'foo', 'value': 'you'}
+        for _ in range(2):
+            with self.assertRaisesMessage(Exception, 'Unknown provided operator foo'):
+                self.get_filters(json.dumps(filters))
+
+    @override_settings(FOREST={**settings.FOREST, 'FILTERS_CACHE_SIZE': 2})
+    def test_max_size(self):
+        compiled_filters.invalidate()
+        for value in ('a', 'b', 'c'):
+            self.get_filters(json.dumps({'field': 'question_text', 'operator': 'equal', 'value': value}))
+        plans = compiled_filters.get(Schema.get_collection('tests_question'))
+        # Notice: the raw strings do not count in the plans
+        self.assertEqual(len(plans.plans), 2)
+        self.assertEqual(len(plans.strings), 2)
+        self.assertEqual(list(plans.strings), [
+            json.dumps({'field': 'question_text', 'operator': 'equal', 'value': value}) for value in ('b', 'c')])
+
+    @override_settings(FOREST={**settings.FOREST, 'FILTERS_CACHE_SIZE': 4})
+    def test_max_size_concurrent(self):
+        compiled_filters.invalidate()
+        plans = compiled_filters.get(Schema.get_collection('tests_question'))
+
+        def fill():
+            for i in range(500):
+                plans.set(f'{threading.get_ident()}-{i}', None)
+
+        run_in_threads(fill, count=8)
+        self.assertEqual(len(plans.plans), 4)
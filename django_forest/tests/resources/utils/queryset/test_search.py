@@ -0,0 +1,73 @@
+import copy
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+
+from django_forest.resources.utils.queryset.search import SearchMixin
+from django_forest.tests.fixtures.schema import test_schema
+from django_forest.tests.models import Car, Choice, Place, Question, Restaurant, Topic, Waiter, Wheel
+from django_forest.utils.schema import Schema
+
+SUBQUERY_STRATEGY = {**settings.FOREST, 'SEARCH_EXTENDED_STRATEGY': 'subquery'}
+
+
+# Notice: compare the SQL shape and the rows of both extended search strategies
+class SearchExtendedStrategyTests(TestCase):
+    fixtures = ['question.json', 'choice.json']
+
+    def setUp(self):
+        Schema.schema = copy.deepcopy(test_schema)
+        topic = Topic.objects.create(name='colors')
+        Question.objects.filter(pk=1).update(topic=topic)
+        car = Car.objects.create(brand='renault')
+        Wheel.objects.create(car=car)
+
+    def search(self, Model, search):
+        params = {'search': search, 'searchExtended': 'true'}
+        return Model.objects.filter(SearchMixin().get_search(params, Model)).order_by('pk')
+
+    def compare(self, Model, search):
+        join_queryset = self.search(Model, search)
+        with override_settings(FOREST=SUBQUERY_STRATEGY):
+            subquery_queryset = self.search(Model, search)
+
+        join_pks = [x.pk for x in join_queryset]
+        subquery_pks = [x.pk for x in subquery_queryset]
+        self.assertEqual(sorted(set(join_pks)), subquery_pks)
+        self.assertNotIn('JOIN', str(subquery_queryset.query))
+        return join_queryset, subquery_queryset, join_pks
+
+    def test_reverse_foreign_key(self):
+        join_queryset, subquery_queryset, join_pks = self.compare(Question, 'o')
+        self.assertIn('JOIN', str(join_queryset.query))
+        self.assertIn('IN (SELECT U0."question_id"', str(subquery_queryset.query))
+        # Notice: the join duplicates questions having several matching choices
+        self.assertEqual(join_pks, [1, 1, 2, 3])
+        self.assertEqual([x.pk for x in subquery_queryset], [1, 2, 3])
+
+    def test_foreign_key(self):
+        self.compare(Question, 'colors')
+        join_queryset, subquery_queryset, join_pks = self.compare(Choice, 'favorite')
+        self.assertIn('JOIN', str(join_queryset.query))
+        self.assertEqual(join_pks, [1, 2])
+
+    def test_to_field(self):
+        join_queryset, subquery_queryset, join_pks = self.compare(Wheel, 'renault')
+        self.assertIn('"car_id" IN (SELECT U0."brand"', str(subquery_queryset.query))
+        self.assertEqual(len(join_pks), 1)
+
+    def test_no_match(self):
+        join_queryset, subquery_queryset, join_pks = self.compare(Question, 'foo')
+        self.assertEqual(join_pks, [])
+
+    def test_number(self):
+        self.compare(Question, '2')
+        self.compare(Choice, '3')
+
+    @override_settings(FOREST=SUBQUERY_STRATEGY)
+    def test_no_searchable_related_value(self):
+        # Notice: a related collection without any condition must not match every row
+        restaurant = Restaurant.objects.create(place=Place.objects.create(name='San Marco', address='Venezia'))
+        bob = Waiter.objects.create(restaurant=restaurant, name='bob')
+        Waiter.objects.create(restaurant=restaurant, name='alice')
+        self.assertEqual([x.pk for x in self.search(Waiter, 'bob')], [bob.pk])
@@ -0,0 +1,58 @@
+import copy
+
+from django.test import TestCase
+
+from django_forest.resources.utils.decorators import DecoratorsMixin
+from django_forest.tests.fixtures.schema import test_schema
+from django_forest.tests.models import Question
+from django_forest.utils.schema import Schema
+
+
+class ResourceDecoratorsTests(TestCase):
+    def setUp(self):
+        Schema.schema = copy.deepcopy(test_schema)
+        self.mixin = DecoratorsMixin()
+
+    def get_data(self):
+        return {
+            'data': [
+                {'id': 1, 'attributes': {'question_text': 'what is your favorite color?'}},
+                {'id': 2, 'attributes': {'question_text': 'do you like chocolate?'}},
+                {'id': 3, 'attributes': {'question_text': 'who is your FAVORITE singer?', 'id': 3}},
+                {'id': 4},
+            ]
+        }
+
+    def test_decorators(self):
+        data = self.mixin.decorators(self.get_data(), Question, {'search': 'Favorite'})
+        self.assertEqual(data['meta'], {
+            'decorators': [
+                {'id': 1, 'search': ['question_text']},
+                {'id': 3, 'search': ['question_text']},
+            ]
+        })
+
+    def test_decorators_several_fields(self):
+        data = self.mixin.decorators(self.get_data(), Question, {'search': '3'})
+        self.assertEqual(data['meta'], {
+            'decorators': [
+                {'id': 3, 'search': ['id']},
+            ]
+        })
+
+    def test_decorators_no_match(self):
+        data = self.mixin.decorators(self.get_data(), Question, {'search': 'foo'})
+        self.assertNotIn('meta', data)
+
+    def test_decorators_no_search(self):
+        data = self.mixin.decorators(self.get_data(), Question, {'search': ''})
+        self.assertNotIn('meta', data)
+
+    def test_get_fields_for_decorator_search(self):
+        collection = Schema.get_collection('tests_question')
+        self.assertEqual(self.mixin.get_fields_for_decorator_search(collection), ('id', 'question_text'))
+
+    def test_get_fields_for_decorator_search_search_fields(self):
+        collection = Schema.get_collection('tests_question')
+        collection['search_fields'] = ['question_text']
+        self.assertEqual(self.mixin.get_fields_for_decorator_search(collection), ('question_text',))
@@ -0,0 +1,33 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.test import TestCase
+
+HEAVY_MODULES = ['corsheaders', 'distutils', 'jose', 'marshmallow', 'oic', 'requests', 'django.db.backends.postgresql',
+                 'django_forest.utils.schema']
+
+
+def get_imported(code):
+    """Run `code` in a fresh interpreter, return the HEAVY_MODULES it imported."""
+    code = f'{code}\nimport json, sys\nprint(json.dumps([x for x in {HEAVY_MODULES!r} if x in sys.modules]))'
+    env = {**os.environ, 'DJANGO_SETTINGS_MODULE': 'django_forest.tests.settings'}
+    output = subprocess.check_output([sys.executable, '-c', code], env=env)
+    return json.loads(output.decode('utf-8').splitlines()[-1])
+
+
+class ImportsTests(TestCase):
+
+    def test_import_django_forest(self):
+        # Notice: without django.setup, it does not touch the settings nor the database
+        self.assertEqual(get_imported('import django_forest'), [])
+
+    def test_import_app_config(self):
+        # Notice: the test apps load the database backend themselves
+        self.assertEqual(get_imported('import django\ndjango.setup()\nimport django_forest.apps'),
+                         get_imported('import django\ndjango.setup()'))
+
+    def test_import_oidc_client_manager(self):
+        self.assertNotIn('oic', get_imported('import django\ndjango.setup()\n'
+                                             'import django_forest.authentication.oidc.client_manager'))
@@ -0,0 +1,46 @@
+import copy
+
+from django.test import TestCase
+
+from django_forest.tests.fixtures.schema import test_schema
+from django_forest.utils.collection_cache import CollectionCache
+from django_forest.utils.schema import Schema
+
+
+class UtilsCollectionCacheTests(TestCase):
+    def setUp(self):
+        Schema.schema = copy.deepcopy(test_schema)
+        self.calls = []
+        self.cache = CollectionCache(self.build)
+
+    def tearDown(self):
+        CollectionCache._caches.remove(self.cache)
+
+    def build(self, collection):
+        self.calls.append(collection['name'])
+        return len(collection['fields'])
+
+    def test_get(self):
+        collection = Schema.get_collection('tests_question')
+        self.assertEqual(self.cache.get(collection), 5)
+        self.assertEqual(self.cache.get(collection), 5)
+        self.assertEqual(self.calls, ['tests_question'])
+
+    def test_get_schema_replaced(self):
+        self.cache.get(Schema.get_collection('tests_question'))
+        Schema.schema = copy.deepcopy(test_schema)
+        self.cache.get(Schema.get_collection('tests_question'))
+        self.assertEqual(self.calls, ['tests_question', 'tests_question'])
+
+    def test_invalidate_all(self):
+        collection = Schema.get_collection('tests_question')
+        self.cache.get(collection)
+        self.cache.get(Schema.get_collection('tests_choice'))
+        CollectionCache.invalidate_all('tests_question')
+        self.cache.get(collection)
+        self.cache.get(Schema.get_collection('tests_choice'))
+        self.assertEqual(self.calls, ['tests_question', 'tests_choice', 'tests_question'])
+
+        CollectionCache.invalidate_all()
+        self.cache.get(collection)
+        self.assertEqual(self.calls, ['tests_question', 'tests_choice', 'tests_question', 'tests_question'])
@@ -0,0 +1,66 @@
+import copy
+
+from django.test import TestCase
+
+from django_forest.tests.fixtures.schema import test_schema
+from django_forest.utils.collection_cache import CollectionCache
+from django_forest.utils.schema import Schema
+from django_forest.utils.schema.collection_info import CollectionInfo, FieldInfo, get_collection_info
+
+
+class UtilsCollectionInfoTests(TestCase):
+
+    def setUp(self):
+        Schema.schema = copy.deepcopy(test_schema)
+
+    def tearDown(self):
+        CollectionCache.invalidate_all()
+
+    def test_field_info_belongs_to(self):
+        field = FieldInfo(Schema.get_collection('tests_choice')['fields'][1])
+        self.assertEqual(field.name, 'question')
+        self.assertEqual(field.reference_collection, 'tests_question')
+        self.assertTrue(field.is_to_one)
+        self.assertFalse(field.is_virtual)
+        self.assertEqual(field.serialized_name, 'question')
+
+    def test_field_info_has_many(self):
+        collection = Schema.get_collection('tests_question')
+        field = FieldInfo(next(x for x in collection['fields'] if x['field'] == 'choice_set'))
+        self.assertEqual(field.type, ['Number'])
+        self.assertFalse(field.is_to_one)
+
+    def test_field_info_attribute(self):
+        collection = Schema.get_collection('tests_question')
+        field = FieldInfo(next(x for x in collection['fields'] if x['field'] == 'question_text'))
+        self.assertIsNone(field.reference)
+        self.assertEqual(field.reference_collection, '')
+        self.assertEqual(field.schema['field'], 'question_text')
+
+    def test_field_info_smart_relationship(self):
+        field = FieldInfo({'field': 'topic', 'type': 'String', 'is_virtual': True, 'reference': 'tests_topic.id'})
+        self.assertEqual(field.serialized_name, 'topic.id')
+        self.assertEqual(field.reference_collection, 'tests_topic')
+
+    def test_field_info_smart_relationship_smart_collection(self):
+        field = FieldInfo({'field': 'stats', 'type': 'String', 'is_virtual': True, 'reference': 'Stats.id'})
+        self.assertEqual(field.serialized_name, 'stats')
+
+    def test_collection_info(self):
+        collection = Schema.get_collection('tests_question')
+        collection['fields'].append({'field': 'foo', 'type': 'String', 'is_virtual': True, 'reference': None})
+        info = CollectionInfo(collection)
+        self.assertEqual(info.name, 'tests_question')
+        self.assertEqual([x.name for x in info.fields], [x['field'] for x in collection['fields']])
+        self.assertEqual(info.fields_by_name['question_text'].name, 'question_text')
+        self.assertEqual([x.name for x in info.smart_fields], ['foo'])
+
+    def test_get_collection_info(self):
+        info = get_collection_info('tests_question')
+        self.assertIs(get_collection_info('tests_question'), info)
+        self.assertIsNone(get_collection_info('tests_foo'))
+
+    def test_get_collection_info_schema_changed(self):
+        info = get_collection_info('tests_question')
+        Schema.schema = copy.deepcopy(test_schema)
+        self.assertIsNot(get_collection_info('tests_question'), info)
@@ -2,7 +2,7 @@ import os
 import pytest
 from django.test import TestCase, override_settings
 
-from django_forest.utils.forest_setting import get_forest_setting
+from django_forest.utils.forest_setting import get_forest_setting, strtobool
 
 
 class UtilsCorsTests(TestCase):
@@ -70,3 +70,8 @@ class UtilsCorsTests(TestCase):
             False
         )
 
+    def test_strtobool(self):
+        self.assertTrue(all(strtobool(x) for x in ['y', 'Yes', 't', 'TRUE', 'on', '1']))
+        self.assertFalse(any(strtobool(x) for x in ['n', 'No', 'f', 'FALSE', 'off', '0']))
+        with self.assertRaises(ValueError):
+            strtobool('foo')
@@ -10,6 +10,7 @@ from django_forest.utils.collection import Collection
 from django_forest.utils.schema.json_api_schema import JsonApiSchema, DjangoSchema
 from django_forest.utils.schema import Schema
 from django_forest.utils.scope import ScopeManager
+from django_forest.utils.testing import run_in_threads
 
 
 class UtilsJsonApiSchemaTests(TestCase):
@@ -181,6 +182,43 @@ class UtilsJsonApiSchemaTests(TestCase):
             ]
         })
 
+    def test_json_api_schema_releases_records(self):
+        Schema.handle_json_api_schema()
+        schema = JsonApiSchema.get('tests_choice')(include_data=('question',))
+        data = schema.dump(Choice.objects.all(), many=True)
+        self.assertEqual(len(data['included']), 2)
+        self.assertIsNone(schema._original)
+        self.assertEqual(schema.included_data, {})
+
+    def test_json_api_schema_lazy(self):
+        Schema.handle_json_api_schema()
+        self.assertNotIn('tests_choiceSchema', JsonApiSchema._registry)
+        self.assertIn('tests_choiceSchema', JsonApiSchema._pending)
+        schema = JsonApiSchema.get('tests_choice')
+        self.assertEqual(schema.__name__, 'tests_choiceSchema')
+        self.assertIs(JsonApiSchema._registry['tests_choiceSchema'], schema)
+        self.assertNotIn('tests_choiceSchema', JsonApiSchema._pending)
+        self.assertIs(JsonApiSchema.get('tests_choice'), schema)
+        # Notice: the related schema is built when a relationship includes it
+        self.assertNotIn('tests_questionSchema', JsonApiSchema._registry)
+        schema(include_data=('question',)).dump(Choice.objects.get(pk=1))
+        self.assertIsInstance(JsonApiSchema._registry['tests_questionSchema'], type)
+        self.assertTrue(all(isinstance(klass, type) for klass in JsonApiSchema._registry.values()))
+
+    def test_json_api_schema_lazy_rebuilt(self):
+        Schema.handle_json_api_schema()
+        question_schema = JsonApiSchema.get('tests_question')
+        Schema.handle_json_api_schema()
+        schema = JsonApiSchema.get('tests_choice')(include_data=('question',))
+        # Notice: the relationship serializes with the latest class of the related collection
+        self.assertIsNot(schema.fields['question'].schema.__class__, question_schema)
+        self.assertIs(schema.fields['question'].schema.__class__, JsonApiSchema.get('tests_question'))
+
+    def test_json_api_schema_lazy_concurrent(self):
+        Schema.handle_json_api_schema()
+        schemas = run_in_threads(lambda: JsonApiSchema.get('tests_question'))
+        self.assertEqual(len(set(schemas)), 1)
+
     def test_json_api_schema_pk_is_not_id(self):
         Schema.handle_json_api_schema()
         schema = JsonApiSchema.get('tests_session')
@@ -0,0 +1,189 @@
+import copy
+import gc
+import json
+import os
+import threading
+from unittest import mock
+
+import pytest
+from django.conf import settings
+from django.test import TestCase, override_settings
+
+from django_forest import preload_forest
+from django_forest.authentication.oidc.client_manager import OidcClientManager
+from django_forest.tests.fixtures.schema import test_schema
+from django_forest.resources.utils.queryset.filters.compiler import compiled_filters
+from django_forest.utils.collection import Collection
+from django_forest.utils.collection_cache import CollectionCache
+from django_forest.utils.forest_api_requester import ForestApiRequester
+from django_forest.utils.ip_whitelist import IpWhitelist
+from django_forest.utils import lifecycle
+from django_forest.utils.lifecycle import after_fork, freeze, prebuild, register_after_fork
+from django_forest.utils.permissions import Permission
+from django_forest.utils.schema import Schema
+from django_forest.utils.schema.json_api_schema import JsonApiSchema
+from django_forest.utils.scope import ScopeManager
+from django_forest.utils.slow_queries import SlowQueryRecorder
+from django_forest.utils.warmup import Warmup
+
+
+def run_in_child(func):
+    """Call `func` in a forked process, after after_fork, return its JSON result."""
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        try:
+            # Notice: as registered by register_after_fork, which cannot be unregistered from the test process
+            after_fork()
+            data = {'result': func()}
+        except BaseException as e:
+            data = {'error': repr(e)}
+        with os.fdopen(write_fd, 'w') as f:
+            json.dump(data, f)
+        # Notice: no cleanup of the parent state (test database, pytest)
+        os._exit(0)
+
+    os.close(write_fd)
+    with os.fdopen(read_fd, 'r') as f:
+        data = json.load(f)
+    os.waitpid(pid, 0)
+    if 'error' in data:
+        raise AssertionError(data['error'])
+    return data['result']
+
+
+def get_private_dirty():
+    with open('/proc/self/smaps_rollup', 'r') as f:
+        for line in f:
+            if line.startswith('Private_Dirty:'):
+                return int(line.split()[1])
+
+
+@pytest.mark.skipif(not hasattr(os, 'register_at_fork'), reason='requires os.fork and os.register_at_fork')
+class UtilsLifecycleTests(TestCase):
+
+    def setUp(self):
+        Schema.schema = copy.deepcopy(test_schema)
+        Schema.handle_json_api_schema()
+
+    def tearDown(self):
+        Collection._registry = {}
+        JsonApiSchema._registry = {}
+        Permission.reset()
+        ScopeManager.reset()
+        IpWhitelist.reset()
+        OidcClientManager.reset()
+        SlowQueryRecorder.reset()
+        Warmup.reset()
+        CollectionCache.invalidate_all()
+        if hasattr(gc, 'unfreeze'):
+            gc.unfreeze()
+
+    def test_after_fork_caches(self):
+        Permission.permissions_cached = {'1': {'data': {}}}
+        ScopeManager.cache = {'1': {'scopes': {}}}
+        IpWhitelist.fetched = True
+        IpWhitelist.rules = [{'type': 0, 'ip': '127.0.0.1'}]
+        OidcClientManager.client = object()
+
+        state = run_in_child(lambda: {
+            'permissions': Permission.permissions_cached,
+            'scopes': ScopeManager.cache,
+            'ip_whitelist': [IpWhitelist.fetched, IpWhitelist.rules],
+            'oidc_client': OidcClientManager.client is None,
+        })
+        self.assertEqual(state, {'permissions': {}, 'scopes': {}, 'ip_whitelist': [False, []], 'oidc_client': True})
+        # Notice: the parent keeps its own
+        self.assertEqual(Permission.permissions_cached, {'1': {'data': {}}})
+        self.assertTrue(IpWhitelist.fetched)
+
+    def test_after_fork_locks(self):
+        collection = Schema.get_collection('tests_question')
+        locks = [Permission._locks('1'), ScopeManager._locks('1'), IpWhitelist._fetch_lock,
+                 IpWhitelist._state_lock, OidcClientManager._lock, JsonApiSchema._lock, SlowQueryRecorder._lock,
+                 compiled_filters.get(collection).lock]
+        acquired, release = threading.Event(), threading.Event()
+
+        def hold():
+            for lock in locks:
+                lock.acquire()
+            acquired.set()
+            release.wait()
+            for lock in locks:
+                lock.release()
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        acquired.wait()
+        try:
+            # Notice: held by another thread at fork time, they would never be released in the child
+            results = run_in_child(lambda: [lock.acquire(timeout=1) for lock in [
+                Permission._locks('1'), ScopeManager._locks('1'), IpWhitelist._fetch_lock,
+                IpWhitelist._state_lock, OidcClientManager._lock, JsonApiSchema._lock, SlowQueryRecorder._lock,
+                compiled_filters.get(collection).lock]])
+        finally:
+            release.set()
+            thread.join()
+        self.assertEqual(results, [True] * 8)
+
+    @override_settings(FOREST={**settings.FOREST, 'WARMUP': True})
+    @mock.patch.object(IpWhitelist, 'get_rules')
+    @mock.patch.object(ForestApiRequester, 'get_from_rendering_id', return_value={})
+    def test_after_fork_warmup(self, mocked_get_from_rendering_id, mocked_get_rules):
+        Permission.permissions_cached = {'1': {'data': {}}}
+
+        def warmed_up():
+            Warmup.thread.join()
+            return [Warmup.is_ready(), list(Permission.permissions_cached), list(ScopeManager.cache)]
+
+        # Notice: the renderings cached by the parent are fetched again by the child
+        self.assertEqual(run_in_child(warmed_up), [True, ['1'], ['1']])
+
+    def test_after_fork_explicit(self):
+        Permission.permissions_cached = {'1': {'data': {}}}
+        lock = JsonApiSchema._lock
+        after_fork()
+        self.assertEqual(Permission.permissions_cached, {})
+        self.assertIsNot(JsonApiSchema._lock, lock)
+
+    @mock.patch('os.register_at_fork')
+    def test_register_after_fork(self, mocked_register_at_fork):
+        with mock.patch.object(lifecycle, '_after_fork_registered', False):
+            register_after_fork()
+            register_after_fork()
+        mocked_register_at_fork.assert_called_once_with(after_in_child=after_fork)
+
+    def test_prebuild(self):
+        prebuild()
+        schemas = {name: id(klass) for name, klass in JsonApiSchema._registry.items()}
+        self.assertTrue(all(isinstance(klass, type) for klass in JsonApiSchema._registry.values()))
+        # Notice: the same classes, nothing is built again in the child
+        self.assertEqual(run_in_child(lambda: {name: id(klass) for name, klass in JsonApiSchema._registry.items()}),
+                         schemas)
+
+    @pytest.mark.skipif(not os.path.exists('/proc/self/smaps_rollup') or not hasattr(gc, 'freeze'),
+                        reason='requires /proc/self/smaps_rollup and gc.freeze')
+    def test_freeze(self):
+        freeze()
+
+        def collect():
+            before = get_private_dirty()
+            gc.collect()
+            return get_private_dirty() - before
+
+        # Notice: in KiB, a collection of the whole test process writes tens of MiB without freeze
+        self.assertLess(run_in_child(collect), 2048)
+
+    @mock.patch.object(Schema, 'send_apimap_in_background')
+    @mock.patch('django_forest.utils.lifecycle.register_after_fork')
+    @mock.patch('django_forest.init_forest')
+    def test_preload_forest(self, mocked_init_forest, mocked_register_after_fork, mocked_send_apimap_in_background):
+        preload_forest()
+        # Notice: the apimap is sent after prebuild and freeze
+        mocked_init_forest.assert_called_once_with(send_apimap=False)
+        mocked_register_after_fork.assert_called_once_with()
+        mocked_send_apimap_in_background.assert_called_once_with()
+        self.assertTrue(all(isinstance(klass, type) for klass in JsonApiSchema._registry.values()))
+        if hasattr(gc, 'get_freeze_count'):
+            self.assertGreater(gc.get_freeze_count(), 0)
@@ -0,0 +1,109 @@
+import os
+import tempfile
+import time
+from unittest import mock
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+
+from django_forest.utils.metrics import Counter, Histogram, MetricsRegistry
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+        self.counter = Counter('test_total', 'A counter.', ('result',), registry=self.registry)
+        self.histogram = Histogram('test_seconds', 'A histogram.', registry=self.registry, buckets=(0.1, 1))
+
+    def test_render(self):
+        self.counter.inc(result='hit')
+        self.counter.inc(2, result='hit')
+        self.counter.inc(result='mi"ss')
+        self.histogram.observe(0.05)
+        self.histogram.observe(0.5)
+        self.histogram.observe(3)
+        self.assertEqual(self.registry.render(), '\n'.join([
+            '# HELP test_seconds A histogram.',
+            '# TYPE test_seconds histogram',
+            'test_seconds_bucket{le="0.1"} 1',
+            'test_seconds_bucket{le="1.0"} 2',
+            'test_seconds_bucket{le="+Inf"} 3',
+            'test_seconds_sum 3.55',
+            'test_seconds_count 3',
+            '# HELP test_total A counter.',
+            '# TYPE test_total counter',
+            'test_total{result="hit"} 3',
+            'test_total{result="mi\\"ss"} 1',
+        ]) + '\n')
+
+    def test_reset(self):
+        self.counter.inc(result='hit')
+        self.registry.reset()
+        self.assertEqual(self.registry.collect()['test_total']['samples'], {})
+
+    def test_after_fork(self):
+        self.counter.inc(result='hit')
+        # Notice: held by another thread of the parent at fork time
+        self.registry.lock.acquire()
+        self.registry.after_fork()
+        self.assertEqual(self.registry.collect()['test_total']['samples'], {})
+
+    def test_workers(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(FOREST={**settings.FOREST, 'METRICS_DIR': directory}):
+                # Notice: another worker wrote its file, it is aggregated with ours
+                other = MetricsRegistry()
+                Counter('test_total', 'A counter.', ('result',), registry=other).inc(5, result='hit')
+                other.flush()
+                os.rename(other.get_path(directory), os.path.join(directory, 'forest_metrics_0.json'))
+
+                self.counter.inc(result='hit')
+                self.histogram.observe(0.5)
+                collected = self.registry.collect()
+
+                self.assertEqual(collected['test_total']['samples'], {('hit',): 6})
+                self.assertEqual(collected['test_seconds']['samples'], {(): [0, 1, 0, 0.5, 1]})
+                self.assertEqual(sorted(os.listdir(directory)),
+                                 ['forest_metrics_0.json', os.path.basename(self.registry.get_path(directory))])
+
+    def test_workers_pid_reused(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(FOREST={**settings.FOREST, 'METRICS_DIR': directory}):
+                # Notice: an exited worker of the same pid, its file is kept and aggregated
+                exited = MetricsRegistry()
+                Counter('test_total', 'A counter.', ('result',), registry=exited).inc(5, result='hit')
+                exited.flush()
+
+                self.counter.inc(result='hit')
+                self.assertEqual(self.registry.collect()['test_total']['samples'], {('hit',): 6})
+                self.assertEqual(len(os.listdir(directory)), 2)
+
+    def test_after_fork_boot_id(self):
+        boot_id = self.registry.boot_id
+        self.registry.after_fork()
+        self.assertNotEqual(self.registry.boot_id, boot_id)
+
+    @mock.patch('django_forest.utils.metrics.FLUSH_INTERVAL', 0.01)
+    def test_changed(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(FOREST={**settings.FOREST, 'METRICS_DIR': directory}):
+                self.counter.inc(result='hit')
+                # Notice: not written by the request itself
+                self.assertEqual(os.listdir(directory), [])
+                self.assertEqual(self.registry.flusher.name, 'forest-metrics')
+
+                path = self.registry.get_path(directory)
+                deadline = time.monotonic() + 5
+                while not os.path.exists(path) and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                self.assertFalse(self.registry.dirty)
+                self.assertTrue(os.path.exists(path))
+
+    @mock.patch('django_forest.utils.metrics.FLUSH_INTERVAL', 3600)
+    def test_flush_at_exit(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(FOREST={**settings.FOREST, 'METRICS_DIR': directory}):
+                self.counter.inc(result='hit')
+                self.assertEqual(os.listdir(directory), [])
+                self.registry.flush_at_exit()
+                self.assertEqual(os.listdir(directory), [os.path.basename(self.registry.get_path(directory))])
@@ -7,8 +7,8 @@ from django_forest.utils.middlewares import set_middlewares
 class UtilsMiddlewaresTests(TestCase):
 
     def tearDown(self):
-        settings.MIDDLEWARE.remove('django_forest.middleware.PermissionMiddleware')
+        settings.MIDDLEWARE.remove('django_forest.middleware.ForestMiddleware')
 
     def test_set_middlewares(self):
         set_middlewares()
-        self.assertTrue('django_forest.middleware.PermissionMiddleware' in settings.MIDDLEWARE)
+        self.assertEqual(settings.MIDDLEWARE[0], 'django_forest.middleware.ForestMiddleware')
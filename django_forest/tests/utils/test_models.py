@@ -1,6 +1,6 @@
 from django.test import TestCase
 
-from django_forest.tests.models import Question
+from django_forest.tests.models import Choice, Question
 from django_forest.utils.models import Models
 
 
@@ -12,3 +12,40 @@ class UtilsGetModelTests(TestCase):
     def test_get_model_None(self):
         Model = Models.get('tests_foo')
         self.assertEqual(Model, None)
+
+    def test_get_model_plural(self):
+        self.assertEqual(Models.get('TESTS_QUESTIONS'), Question)
+
+    def test_get_model_list_changed(self):
+        Models.get('tests_question')
+        Models.models = [Choice]
+        try:
+            self.assertEqual(Models.get('tests_question'), None)
+            self.assertEqual(Models.get('tests_choice'), Choice)
+        finally:
+            Models.models = None
+
+    def test_includes(self):
+        self.assertTrue(Models.includes(Question))
+        Models.models = [Choice]
+        try:
+            self.assertFalse(Models.includes(Question))
+            self.assertTrue(Models.includes(Choice))
+        finally:
+            Models.models = None
+
+
+class UtilsModelMetadataTests(TestCase):
+    def test_get_association_field(self):
+        metadata = Models.get_metadata(Question)
+        self.assertEqual(metadata.get_association_field('choice_set'), Choice._meta.get_field('question').remote_field)
+        self.assertEqual(metadata.get_association_field('topic'), Question._meta.get_field('topic'))
+        self.assertEqual(metadata.get_association_field('foo'), None)
+
+    def test_get_field_type(self):
+        metadata = Models.get_metadata(Question)
+        self.assertEqual(metadata.get_field_type('question_text'), 'String')
+        self.assertEqual(metadata.get_field_type('pub_date'), 'Date')
+
+    def test_pk(self):
+        self.assertEqual(Models.get_metadata(Question).pk, Question._meta.pk)
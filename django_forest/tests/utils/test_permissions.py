@@ -0,0 +1,57 @@
+import time
+from unittest import mock
+
+from django.test import TestCase
+
+from django_forest.utils.forest_api_requester import ForestApiRequester
+from django_forest.utils.permissions import Permission
+from django_forest.utils.testing import run_in_threads
+
+
+def get_permissions(route, rendering_id):
+    return {
+        'data': {
+            'collections': {
+                'tests_question': {'collection': {'browseEnabled': [int(rendering_id)]}, 'actions': {}},
+            },
+            'renderings': {},
+        },
+        'stats': {'queries': [f'SELECT {rendering_id}']},
+    }
+
+
+def get_permissions_slowly(route, rendering_id):
+    time.sleep(0.05)
+    return get_permissions(route, rendering_id)
+
+
+class PermissionCacheTests(TestCase):
+    def tearDown(self):
+        Permission.permissions_cached = {}
+
+    @mock.patch.object(ForestApiRequester, 'get_from_rendering_id', side_effect=get_permissions)
+    def test_by_rendering(self, mocked_get):
+        self.assertTrue(Permission.is_authorized(Permission('tests_question', 'browseEnabled', 1, 1)))
+        # Notice: the permissions of rendering 1 do not apply to rendering 2
+        self.assertFalse(Permission.is_authorized(Permission('tests_question', 'browseEnabled', 2, 1)))
+        self.assertFalse(Permission.is_authorized(Permission('tests_question', 'liveQueries', 2, 2,
+                                                             query_request_info='SELECT 1')))
+        self.assertTrue(Permission.is_authorized(Permission('tests_question', 'liveQueries', 1, 2,
+                                                            query_request_info='SELECT 1')))
+        self.assertEqual(sorted(Permission.permissions_cached.keys()), ['1', '2'])
+
+    @mock.patch.object(ForestApiRequester, 'get_from_rendering_id', side_effect=get_permissions_slowly)
+    def test_concurrent_fetch(self, mocked_get):
+        results = run_in_threads(
+            lambda: Permission.is_authorized(Permission('tests_question', 'browseEnabled', 1, 1)))
+        self.assertEqual(results, [True] * 8)
+        mocked_get.assert_called_once_with('/liana/v3/permissions', '1')
+
+    @mock.patch.object(ForestApiRequester, 'get_from_rendering_id', side_effect=get_permissions_slowly)
+    def test_concurrent_fetch_not_allowed(self, mocked_get):
+        Permission.is_authorized(Permission('tests_question', 'browseEnabled', 1, 1))
+        # Notice: a denial fetches the permissions again, once for the concurrent requests
+        results = run_in_threads(
+            lambda: Permission.is_authorized(Permission('tests_question', 'browseEnabled', 1, 2)))
+        self.assertEqual(results, [False] * 8)
+        self.assertEqual(mocked_get.call_count, 2)
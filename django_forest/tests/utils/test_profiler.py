@@ -0,0 +1,104 @@
+import os
+import pstats
+import tempfile
+from unittest import mock
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from django_forest.middleware import ForestMiddleware
+from django_forest.utils.profiler import profiler
+
+
+def smart_field(request):
+    return HttpResponse('ok')
+
+
+def get_response(request):
+    return smart_field(request)
+
+
+@mock.patch('jose.jwt.decode', return_value={'id': 1, 'email': 'admin@forest.com', 'rendering_id': 1})
+class ProfilerTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.settings = {
+            **settings.FOREST,
+            'PROFILER_DIR': self.directory.name,
+            'PROFILER_USERS': ['admin@forest.com'],
+            'PROFILER_MAX_FILES': 2,
+        }
+        self.factory = RequestFactory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def get(self, path='/forest/tests_question', **headers):
+        middleware = ForestMiddleware(get_response)
+        return middleware(self.factory.get(path, HTTP_AUTHORIZATION='Bearer token', **headers))
+
+    def test_profile(self, mocked_decode):
+        with override_settings(FOREST=self.settings):
+            response = self.get(HTTP_X_FOREST_PROFILE='1')
+            self.assertEqual(profiler.list(), [response['X-Forest-Profile-Id']])
+            path = profiler.get_path(response['X-Forest-Profile-Id'])
+
+        stats = pstats.Stats(path)
+        self.assertTrue(any(function == 'smart_field' for _, _, function in stats.stats))
+
+    def test_bounded(self, mocked_decode):
+        with override_settings(FOREST=self.settings):
+            profile_ids = []
+            for i in range(3):
+                profile_ids.append(self.get(HTTP_X_FOREST_PROFILE='1')['X-Forest-Profile-Id'])
+                # Notice: the profiles are ordered by modification time
+                os.utime(os.path.join(self.directory.name, f'{profile_ids[-1]}.prof'), (i, i))
+            self.assertEqual(profiler.list(), profile_ids[:0:-1])
+
+    def test_list_removed(self, mocked_decode):
+        with override_settings(FOREST=self.settings):
+            profile_ids = [self.get(HTTP_X_FOREST_PROFILE='1')['X-Forest-Profile-Id'] for _ in range(2)]
+            getmtime = os.path.getmtime
+
+            def removed_getmtime(path):
+                # Notice: the first profile is removed by a concurrent prune after the directory listing
+                if profile_ids[0] in path:
+                    os.remove(path)
+                return getmtime(path)
+
+            with mock.patch('os.path.getmtime', side_effect=removed_getmtime):
+                self.assertEqual(profiler.list(), profile_ids[1:])
+
+    def test_list_other_files(self, mocked_decode):
+        for name in ('0' * 32 + '.json', 'notes.prof', '0' * 32):
+            with open(os.path.join(self.directory.name, name), 'w'):
+                pass
+        with override_settings(FOREST=self.settings):
+            profile_id = self.get(HTTP_X_FOREST_PROFILE='1')['X-Forest-Profile-Id']
+            self.assertEqual(profiler.list(), [profile_id])
+        # Notice: not counted, nor removed, by the retention
+        self.assertEqual(len(os.listdir(self.directory.name)), 4)
+
+    def test_not_requested(self, mocked_decode):
+        with override_settings(FOREST=self.settings):
+            self.assertNotIn('X-Forest-Profile-Id', self.get())
+            self.assertNotIn('X-Forest-Profile-Id', self.get('/admin', HTTP_X_FOREST_PROFILE='1'))
+            self.assertEqual(profiler.list(), [])
+
+    def test_not_authorized(self, mocked_decode):
+        with override_settings(FOREST={**self.settings, 'PROFILER_USERS': ['other@forest.com']}):
+            self.assertNotIn('X-Forest-Profile-Id', self.get(HTTP_X_FOREST_PROFILE='1'))
+        mocked_decode.side_effect = Exception('invalid token')
+        with override_settings(FOREST=self.settings):
+            self.assertNotIn('X-Forest-Profile-Id', self.get(HTTP_X_FOREST_PROFILE='1'))
+            self.assertEqual(profiler.list(), [])
+
+    def test_disabled(self, mocked_decode):
+        self.assertNotIn('X-Forest-Profile-Id', self.get(HTTP_X_FOREST_PROFILE='1'))
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+    def test_get_path(self, mocked_decode):
+        with override_settings(FOREST=self.settings):
+            self.assertIsNone(profiler.get_path('../settings'))
+            self.assertIsNone(profiler.get_path('0' * 32))
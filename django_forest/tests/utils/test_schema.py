@@ -115,9 +115,33 @@ class UtilsSchemaTests(TestCase):
         collection = Schema.get_collection('Foo')
         self.assertEqual(collection, None)
 
+    def test_get_collection_schema_changed(self):
+        Schema.get_collection('tests_question')
+        Schema.schema['collections'].append({'name': 'tests_foo'})
+        self.assertEqual(Schema.get_collection('tests_foo'), {'name': 'tests_foo'})
+        Schema.schema = {'collections': []}
+        self.assertEqual(Schema.get_collection('tests_question'), None)
+
+    def test_get_default_mutable_values(self):
+        definition = {'name': '', 'fields': [], 'meta': {'foo': 'bar'}}
+        obj = Schema.get_default({'name': 'tests_foo'}, definition)
+        self.assertEqual(obj, {'name': 'tests_foo', 'fields': [], 'meta': {'foo': 'bar'}})
+        obj['fields'].append('foo')
+        obj['meta']['foo'] = 'baz'
+        self.assertEqual(definition, {'name': '', 'fields': [], 'meta': {'foo': 'bar'}})
+
     def test_handle_json_api_schema(self):
         Schema.handle_json_api_schema()
-        self.assertEqual(len(JsonApiSchema._registry), 22)
+        self.assertEqual(len(JsonApiSchema._pending), 22)
+        # Notice: built on first use
+        self.assertEqual(JsonApiSchema._registry, {})
+
+    @override_settings(FOREST={'PREBUILT_SERIALIZERS': ['tests_question']})
+    def test_handle_json_api_schema_prebuilt(self):
+        Schema.handle_json_api_schema()
+        self.assertIsInstance(JsonApiSchema._registry['tests_questionSchema'], type)
+        self.assertNotIn('tests_choiceSchema', JsonApiSchema._registry)
+        self.assertIn('tests_choiceSchema', JsonApiSchema._pending)
 
 
 # reset forest config dir auto import
@@ -200,63 +224,121 @@ class UtilsSchemaFileTests(TestCase):
             self.assertFalse('get' in foo_field)
             self.assertIsNotNone(Schema.schema_data)
 
+    @pytest.mark.usefixtures('reset_config_dir_import')
+    @override_settings(DEBUG=True)
+    def test_handle_schema_file_debug_unchanged(self):
+        Schema.handle_schema_file()
+        os.utime(file_path, (0, 0))
+        Schema.handle_schema_file()
+        self.assertEqual(os.path.getmtime(file_path), 0)
+
+        Schema.schema['collections'][0]['icon'] = 'foo'
+        Schema.handle_schema_file()
+        self.assertNotEqual(os.path.getmtime(file_path), 0)
+        with open(file_path, 'r') as f:
+            self.assertEqual(json.load(f)['collections'][0]['icon'], 'foo')
+
+    @pytest.mark.usefixtures('reset_config_dir_import')
+    @override_settings(DEBUG=True)
+    def test_handle_schema_file_debug_copy(self):
+        Schema.handle_schema_file()
+        Schema.schema_data['collections'][0]['fields'].append({'field': 'foo'})
+        self.assertNotIn({'field': 'foo'}, Schema.schema['collections'][0]['fields'])
+
 
+def get_apimap(serialized_schema):
+    schema_hash = Schema.get_schema_hash(serialized_schema)
+    return {**serialized_schema, 'meta': {**serialized_schema['meta'], 'schemaFileHash': schema_hash}}
+
+
+# Notice: no delay between the apimap upload retries
+@mock.patch('django_forest.utils.schema.time.sleep')
 class UtilsSchemaSendTests(TestCase):
 
-    def test_get_serialized_schema(self):
+    def test_get_serialized_schema(self, mocked_sleep):
         Schema.schema_data = test_question_schema_data
         serialized_schema = Schema.get_serialized_schema()
         self.assertEqual(serialized_schema, test_serialized_schema)
 
+    def test_get_schema_hash(self, mocked_sleep):
+        schema_hash = Schema.get_schema_hash(test_serialized_schema)
+        self.assertEqual(len(schema_hash), 40)
+        self.assertEqual(Schema.get_schema_hash(copy.deepcopy(test_serialized_schema)), schema_hash)
+        changed_schema = copy.deepcopy(test_serialized_schema)
+        changed_schema['data'][0]['attributes']['icon'] = 'foo'
+        self.assertNotEqual(Schema.get_schema_hash(changed_schema), schema_hash)
+
     @override_settings(FOREST={'FOREST_DISABLE_AUTO_SCHEMA_APPLY': True})
     @mock.patch.object(Schema, 'get_serialized_schema')
-    def test_send_apimap_disable_apply(self, mocked_get_serialized_schema):
+    def test_send_apimap_disable_apply(self, mocked_get_serialized_schema, mocked_sleep):
         Schema.send_apimap()
         mocked_get_serialized_schema.assert_not_called()
 
     @override_settings(FOREST={'FOREST_DISABLE_AUTO_SCHEMA_APPLY': 'foo'})
-    def test_send_apimap_server_error(self):
+    def test_send_apimap_server_error(self, mocked_sleep):
         self.assertRaises(Exception, Schema.send_apimap())
 
     @override_settings(DEBUG=True)
     @mock.patch('requests.post', return_value=mocked_requests({'key1': 'value1'}, 200))
-    def test_send_apimap(self, mocked_requests_post):
+    def test_send_apimap(self, mocked_requests_post, mocked_sleep):
         Schema.schema_data = test_question_schema_data
         Schema.send_apimap()
-        mocked_requests_post.assert_called_once_with(
-            'https://api.test.forestadmin.com/forest/apimaps',
-            data=json.dumps(test_serialized_schema),
-            headers={'Content-Type': 'application/json', 'forest-secret-key': 'foo'},
-            params={},
-            verify=False
-        )
+        schema_hash = Schema.get_schema_hash(test_serialized_schema)
+        mocked_requests_post.assert_has_calls([
+            mock.call(
+                'https://api.test.forestadmin.com/forest/apimaps/hashcheck',
+                data=json.dumps({'schemaFileHash': schema_hash}),
+                headers={'Content-Type': 'application/json', 'forest-secret-key': 'foo'},
+                params={},
+                verify=False
+            ),
+            mock.call(
+                'https://api.test.forestadmin.com/forest/apimaps',
+                data=json.dumps(get_apimap(test_serialized_schema)),
+                headers={'Content-Type': 'application/json', 'forest-secret-key': 'foo'},
+                params={},
+                verify=False
+            ),
+        ])
+        self.assertEqual(Schema.schema_data, test_question_schema_data)
+        self.assertNotIn('schemaFileHash', Schema.schema_data['meta'])
 
     @override_settings(DEBUG=True)
     @mock.patch('requests.post', return_value=mocked_requests_no_data(204))
-    def test_send_apimap_no_changes(self, mocked_requests_post):
+    def test_send_apimap_no_changes(self, mocked_requests_post, mocked_sleep):
         Schema.schema_data = test_question_schema_data
         Schema.send_apimap()
-        mocked_requests_post.assert_called_once_with(
+        mocked_requests_post.assert_called_with(
             'https://api.test.forestadmin.com/forest/apimaps',
-            data=json.dumps(test_serialized_schema),
+            data=json.dumps(get_apimap(test_serialized_schema)),
             headers={'Content-Type': 'application/json', 'forest-secret-key': 'foo'},
             params={},
             verify=False
         )
 
     @mock.patch('requests.post', return_value=mocked_requests({'key1': 'value1'}, 200))
-    def test_send_apimap_production(self, mocked_requests_post):
+    def test_send_apimap_production(self, mocked_requests_post, mocked_sleep):
         Schema.schema_data = test_question_schema_data
         Schema.send_apimap()
-        mocked_requests_post.assert_called_once_with(
+        mocked_requests_post.assert_called_with(
             'https://api.test.forestadmin.com/forest/apimaps',
-            data=json.dumps(test_serialized_schema),
+            data=json.dumps(get_apimap(test_serialized_schema)),
             headers={'Content-Type': 'application/json', 'forest-secret-key': 'foo'},
             params={},
         )
 
+    @mock.patch('requests.post', return_value=mocked_requests({'sendSchema': False}, 200))
+    def test_send_apimap_unchanged_hash(self, mocked_requests_post, mocked_sleep):
+        Schema.schema_data = test_question_schema_data
+        with self.assertLogs(level='INFO') as cm:
+            Schema.send_apimap()
+        mocked_requests_post.assert_called_once()
+        self.assertEqual(mocked_requests_post.call_args[0][0],
+                         'https://api.test.forestadmin.com/forest/apimaps/hashcheck')
+        self.assertEqual(cm.records[0].message, 'No change in the apimap, nothing sent to Forest.')
+
     @mock.patch('requests.post', return_value=mocked_requests({'warning': 'foo'}, 200))
-    def test_send_apimap_warning(self, mocked_requests_post):
+    def test_send_apimap_warning(self, mocked_requests_post, mocked_sleep):
         Schema.schema_data = test_question_schema_data
         with self.assertLogs() as cm:
             Schema.send_apimap()
@@ -264,34 +346,56 @@ class UtilsSchemaSendTests(TestCase):
             self.assertEqual(cm.records[0].levelname, 'WARNING')
 
     @mock.patch('requests.post', side_effect=Exception('foo'))
-    def test_send_apimap_zero(self, mocked_requests_post):
+    def test_send_apimap_zero(self, mocked_requests_post, mocked_sleep):
         Schema.schema_data = test_question_schema_data
         with self.assertLogs() as cm:
             self.assertRaises(Exception, Schema.send_apimap())
             self.assertEqual(cm.records[0].message,
                              'Cannot send the apimap to Forest. Are you online?')
             self.assertEqual(cm.records[0].levelname, 'WARNING')
+        # Notice: hash check and upload, retried 3 times
+        self.assertEqual(mocked_requests_post.call_count, 8)
+        self.assertEqual(mocked_sleep.call_args_list, [mock.call(1), mock.call(2), mock.call(4)])
 
     @mock.patch('requests.post', return_value=mocked_requests({}, 404))
-    def test_send_apimap_not_found(self, mocked_requests_post):
+    def test_send_apimap_not_found(self, mocked_requests_post, mocked_sleep):
         Schema.schema_data = test_question_schema_data
         with self.assertLogs() as cm:
             Schema.send_apimap()
             self.assertEqual(cm.records[0].message,
                              'Cannot find the project related to the envSecret you configured. Can you check on Forest that you copied it properly in the Forest settings?')
             self.assertEqual(cm.records[0].levelname, 'ERROR')
+        mocked_sleep.assert_not_called()
 
     @mock.patch('requests.post', return_value=mocked_requests({}, 503))
-    def test_send_apimap_unavailable(self, mocked_requests_post):
+    def test_send_apimap_unavailable(self, mocked_requests_post, mocked_sleep):
         Schema.schema_data = test_question_schema_data
         with self.assertLogs() as cm:
             Schema.send_apimap()
             self.assertEqual(cm.records[0].message,
                              'Forest is in maintenance for a few minutes. We are upgrading your experience in the forest. We just need a few more minutes to get it right.')
             self.assertEqual(cm.records[0].levelname, 'WARNING')
+        self.assertEqual(mocked_sleep.call_count, 3)
+
+    @mock.patch('requests.post', side_effect=[mocked_requests({}, 200), mocked_requests({}, 503),
+                                              mocked_requests({}, 200), mocked_requests({}, 200)])
+    def test_send_apimap_retry(self, mocked_requests_post, mocked_sleep):
+        Schema.schema_data = test_question_schema_data
+        Schema.send_apimap()
+        self.assertEqual(mocked_requests_post.call_count, 4)
+        mocked_sleep.assert_called_once_with(1)
+
+    @override_settings(FOREST={'FOREST_ENV_SECRET': 'foo', 'APIMAP_RETRIES': 0})
+    @mock.patch('requests.post', return_value=mocked_requests({}, 503))
+    def test_send_apimap_no_retry(self, mocked_requests_post, mocked_sleep):
+        Schema.schema_data = test_question_schema_data
+        with self.assertLogs():
+            Schema.send_apimap()
+        self.assertEqual(mocked_requests_post.call_count, 2)
+        mocked_sleep.assert_not_called()
 
     @mock.patch('requests.post', return_value=mocked_requests({}, 500))
-    def test_send_apimap_error(self, mocked_requests_post):
+    def test_send_apimap_error(self, mocked_requests_post, mocked_sleep):
         Schema.schema_data = test_question_schema_data
 
         with self.assertLogs() as cm:
@@ -300,8 +404,26 @@ class UtilsSchemaSendTests(TestCase):
                              'An error occured with the apimap sent to Forest. Please contact support@forestadmin.com for further investigations.')
             self.assertEqual(cm.records[0].levelname, 'ERROR')
 
+    @mock.patch('atexit.register')
+    @mock.patch.object(Schema, 'send_apimap')
+    def test_send_apimap_in_background(self, mocked_send_apimap, mocked_register, mocked_sleep):
+        thread = Schema.send_apimap_in_background()
+        thread.join()
+        self.assertEqual(thread.name, 'forest-apimap')
+        self.assertTrue(thread.daemon)
+        mocked_send_apimap.assert_called_once_with()
+        mocked_register.assert_called_once_with(thread.join, 5)
+
 
 class UtilsSchemaInitTests(TestCase):
+    def setUp(self):
+        # Notice: the meta is set by the first build
+        Schema.schema = {'collections': [], 'meta': {}}
+        Schema.build_schema()
+
+    def tearDown(self):
+        Schema.schema = copy.deepcopy(test_schema)
+
     def test_schema_meta(self):
         self.assertTrue('liana' in Schema.schema['meta'])
         self.assertTrue('liana_version' in Schema.schema['meta'])
@@ -0,0 +1,114 @@
+import copy
+import json
+import os
+import sys
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from django_forest.management.commands.forest_schema_artifact import Command
+from django_forest.tests.fixtures.schema import test_schema
+from django_forest.tests.models import Question
+from django_forest.utils.collection import Collection
+from django_forest.utils.models import Models
+from django_forest.utils.schema import Schema
+from django_forest.utils.schema.artifact import build_artifact, get_model_fingerprint, load_artifact
+from django_forest.utils.schema.json_api_schema import JsonApiSchema
+from django_forest.utils.scope import ScopeManager
+
+
+class UtilsSchemaArtifactTests(TestCase):
+
+    def setUp(self):
+        Schema.schema = copy.deepcopy(test_schema)
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.directory.name, 'artifact.json')
+
+    def tearDown(self):
+        self.directory.cleanup()
+        Collection._registry = {}
+        JsonApiSchema._registry = {}
+        ScopeManager.cache = {}
+        Models.models = None
+        Models.build()
+
+    def write_artifact(self, **kwargs):
+        artifact = {**build_artifact(), **kwargs}
+        with open(self.file_path, 'w') as f:
+            json.dump(artifact, f)
+        return artifact
+
+    def test_model_fingerprint(self):
+        fingerprint = get_model_fingerprint(Question)
+        self.assertEqual(len(fingerprint), 40)
+        self.assertEqual(get_model_fingerprint(Question), fingerprint)
+
+    def test_model_fingerprint_changed_source(self):
+        fingerprint = get_model_fingerprint(Question)
+        file_path = os.path.join(self.directory.name, 'models.py')
+        with open(file_path, 'w') as f:
+            f.write('# changed models\n')
+        with mock.patch.object(sys.modules[Question.__module__], '__file__', file_path):
+            self.assertNotEqual(get_model_fingerprint(Question), fingerprint)
+
+    def test_load_artifact_no_setting(self):
+        self.assertFalse(load_artifact())
+
+    def test_load_artifact(self):
+        artifact = self.write_artifact()
+        expected_collections = copy.deepcopy(Schema.schema['collections'])
+        Schema.schema['collections'] = []
+        with override_settings(FOREST={'SCHEMA_ARTIFACT': self.file_path}):
+            self.assertTrue(load_artifact())
+        self.assertEqual(Schema.schema['collections'], expected_collections)
+        self.assertEqual(Models.get_metadata(Question).field_types, artifact['serializers']['tests_question'])
+        self.assertEqual(Models.get_metadata(Question).field_types['pub_date'], 'Date')
+
+    def test_load_artifact_missing(self):
+        with override_settings(FOREST={'SCHEMA_ARTIFACT': self.file_path}), self.assertLogs() as cm:
+            self.assertFalse(load_artifact())
+        self.assertIn('Cannot read the Forest schema artifact', cm.records[0].message)
+
+    def test_load_artifact_other_version(self):
+        self.write_artifact(liana_version='0.0.0-old')
+        with override_settings(FOREST={'SCHEMA_ARTIFACT': self.file_path}), self.assertLogs() as cm:
+            self.assertFalse(load_artifact())
+        self.assertEqual(cm.records[0].message,
+                         'The Forest schema artifact was built by another version, the models are introspected.')
+
+    def test_load_artifact_stale(self):
+        artifact = build_artifact()
+        self.write_artifact(fingerprints={**artifact['fingerprints'], 'tests_question': 'foo'})
+        Schema.schema['collections'] = []
+        with override_settings(FOREST={'SCHEMA_ARTIFACT': self.file_path}), self.assertLogs() as cm:
+            self.assertFalse(load_artifact())
+        self.assertEqual(cm.records[0].message,
+                         'The Forest schema artifact is stale (tests_question), the models are introspected.')
+        self.assertEqual(Schema.schema['collections'], [])
+
+    def test_load_artifact_other_models(self):
+        artifact = build_artifact()
+        self.write_artifact(fingerprints={**artifact['fingerprints'], 'tests_foo': 'foo'})
+        with override_settings(FOREST={'SCHEMA_ARTIFACT': self.file_path}), self.assertLogs():
+            self.assertFalse(load_artifact())
+
+    # Notice: the command object, django_forest is not an installed app of the test settings
+    def test_command(self):
+        out = StringIO()
+        call_command(Command(), output=self.file_path, stdout=out)
+        with open(self.file_path, 'r') as f:
+            artifact = json.load(f)
+        self.assertEqual(artifact['collections'], Schema.schema['collections'])
+        self.assertIn(f'Forest schema artifact written to {self.file_path}', out.getvalue())
+
+    def test_command_setting(self):
+        with override_settings(FOREST={'SCHEMA_ARTIFACT': self.file_path}):
+            call_command(Command(), stdout=StringIO())
+        self.assertTrue(os.path.exists(self.file_path))
+
+    def test_command_no_path(self):
+        with self.assertRaises(CommandError):
+            call_command(Command())
@@ -0,0 +1,162 @@
+import copy
+import threading
+import time
+from datetime import datetime
+from unittest import mock
+
+import pytz
+from django.test import TestCase
+
+from django_forest.resources.utils.queryset.scope import ScopeMixin
+from django_forest.tests.fixtures.schema import test_schema
+from django_forest.tests.models import Question
+from django_forest.utils.collection_cache import CollectionCache
+from django_forest.utils.forest_api_requester import ForestApiRequester
+from django_forest.utils.schema import Schema
+from django_forest.utils.scope import ScopeManager
+from django_forest.utils.testing import run_in_threads
+
+mocked_scopes = {
+    'tests_question': {
+        'scope': {
+            'filter': {
+                'aggregator': 'and',
+                'conditions': [
+                    {'field': 'question_text', 'operator': 'contains', 'value': '$currentUser.name'},
+                    {'field': 'id', 'operator': 'greater_than', 'value': 1},
+                ]
+            },
+            'dynamicScopesValues': {
+                'users': {
+                    '1': {'$currentUser.name': 'color'},
+                    '2': {'$currentUser.name': 'singer'},
+                }
+            }
+        }
+    },
+    'tests_choice': {
+        'scope': {
+            'filter': {
+                'aggregator': 'and',
+                'conditions': [
+                    {'field': 'choice_text', 'operator': 'contains', 'value': 'yes'},
+                ]
+            },
+            'dynamicScopesValues': {}
+        }
+    },
+}
+
+
+def get_request(timezone='Europe/Paris'):
+    request = mock.Mock()
+    request.GET = {'timezone': timezone}
+    return request
+
+
+@mock.patch('django_forest.utils.scope.ScopeManager._has_cache_expired', return_value=False)
+class ScopeManagerTests(TestCase):
+    def setUp(self):
+        Schema.schema = copy.deepcopy(test_schema)
+        self.scopes = copy.deepcopy(mocked_scopes)
+        ScopeManager.cache = {
+            '1': {
+                'scopes': self.scopes,
+                'fetched_at': datetime(2021, 7, 8, 9, 20, 22, 582772, tzinfo=pytz.UTC)
+            }
+        }
+
+    def tearDown(self):
+        ScopeManager.cache = {}
+
+    def test_bind_users(self, mocked_has_cache_expired):
+        first = ScopeManager.get_scope_for_user({'id': 1, 'rendering_id': 1}, 'tests_question')
+        second = ScopeManager.get_scope_for_user({'id': 2, 'rendering_id': 1}, 'tests_question')
+        self.assertEqual(first['conditions'][0]['value'], 'color')
+        self.assertEqual(second['conditions'][0]['value'], 'singer')
+        self.assertEqual(first['conditions'][1]['value'], 1)
+        # Notice: the fetched scopes keep their placeholders
+        self.assertEqual(self.scopes, mocked_scopes)
+
+    def test_static_scope(self, mocked_has_cache_expired):
+        scope = ScopeManager.get_scope_for_user({'id': 1, 'rendering_id': 1}, 'tests_choice')
+        self.assertIs(scope, self.scopes['tests_choice']['scope']['filter'])
+
+    def test_no_scope(self, mocked_has_cache_expired):
+        self.assertIsNone(ScopeManager.get_scope_for_user({'id': 1, 'rendering_id': 1}, 'tests_topic'))
+
+    def test_missing_user_values(self, mocked_has_cache_expired):
+        self.assertIsNone(ScopeManager.get_scope_for_user({'id': 3, 'rendering_id': 1}, 'tests_question'))
+
+    def test_memoized(self, mocked_has_cache_expired):
+        token = {'id': 1, 'rendering_id': 1}
+        user_scope = ScopeManager.get_user_scope(token, 'tests_question')
+        self.assertIs(ScopeManager.get_user_scope(token, 'tests_question'), user_scope)
+        ScopeManager.invalidate_scope_cache('1')
+        ScopeManager.cache['1'] = {'scopes': self.scopes, 'fetched_at': datetime.now(pytz.UTC)}
+        self.assertIsNot(ScopeManager.get_user_scope(token, 'tests_question'), user_scope)
+
+    def test_invalidate_user_scopes(self, mocked_has_cache_expired):
+        question_scope = ScopeManager.get_user_scope({'id': 1, 'rendering_id': 1}, 'tests_question')
+        choice_scope = ScopeManager.get_user_scope({'id': 1, 'rendering_id': 1}, 'tests_choice')
+        CollectionCache.invalidate_all('tests_question')
+        self.assertIsNot(ScopeManager.get_user_scope({'id': 1, 'rendering_id': 1}, 'tests_question'), question_scope)
+        self.assertIs(ScopeManager.get_user_scope({'id': 1, 'rendering_id': 1}, 'tests_choice'), choice_scope)
+        Schema.build_schema()
+        self.assertIsNot(ScopeManager.get_user_scope({'id': 1, 'rendering_id': 1}, 'tests_choice'), choice_scope)
+        # Notice: the fetched scopes are kept
+        self.assertIs(ScopeManager.cache['1']['scopes'], self.scopes)
+
+    @mock.patch('django_forest.resources.utils.queryset.scope.get_token', return_value={'id': 1, 'rendering_id': 1})
+    def test_scope_mixin_memoized(self, mocked_get_token, mocked_has_cache_expired):
+        q_object = ScopeMixin().get_scope(get_request(), Question)
+        self.assertIs(ScopeMixin().get_scope(get_request(), Question), q_object)
+        self.assertEqual(list(Question.objects.filter(q_object)), [])
+
+    @mock.patch('django_forest.resources.utils.queryset.scope.get_token', return_value={'id': 2, 'rendering_id': 1})
+    def test_scope_mixin_date(self, mocked_get_token, mocked_has_cache_expired):
+        self.scopes['tests_question']['scope']['filter']['conditions'].append(
+            {'field': 'pub_date', 'operator': 'past', 'value': None}
+        )
+        q_object = ScopeMixin().get_scope(get_request(), Question)
+        self.assertIsNot(ScopeMixin().get_scope(get_request(), Question), q_object)
+        self.assertIsNone(ScopeManager.get_user_scope({'id': 2, 'rendering_id': 1}, 'tests_question').q_object)
+
+
+class ScopeManagerConcurrencyTests(TestCase):
+    def tearDown(self):
+        ScopeManager.cache = {}
+
+    @staticmethod
+    def get_scopes_slowly(route, rendering_id):
+        time.sleep(0.05)
+        return copy.deepcopy(mocked_scopes)
+
+    def test_concurrent_fetch(self):
+        with mock.patch.object(ForestApiRequester, 'get_from_rendering_id',
+                               side_effect=self.get_scopes_slowly) as mocked_get:
+            results = run_in_threads(
+                lambda: ScopeManager.get_scope_for_user({'id': 1, 'rendering_id': 1}, 'tests_question'))
+        self.assertEqual([x['conditions'][0]['value'] for x in results], ['color'] * 8)
+        mocked_get.assert_called_once_with('/liana/scopes', '1')
+
+    def test_invalidate_during_fetch(self):
+        started = threading.Event()
+
+        def get_scopes(route, rendering_id):
+            started.set()
+            return self.get_scopes_slowly(route, rendering_id)
+
+        with mock.patch.object(ForestApiRequester, 'get_from_rendering_id', side_effect=get_scopes):
+            thread = threading.Thread(
+                target=ScopeManager.get_scope_for_user, args=({'id': 1, 'rendering_id': 1}, 'tests_question'))
+            thread.start()
+            started.wait()
+            # Notice: waits for the fetch, whose scopes may be older than the invalidation
+            ScopeManager.invalidate_scope_cache('1')
+            thread.join()
+        self.assertNotIn('1', ScopeManager.cache)
+
+    def test_invalidate_missing(self):
+        ScopeManager.invalidate_scope_cache('1')
+        self.assertEqual(ScopeManager.cache, {})
@@ -0,0 +1,80 @@
+import copy
+from unittest import mock
+
+from django.contrib.postgres.search import SearchQuery
+from django.db.models import Q
+from django.test import TestCase
+
+from django_forest.resources.utils.queryset.search import SearchMixin
+from django_forest.tests.fixtures.schema import test_schema
+from django_forest.tests.models import Choice, Question
+from django_forest.utils.collection import Collection
+from django_forest.utils.schema import Schema
+from django_forest.utils.search_backends import IcontainsSearchBackend, PostgresSearchBackend
+from django_forest.utils.search_plan import SearchTerm, search_plans
+
+
+class ChoiceForest(Collection):
+    search_backend = PostgresSearchBackend(config='english')
+
+
+class QuestionForest(Collection):
+    search_backend = PostgresSearchBackend(config='english')
+
+
+class UtilsSearchBackendsTests(TestCase):
+    fixtures = ['question.json', 'choice.json']
+
+    def setUp(self):
+        Schema.schema = copy.deepcopy(test_schema)
+        Collection.register(QuestionForest, Question)
+
+    def tearDown(self):
+        Collection._registry = {}
+
+    def get_plan(self, resource='tests_question'):
+        return search_plans.get(Schema.get_collection(resource))
+
+    def test_default_backend(self):
+        Collection._registry = {}
+        Schema.schema = copy.deepcopy(test_schema)
+        plan = self.get_plan()
+        self.assertIsInstance(plan.backend, IcontainsSearchBackend)
+        self.assertEqual(plan.bind(SearchTerm('color')), Q(question_text__icontains='color'))
+
+    def test_full_text(self):
+        plan = self.get_plan()
+        self.assertIsInstance(plan.backend, PostgresSearchBackend)
+        queryset = Question.objects.filter(plan.bind(SearchTerm('favorites'))).order_by('pk')
+        self.assertEqual([x.pk for x in queryset], [1, 3])
+
+    def test_full_text_number(self):
+        queryset = Question.objects.filter(self.get_plan().bind(SearchTerm('2')))
+        self.assertEqual([x.pk for x in queryset], [2])
+
+    def test_full_text_extended(self):
+        Collection.register(ChoiceForest, Choice)
+        q_objects = SearchMixin().get_search({'search': 'yes', 'searchExtended': 'true'}, Question)
+        self.assertEqual([x.pk for x in Question.objects.filter(q_objects)], [1])
+
+    def test_search_vector_field(self):
+        self.get_plan().backend = PostgresSearchBackend(search_vector_field='search_vector')
+        q_objects = self.get_plan().bind(SearchTerm('color'), 'question')
+        self.assertEqual(q_objects, Q(question__search_vector=SearchQuery('color', search_type='plain')))
+
+    def test_trigram(self):
+        self.get_plan().backend = PostgresSearchBackend(trigram=True)
+        q_objects = self.get_plan().bind(SearchTerm('color'))
+        self.assertEqual(q_objects, Q(question_text__trigram_similar='color'))
+
+    @mock.patch('django_forest.utils.search_backends.connections')
+    def test_fallback(self, mocked_connections):
+        mocked_connections.__getitem__.return_value.vendor = 'sqlite'
+        q_objects = self.get_plan().bind(SearchTerm('favorite'))
+        self.assertEqual(q_objects, Q(question_text__icontains='favorite'))
+
+    def test_uuid(self):
+        plan = search_plans.get(Schema.get_collection('tests_serial'))
+        plan.backend = PostgresSearchBackend()
+        uuid = '2dea6d7a-2a4a-4f42-9a4b-c2e7e41f2e6b'
+        self.assertEqual(plan.bind(SearchTerm(uuid)), Q(uuid=uuid))
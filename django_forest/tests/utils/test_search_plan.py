@@ -0,0 +1,81 @@
+import copy
+import sys
+
+import pytest
+from django.db.models import Q
+from django.test import TestCase
+
+from django_forest.resources.utils.queryset.search import SearchMixin
+from django_forest.tests.fixtures.schema import test_schema
+from django_forest.tests.models import Question
+from django_forest.utils.collection import Collection
+from django_forest.utils.schema import Schema
+from django_forest.utils.search_plan import SearchTerm, search_plans
+
+
+@pytest.fixture()
+def reset_config_dir_import():
+    for key in list(sys.modules.keys()):
+        if key.startswith('django_forest.tests.forest'):
+            del sys.modules[key]
+
+
+@pytest.mark.usefixtures('reset_config_dir_import')
+class UtilsSearchPlanTests(TestCase):
+    def setUp(self):
+        Schema.schema = copy.deepcopy(test_schema)
+        Schema.add_smart_features()
+
+    def tearDown(self):
+        Collection._registry = {}
+
+    def test_plan(self):
+        plan = search_plans.get(Schema.get_collection('tests_question'))
+        self.assertEqual(plan.lookups, (('id', 'Number', ()), ('question_text', 'String', ())))
+        self.assertEqual(len(plan.smart_searches), 2)
+        self.assertEqual(plan.related_paths, (('choice', 'tests_choice', 'id', 'question_id'),
+                                              ('topic', 'tests_topic', 'topic_id', 'id')))
+
+    def test_plan_cached(self):
+        collection = Schema.get_collection('tests_question')
+        self.assertIs(search_plans.get(collection), search_plans.get(collection))
+
+    def test_plan_enum(self):
+        plan = search_plans.get(Schema.get_collection('tests_student'))
+        self.assertEqual(plan.lookups, (('id', 'Number', ()), ('year_in_school', 'Enum', ('FR', 'SO', 'JR', 'SR', 'GR'))))
+
+    def test_plan_search_fields(self):
+        collection = Schema.get_collection('tests_choice')
+        collection['search_fields'] = ['choice_text']
+        plan = search_plans.get(collection)
+        self.assertEqual(plan.lookups, (('choice_text', 'String', ()),))
+
+    def test_bind(self):
+        plan = search_plans.get(Schema.get_collection('tests_choice'))
+        self.assertEqual(plan.bind(SearchTerm('yes')), Q(choice_text__icontains='yes'))
+        self.assertEqual(plan.bind(SearchTerm('1')), Q(id=1) | Q(choice_text__icontains='1') | Q(votes=1))
+
+    def test_bind_related(self):
+        plan = search_plans.get(Schema.get_collection('tests_choice'))
+        self.assertEqual(plan.bind(SearchTerm('yes'), 'choice'), Q(choice__choice_text__icontains='yes'))
+
+    def test_bind_smart_fields(self):
+        plan = search_plans.get(Schema.get_collection('tests_question'))
+        self.assertEqual(plan.bind(SearchTerm('yes')),
+                         Q(question_text__icontains='yes') | Q(question_text='yes') | Q(question_text='yes'))
+
+    def test_search_term(self):
+        self.assertEqual(SearchTerm('FR').condition('Enum', 'year', ('FR',)), Q(year='FR'))
+        self.assertEqual(SearchTerm('EN').condition('Enum', 'year', ('FR',)), Q())
+        self.assertEqual(SearchTerm('1.5').condition('Number', 'votes', ()), Q(votes=1.5))
+        self.assertEqual(SearchTerm('foo').condition('Number', 'votes', ()), Q())
+        self.assertEqual(SearchTerm(str(sys.maxsize + 1)).condition('Number', 'votes', ()),
+                         Q(votes__contains=sys.maxsize + 1))
+        uuid = '2dea6d7a-2a4a-4f42-9a4b-c2e7e41f2e6b'
+        self.assertEqual(SearchTerm(uuid).condition('String', 'uuid', ()), Q(uuid=uuid))
+
+    def test_get_search_extended(self):
+        q_objects = SearchMixin().get_search({'search': 'yes', 'searchExtended': '1'}, Question)
+        self.assertEqual(q_objects, Q(question_text__icontains='yes') | Q(question_text='yes') |
+                         Q(question_text='yes') | Q(choice__choice_text__icontains='yes') |
+                         Q(topic__name__icontains='yes'))
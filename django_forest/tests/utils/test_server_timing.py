@@ -0,0 +1,86 @@
+import copy
+from unittest import mock
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from django_forest.middleware import ForestMiddleware
+from django_forest.tests.fixtures.schema import test_schema
+from django_forest.tests.models import Question
+from django_forest.utils.schema import Schema
+from django_forest.utils.schema.json_api_schema import JsonApiSchema
+from django_forest.utils.scope import ScopeManager
+from django_forest.utils.server_timing import get_server_timing, record_server_timing, timed
+
+
+@timed('count')
+def count_questions():
+    return Question.objects.count()
+
+
+class ServerTimingTests(TestCase):
+    fixtures = ['question.json']
+
+    def test_disabled(self):
+        self.assertIsNone(get_server_timing())
+        self.assertEqual(count_questions(), 3)
+
+    def test_record(self):
+        with record_server_timing() as server_timing:
+            count_questions()
+            count_questions()
+        self.assertIsNone(get_server_timing())
+        self.assertEqual(list(server_timing.phases), ['db', 'count', 'total'])
+        self.assertEqual(server_timing.phases['count'][1], 2)
+        self.assertEqual(server_timing.phases['db'][1], 2)
+        self.assertRegex(
+            server_timing.get_header(),
+            r'^db;dur=\d+\.\d;desc="2 queries", count;dur=\d+\.\d;desc="2 queries", total;dur=\d+\.\d;desc="2 queries"$'
+        )
+
+    def test_record_error(self):
+        with self.assertRaises(ZeroDivisionError):
+            with record_server_timing():
+                timed('error')(lambda: 1 / 0)()
+        self.assertIsNone(get_server_timing())
+
+
+@mock.patch.object(ForestMiddleware, 'middlewares', ())
+@mock.patch('jose.jwt.decode', return_value={'id': 1, 'rendering_id': 1})
+@mock.patch('django_forest.utils.scope.ScopeManager._has_cache_expired', return_value=False)
+@override_settings(MIDDLEWARE=['django_forest.middleware.ForestMiddleware', *settings.MIDDLEWARE])
+class ServerTimingMiddlewareTests(TestCase):
+    fixtures = ['question.json']
+
+    def setUp(self):
+        Schema.schema = copy.deepcopy(test_schema)
+        Schema.handle_json_api_schema()
+        ScopeManager.cache = {'1': {'scopes': {}, 'fetched_at': 'useless_here'}}
+        self.client = self.client_class(HTTP_AUTHORIZATION='Bearer token')
+        self.url = reverse('django_forest:resources:list', kwargs={'resource': 'tests_question'})
+
+    def tearDown(self):
+        JsonApiSchema._registry = {}
+        ScopeManager.cache = {}
+
+    def get(self):
+        return self.client.get(self.url, {
+            'fields[tests_question]': 'id,question_text',
+            'timezone': 'Europe/Paris',
+            'page[number]': '1',
+            'page[size]': '15'
+        })
+
+    def test_disabled(self, *args):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Server-Timing', response)
+
+    @override_settings(FOREST={**settings.FOREST, 'SERVER_TIMING': True})
+    def test_enabled(self, *args):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        phases = [x.split(';')[0] for x in response['Server-Timing'].split(', ')]
+        self.assertEqual(sorted(phases), ['db', 'query', 'queryset', 'scope', 'serialize', 'smart_fields', 'total'])
+        self.assertNotIn('Timing-Allow-Origin', response)
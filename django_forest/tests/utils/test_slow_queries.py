@@ -0,0 +1,132 @@
+import copy
+import json
+from unittest import mock
+
+from django.conf import settings
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from django_forest.tests.fixtures.schema import test_schema
+from django_forest.tests.models import Topic
+from django_forest.utils.schema import Schema
+from django_forest.utils.schema.json_api_schema import JsonApiSchema
+from django_forest.utils.scope import ScopeManager
+from django_forest.utils.slow_queries import SlowQueryRecorder, get_query_shape
+
+SLOW_QUERIES = {**settings.FOREST, 'SLOW_QUERY_THRESHOLD_MS': 0}
+
+
+class SlowQueryShapeTests(TestCase):
+    def test_get_query_shape(self):
+        filters = {
+            'aggregator': 'and',
+            'conditions': [
+                {'field': 'question_text', 'operator': 'contains', 'value': 'secret'},
+                {'field': 'pub_date', 'operator': 'today', 'value': None},
+            ]
+        }
+        shape = get_query_shape({'filters': json.dumps(filters), 'search': 'secret', 'sort': '-id'})
+        self.assertEqual(shape, {
+            'filters': {
+                'aggregator': 'and',
+                'conditions': [
+                    {'field': 'question_text', 'operator': 'contains'},
+                    {'field': 'pub_date', 'operator': 'today'},
+                ]
+            },
+            'search': True,
+            'search_extended': False,
+            'segment': None,
+            'sort': '-id',
+        })
+        self.assertEqual(get_query_shape({'filters': 'invalid'})['filters'], None)
+
+
+@mock.patch('jose.jwt.decode', return_value={'id': 1, 'rendering_id': 1})
+@mock.patch('django_forest.utils.scope.ScopeManager._has_cache_expired', return_value=False)
+class SlowQueryViewTests(TestCase):
+    fixtures = ['question.json']
+
+    def setUp(self):
+        Schema.schema = copy.deepcopy(test_schema)
+        Schema.handle_json_api_schema()
+        ScopeManager.cache = {'1': {'scopes': {}, 'fetched_at': 'useless_here'}}
+        SlowQueryRecorder.reset()
+        self.client = self.client_class(HTTP_AUTHORIZATION='Bearer token')
+        self.url = reverse('django_forest:resources:count', kwargs={'resource': 'tests_question'})
+        self.params = {
+            'timezone': 'Europe/Paris',
+            'filters': json.dumps({'field': 'question_text', 'operator': 'contains', 'value': 'color'}),
+        }
+
+    def tearDown(self):
+        JsonApiSchema._registry = {}
+        ScopeManager.cache = {}
+        SlowQueryRecorder.reset()
+
+    @mock.patch('django_forest.utils.slow_queries.logger.warning')
+    def test_disabled(self, mocked_warning, *args):
+        response = self.client.get(self.url, self.params)
+        self.assertEqual(response.json(), {'count': 1})
+        mocked_warning.assert_not_called()
+
+    @override_settings(FOREST=SLOW_QUERIES)
+    def test_slow_query(self, *args):
+        with self.assertLogs('django_forest.utils.slow_queries', 'WARNING') as logs:
+            response = self.client.get(self.url, self.params)
+            # Notice: the same query shape is rate limited
+            self.client.get(self.url, self.params)
+        self.assertEqual(response.json(), {'count': 1})
+        self.assertEqual(len(logs.records), 1)
+
+        slow_query = logs.records[0].forest_slow_query
+        self.assertEqual(slow_query['collection'], 'tests_question')
+        self.assertIn('COUNT(*)', slow_query['sql'])
+        self.assertEqual(slow_query['params'], ['%color%'])
+        self.assertEqual(slow_query['shape']['filters'], {'field': 'question_text', 'operator': 'contains'})
+        self.assertIn('Scan', slow_query['plan'])
+        self.assertNotIn('actual time', slow_query['plan'])
+
+    @override_settings(FOREST={**SLOW_QUERIES, 'SLOW_QUERY_EXPLAIN_ANALYZE': True})
+    def test_slow_query_analyze(self, *args):
+        with self.assertLogs('django_forest.utils.slow_queries', 'WARNING') as logs:
+            self.client.get(self.url, self.params)
+        self.assertIn('actual time', logs.records[0].forest_slow_query['plan'])
+
+
+class SlowQueryRateLimitTests(TestCase):
+    def tearDown(self):
+        SlowQueryRecorder.reset()
+
+    @mock.patch('time.monotonic', return_value=1000)
+    def test_is_rate_limited(self, mocked_monotonic):
+        recorder = SlowQueryRecorder('tests_topic', {}, 0)
+        self.assertFalse(recorder.is_rate_limited('SELECT 1'))
+        self.assertTrue(recorder.is_rate_limited('SELECT 1'))
+        mocked_monotonic.return_value += recorder.interval
+        self.assertFalse(recorder.is_rate_limited('SELECT 2'))
+        # Notice: SELECT 1 is older than the interval, forgotten
+        self.assertEqual(list(SlowQueryRecorder.last_logged), [('tests_topic', 'SELECT 2')])
+
+    @mock.patch('django_forest.utils.slow_queries.MAX_LOGGED_QUERIES', 2)
+    def test_is_rate_limited_bounded(self):
+        recorder = SlowQueryRecorder('tests_topic', {}, 0)
+        for sql in ('SELECT 1', 'SELECT 2', 'SELECT 3'):
+            recorder.is_rate_limited(sql)
+        self.assertEqual([sql for _, sql in SlowQueryRecorder.last_logged], ['SELECT 2', 'SELECT 3'])
+
+
+class SlowQueryExplainTests(TestCase):
+    def setUp(self):
+        with connection.cursor() as cursor:
+            cursor.execute("CREATE FUNCTION forest_insert_topic() RETURNS integer AS "
+                           "$$ INSERT INTO tests_topic (name) VALUES ('explained') RETURNING id $$ LANGUAGE sql")
+
+    @override_settings(FOREST={**SLOW_QUERIES, 'SLOW_QUERY_EXPLAIN_ANALYZE': True})
+    def test_explain_analyze_rollback(self):
+        recorder = SlowQueryRecorder('tests_topic', {}, 0)
+        plan = recorder.explain(connection, 'SELECT forest_insert_topic()', ())
+        self.assertIn('actual time', plan)
+        # Notice: executed by ANALYZE, then rolled back
+        self.assertFalse(Topic.objects.filter(name='explained').exists())
@@ -0,0 +1,98 @@
+import copy
+
+import pytest
+from django.test import TestCase, modify_settings
+from django.urls import reverse
+
+from django_forest.tests.fixtures.schema import test_schema
+from django_forest.tests.models import Question
+from django_forest.utils.forest_api_requester import ForestApiRequester
+from django_forest.utils.permissions import Permission
+from django_forest.utils.pytest_plugin import forest_budget, forest_client  # noqa: F401
+from django_forest.utils.schema import Schema
+from django_forest.utils.schema.json_api_schema import JsonApiSchema
+from django_forest.utils.testing import ForestApiStub, ForestBudget, ForestClient, get_permissions, run_in_threads
+
+
+@modify_settings(MIDDLEWARE={'prepend': 'django_forest.middleware.ForestMiddleware'})
+class ForestBudgetTests(TestCase):
+    fixtures = ['question.json']
+
+    def setUp(self):
+        Schema.schema = copy.deepcopy(test_schema)
+        Schema.handle_json_api_schema()
+        self.url = reverse('django_forest:resources:list', kwargs={'resource': 'tests_question'})
+
+    def tearDown(self):
+        JsonApiSchema._registry = {}
+
+    def test_within_budget(self):
+        with ForestBudget(max_queries=1, max_api_calls=3) as budget:
+            response = ForestClient().get(self.url, {'timezone': 'Europe/Paris'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(budget.queries), 1)
+        self.assertEqual(budget.api_calls, [
+            ('GET', '/liana/v1/ip-whitelist-rules'),
+            ('GET', '/liana/v3/permissions'),
+            ('GET', '/liana/scopes'),
+        ])
+        self.assertGreater(budget.serialization_ms, 0)
+
+    def test_max_queries(self):
+        with self.assertRaisesRegex(AssertionError, r'2 queries executed, 1 expected at most:\n1\. SELECT'):
+            with ForestBudget(max_queries=1):
+                list(Question.objects.all())
+                list(Question.objects.all())
+
+    def test_max_api_calls(self):
+        with self.assertRaisesRegex(AssertionError, '3 Forest Admin API calls, 2 expected at most'):
+            with ForestBudget(max_api_calls=2):
+                ForestClient().get(self.url, {'timezone': 'Europe/Paris'})
+
+    def test_max_serialization_ms(self):
+        with self.assertRaisesRegex(AssertionError, r'serialization took [\d.]+ms, 0ms expected at most'):
+            with ForestBudget(max_serialization_ms=0):
+                ForestClient().get(self.url, {'timezone': 'Europe/Paris'})
+
+    def test_restore(self):
+        Permission.permissions_cached = {'data': {}}
+        try:
+            with ForestBudget():
+                self.assertEqual(Permission.permissions_cached, {})
+                self.assertIsInstance(ForestApiRequester.get.__self__, ForestApiStub)
+        finally:
+            self.assertEqual(Permission.permissions_cached, {'data': {}})
+            self.assertIs(ForestApiRequester.get.__self__, ForestApiRequester)
+            Permission.permissions_cached = {}
+
+    def test_forbidden(self):
+        permissions = get_permissions()
+        permissions['data']['collections']['tests_question']['collection']['browseEnabled'] = False
+        with ForestBudget(api=ForestApiStub(permissions=permissions)):
+            response = ForestClient().get(self.url, {'timezone': 'Europe/Paris'})
+        self.assertEqual(response.status_code, 403)
+
+
+class RunInThreadsTests(TestCase):
+    def test_results(self):
+        self.assertEqual(run_in_threads(lambda: 1, count=4), [1, 1, 1, 1])
+
+    def test_exception(self):
+        def fail():
+            raise ValueError('foo')
+
+        with self.assertRaisesRegex(ValueError, 'foo'):
+            run_in_threads(fail, count=2)
+
+
+@pytest.mark.usefixtures('django_db_setup')
+@modify_settings(MIDDLEWARE={'prepend': 'django_forest.middleware.ForestMiddleware'})
+def test_fixtures(forest_client, forest_budget):
+    Schema.schema = copy.deepcopy(test_schema)
+    Schema.handle_json_api_schema()
+    try:
+        with forest_budget(max_queries=1, max_api_calls=3):
+            response = forest_client.get(reverse('django_forest:resources:count', kwargs={'resource': 'tests_question'}))
+        assert response.json() == {'count': 0}
+    finally:
+        JsonApiSchema._registry = {}
@@ -0,0 +1,124 @@
+import copy
+import json
+from unittest import mock
+
+from django.conf import settings
+from django.test import TestCase, modify_settings, override_settings
+from django.urls import reverse
+
+from django_forest.tests.fixtures.schema import test_schema
+from django_forest.utils.forest_api_requester import ForestApiRequester
+from django_forest.utils.schema import Schema
+from django_forest.utils.schema.json_api_schema import JsonApiSchema
+from django_forest.utils.testing import ForestClient, forest_budget
+from django_forest.utils.tracing import MemoryTracer, Tracer, get_tracer, set_span_attributes, trace
+
+tracer = MemoryTracer()
+
+
+class FailingTracer(Tracer):
+    def start_span(self, span):
+        raise Exception('collector is down')
+
+
+class TracingTests(TestCase):
+    def tearDown(self):
+        tracer.clear()
+
+    def test_no_tracer(self):
+        self.assertIsNone(get_tracer())
+        with trace('phase') as span:
+            set_span_attributes(rows=1)
+        self.assertIsNone(span)
+
+    def test_get_tracer_cached(self):
+        get_tracer()
+        with mock.patch('django_forest.utils.tracing.get_forest_setting') as mocked_get_forest_setting:
+            self.assertIsNone(get_tracer())
+        mocked_get_forest_setting.assert_not_called()
+        # Notice: loaded again when the settings change
+        with override_settings(FOREST={**settings.FOREST, 'TRACER': tracer}):
+            self.assertIs(get_tracer(), tracer)
+        self.assertIsNone(get_tracer())
+
+    @override_settings(FOREST={**settings.FOREST, 'TRACER': 'django_forest.tests.utils.test_tracing.MemoryTracer'})
+    def test_dotted_path(self):
+        self.assertIsInstance(get_tracer(), MemoryTracer)
+        self.assertIs(get_tracer(), get_tracer())
+
+    @override_settings(FOREST={**settings.FOREST, 'TRACER': tracer})
+    def test_nested(self):
+        with trace('parent', collection='tests_question') as parent:
+            with trace('child'):
+                set_span_attributes(rows=3)
+            set_span_attributes(cache_hit=True)
+
+        child, parent = tracer.spans
+        self.assertEqual((child.name, child.attributes), ('child', {'rows': 3}))
+        self.assertIs(child.parent, parent)
+        self.assertEqual(parent.attributes, {'collection': 'tests_question', 'cache_hit': True})
+        self.assertIsNone(parent.parent)
+        self.assertGreaterEqual(parent.duration, child.duration)
+
+    @override_settings(FOREST={**settings.FOREST, 'TRACER': tracer})
+    def test_error(self):
+        with self.assertRaises(ValueError):
+            with trace('phase'):
+                raise ValueError('invalid')
+        self.assertIsInstance(tracer.spans[0].error, ValueError)
+
+    @override_settings(FOREST={**settings.FOREST, 'TRACER': FailingTracer})
+    def test_failing_tracer(self):
+        with self.assertLogs('django_forest.utils.tracing', 'WARNING'):
+            with trace('phase') as span:
+                pass
+        self.assertIsNotNone(span.end_time)
+
+    @override_settings(FOREST={**settings.FOREST, 'TRACER': tracer})
+    @mock.patch('requests.get', return_value=mock.Mock(status_code=200))
+    def test_forest_api(self, mocked_get):
+        ForestApiRequester.get('https://api.test.forestadmin.com/liana/scopes')
+        span, = tracer.spans
+        self.assertEqual(span.name, 'forest_api')
+        self.assertEqual(span.attributes, {'method': 'GET', 'route': '/liana/scopes', 'status': 200})
+
+
+@override_settings(FOREST={**settings.FOREST, 'TRACER': tracer})
+@modify_settings(MIDDLEWARE={'prepend': 'django_forest.middleware.ForestMiddleware'})
+class TracingViewsTests(TestCase):
+    fixtures = ['question.json']
+
+    def setUp(self):
+        Schema.schema = copy.deepcopy(test_schema)
+        Schema.handle_json_api_schema()
+        self.url = reverse('django_forest:resources:list', kwargs={'resource': 'tests_question'})
+
+    def tearDown(self):
+        JsonApiSchema._registry = {}
+        tracer.clear()
+
+    def test_list(self):
+        params = {
+            'timezone': 'Europe/Paris',
+            'filters': json.dumps({'field': 'question_text', 'operator': 'contains', 'value': 'color'}),
+            'search': 'color',
+        }
+        with forest_budget():
+            ForestClient().get(self.url, params)
+            ForestClient().get(self.url, params)
+
+        spans = {x.name: x.attributes for x in tracer.spans}
+        self.assertEqual(spans['permission'], {'collection': 'tests_question', 'permission': 'browseEnabled',
+                                               'cache_hit': True})
+        self.assertEqual(spans['scope'], {'collection': 'tests_question', 'cache_hit': True})
+        self.assertEqual(spans['filters'], {'collection': 'tests_question', 'cache_hit': True})
+        self.assertEqual(spans['search'], {'collection': 'tests_question'})
+        self.assertEqual(spans['queryset'], {'collection': 'tests_question'})
+        self.assertEqual(spans['query'], {'collection': 'tests_question', 'rows': 1})
+        self.assertEqual(spans['smart_fields'], {'collection': 'tests_question', 'smart_fields': 0})
+        self.assertEqual(spans['serialize'], {'collection': 'tests_question', 'rows': 1})
+
+        first_permission = tracer.get_spans('permission')[0]
+        self.assertFalse(first_permission.attributes['cache_hit'])
+        filters = tracer.get_spans('filters')[0]
+        self.assertEqual(filters.parent.name, 'queryset')
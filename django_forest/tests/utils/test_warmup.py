@@ -0,0 +1,88 @@
+import threading
+from datetime import datetime
+from unittest import mock
+
+import pytz
+from django.conf import settings
+from django.test import TestCase, override_settings
+
+from django_forest.utils.forest_api_requester import ForestApiRequester
+from django_forest.utils.ip_whitelist import IpWhitelist
+from django_forest.utils.permissions import Permission
+from django_forest.utils.scope import ScopeManager
+from django_forest.utils.warmup import Warmup
+
+WARMUP_SETTINGS = {**settings.FOREST, 'WARMUP': True, 'WARMUP_RENDERING_IDS': [1, 2]}
+
+
+def get_from_rendering_id(route, rendering_id):
+    return {'route': route, 'rendering_id': rendering_id}
+
+
+@mock.patch.object(IpWhitelist, 'get_rules')
+@mock.patch.object(ForestApiRequester, 'get_from_rendering_id', side_effect=get_from_rendering_id)
+class UtilsWarmupTests(TestCase):
+
+    def tearDown(self):
+        Permission.reset()
+        ScopeManager.reset()
+        IpWhitelist.reset()
+        Warmup.reset()
+
+    def test_start_disabled(self, mocked_get_from_rendering_id, mocked_get_rules):
+        self.assertIsNone(Warmup.start())
+        self.assertTrue(Warmup.is_ready())
+        mocked_get_rules.assert_not_called()
+
+    @override_settings(FOREST=WARMUP_SETTINGS)
+    def test_start(self, mocked_get_from_rendering_id, mocked_get_rules):
+        self.assertFalse(Warmup.is_ready())
+        thread = Warmup.start()
+        self.assertEqual(thread.name, 'forest-warmup')
+        self.assertIs(Warmup.start(), thread)
+        thread.join()
+
+        self.assertTrue(Warmup.is_ready())
+        mocked_get_rules.assert_called_once_with()
+        self.assertEqual(Permission.permissions_cached['1']['route'], '/liana/v3/permissions')
+        self.assertEqual(ScopeManager.cache['2']['scopes']['route'], '/liana/scopes')
+        self.assertEqual(mocked_get_from_rendering_id.call_count, 4)
+
+    @override_settings(FOREST={**WARMUP_SETTINGS, 'WARMUP_RENDERING_IDS': '1, 2,'})
+    def test_get_rendering_ids(self, mocked_get_from_rendering_id, mocked_get_rules):
+        Permission.permissions_cached = {'3': {}}
+        ScopeManager.cache = {'2': {}, '4': {}}
+        Warmup.reset()
+        self.assertEqual(Warmup.get_rendering_ids(), ['1', '2', '3', '4'])
+
+    @override_settings(FOREST=WARMUP_SETTINGS)
+    def test_start_cached(self, mocked_get_from_rendering_id, mocked_get_rules):
+        IpWhitelist.fetched = True
+        Permission.permissions_cached = {'1': {'last_fetch': datetime.now(pytz.UTC)},
+                                         '2': {'last_fetch': datetime.now(pytz.UTC)}}
+        Warmup.start().join()
+        mocked_get_rules.assert_not_called()
+        # Notice: the scopes only
+        self.assertEqual(mocked_get_from_rendering_id.call_count, 2)
+
+    @override_settings(FOREST=WARMUP_SETTINGS)
+    def test_start_error(self, mocked_get_from_rendering_id, mocked_get_rules):
+        mocked_get_rules.side_effect = Exception('server error')
+        with self.assertLogs('django_forest.utils.warmup', level='WARNING') as logs:
+            Warmup.start().join()
+        self.assertTrue(Warmup.is_ready())
+        self.assertIn('Unable to warm up the ip whitelist rules (server error)', logs.output[0])
+        self.assertEqual(len(Permission.permissions_cached), 2)
+
+    @override_settings(FOREST={**WARMUP_SETTINGS, 'WARMUP_TIMEOUT': 0.05})
+    def test_start_timeout(self, mocked_get_from_rendering_id, mocked_get_rules):
+        release = threading.Event()
+        mocked_get_rules.side_effect = release.wait
+        try:
+            with self.assertLogs('django_forest.utils.warmup', level='WARNING'):
+                Warmup.start().join()
+            # Notice: ready, the rules are left to the first request
+            self.assertTrue(Warmup.is_ready())
+            self.assertFalse(IpWhitelist.fetched)
+        finally:
+            release.set()
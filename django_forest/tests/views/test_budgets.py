@@ -0,0 +1,89 @@
+import copy
+import json
+import os
+from unittest import skipUnless
+
+from django.test import TestCase, modify_settings
+from django.urls import reverse
+
+from django_forest.tests.fixtures.schema import test_schema
+from django_forest.utils.schema import Schema
+from django_forest.utils.schema.json_api_schema import JsonApiSchema
+from django_forest.utils.testing import ForestApiStub, ForestClient, forest_budget, get_permissions
+
+STATS = {
+    'values': [{'type': 'Value', 'aggregator': 'Count', 'aggregateFieldName': None, 'filter': None,
+                'sourceCollectionId': 'tests_question'}],
+}
+
+
+@modify_settings(MIDDLEWARE={'prepend': 'django_forest.middleware.ForestMiddleware'})
+class ViewsBudgetTests(TestCase):
+    """Baseline budgets of the Forest Admin views, with the Forest Admin checks (permissions, scopes, IP whitelist)."""
+    fixtures = ['question.json', 'choice.json', 'place.json', 'restaurant.json', 'waiter.json']
+
+    def setUp(self):
+        Schema.schema = copy.deepcopy(test_schema)
+        Schema.handle_json_api_schema()
+        self.client = ForestClient()
+        self.params = {'timezone': 'Europe/Paris', 'page[number]': 1, 'page[size]': 15}
+
+    def tearDown(self):
+        JsonApiSchema._registry = {}
+
+    def url(self, name, **kwargs):
+        return reverse(f'django_forest:resources:{name}', kwargs={'resource': 'tests_question', **kwargs})
+
+    def test_list(self):
+        with forest_budget(max_queries=1, max_api_calls=3):
+            response = self.client.get(self.url('list'), self.params)
+        self.assertEqual(response.status_code, 200)
+
+    # Notice: wall-clock, depends on the machine, FOREST_TIMING_BUDGETS=1 on a reference machine only
+    @skipUnless(os.environ.get('FOREST_TIMING_BUDGETS'), 'wall-clock budget, set FOREST_TIMING_BUDGETS=1 to run it')
+    def test_list_serialization_time(self):
+        with forest_budget(max_serialization_ms=100):
+            response = self.client.get(self.url('list'), self.params)
+        self.assertEqual(response.status_code, 200)
+
+    def test_list_cached(self):
+        with forest_budget(max_queries=2, max_api_calls=3):
+            self.client.get(self.url('list'), self.params)
+            # Notice: permissions, scopes and IP whitelist rules are cached
+            self.client.get(self.url('list'), self.params)
+
+    def test_list_relationships(self):
+        # Notice: belongsTo records are fetched one by one (1 + 3 choices)
+        with forest_budget(max_queries=4, max_api_calls=3):
+            response = self.client.get(reverse('django_forest:resources:list', kwargs={'resource': 'tests_choice'}), {
+                **self.params,
+                'fields[tests_choice]': 'id,choice_text,question',
+                'fields[question]': 'question_text',
+            })
+        self.assertEqual(response.status_code, 200)
+
+    def test_detail(self):
+        with forest_budget(max_queries=1, max_api_calls=3):
+            response = self.client.get(self.url('detail', pk=1), {'timezone': 'Europe/Paris'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_count(self):
+        with forest_budget(max_queries=1, max_api_calls=3):
+            response = self.client.get(self.url('count'), {'timezone': 'Europe/Paris'})
+        self.assertEqual(response.json(), {'count': 3})
+
+    def test_csv(self):
+        params = {'timezone': 'Europe/Paris', 'fields[tests_question]': 'id,question_text', 'header': 'id,question text',
+                  'filename': 'questions'}
+        with forest_budget(max_queries=1, max_api_calls=3):
+            response = self.client.get(self.url('csv'), params)
+        self.assertEqual(response.status_code, 200)
+
+    def test_stats(self):
+        body = {'aggregate': 'Count', 'collection': 'tests_question', 'type': 'Value', 'timezone': 'Europe/Paris'}
+        api = ForestApiStub(permissions=get_permissions(stats=STATS))
+        with forest_budget(max_queries=1, max_api_calls=3, api=api):
+            response = self.client.post(
+                reverse('django_forest:stats:statsWithParameters', kwargs={'resource': 'tests_question'}),
+                json.dumps(body), content_type='application/json')
+        self.assertEqual(response.json()['data']['attributes'], {'value': {'countCurrent': 3}})
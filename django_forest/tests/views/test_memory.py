@@ -0,0 +1,96 @@
+import copy
+import sys
+import warnings
+from datetime import datetime
+from unittest import mock
+
+import pytz
+from django.test import TestCase, modify_settings
+from django.urls import reverse
+
+from django_forest.tests.fixtures.schema import test_schema
+from django_forest.tests.models import Choice, Question, Topic
+from django_forest.utils.forest_api_requester import ForestApiRequester
+from django_forest.utils.schema import Schema
+from django_forest.utils.schema.json_api_schema import JsonApiSchema
+from django_forest.utils.testing import ForestApiStub, ForestClient, forest_memory
+
+ROWS = 1000
+# Notice: the bounds are measured on this Python version, the object sizes change across versions
+REFERENCE_VERSION = (3, 10)
+
+
+@modify_settings(MIDDLEWARE={'prepend': 'django_forest.middleware.ForestMiddleware'})
+class ViewsMemoryTests(TestCase):
+    """
+    Baseline peak and retained memory per row of the export and list views, on 1000 records.
+
+    The bounds are about 1.5 times the baseline measured on Python 3.10, the latest of the tox matrix: an
+    improvement of the streaming or projection shows up in the reported numbers, a regression fails. On other
+    Python versions, the requests are measured but the bounds are not asserted.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        topic = Topic.objects.create(name='colors')
+        pub_date = datetime(2021, 7, 8, tzinfo=pytz.UTC)
+        Question.objects.bulk_create([
+            Question(question_text=f'what is your favorite color {i}?', pub_date=pub_date, topic=topic)
+            for i in range(ROWS)
+        ])
+        cls.question = Question.objects.order_by('pk').first()
+        Choice.objects.bulk_create([Choice(question=cls.question, choice_text=f'color {i}', votes=i)
+                                    for i in range(ROWS)])
+
+    def setUp(self):
+        Schema.schema = copy.deepcopy(test_schema)
+        Schema.handle_json_api_schema()
+        self.client = ForestClient()
+
+    def tearDown(self):
+        JsonApiSchema._registry = {}
+
+    def assertMemory(self, url, params, max_peak, max_retained):
+        if sys.version_info[:2] != REFERENCE_VERSION:
+            max_peak = max_retained = None
+        # Notice: not in a forest_budget, which keeps the queries, nor with pytest recording the warnings
+        with mock.patch.object(ForestApiRequester, 'get', ForestApiStub().get), warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            # Notice: the first request fills the caches (permissions, scopes, search plans)
+            self.assertEqual(self.client.get(url, params).status_code, 200)
+            with forest_memory(max_peak=max_peak, max_retained=max_retained, rows=ROWS) as memory:
+                self.client.get(url, params)
+        return memory
+
+    def url(self, name, **kwargs):
+        return reverse(f'django_forest:resources:{name}', kwargs={'resource': 'tests_question', **kwargs})
+
+    def association_url(self, name):
+        return reverse(f'django_forest:resources:associations:{name}', kwargs={
+            'resource': 'tests_question', 'pk': self.question.pk, 'association_resource': 'choice_set'})
+
+    def test_csv(self):
+        # Notice: with the belongsTo topic, fetched record by record
+        self.assertMemory(self.url('csv'), {
+            'timezone': 'Europe/Paris', 'filename': 'questions', 'page[number]': 1, 'page[size]': ROWS,
+            'fields[tests_question]': 'id,question_text,pub_date,topic', 'fields[topic]': 'name',
+            'header': 'id,question text,pub date,topic',
+        }, max_peak=5700, max_retained=300)
+
+    def test_association_csv(self):
+        # Notice: the deferred question_id is loaded record by record (refresh_from_db)
+        self.assertMemory(self.association_url('csv'), {
+            'timezone': 'Europe/Paris', 'filename': 'choices', 'page[number]': 1, 'page[size]': ROWS,
+            'fields[tests_choice]': 'id,choice_text,votes', 'header': 'id,choice text,votes',
+        }, max_peak=3100, max_retained=300)
+
+    def test_list(self):
+        self.assertMemory(self.url('list'), {
+            'timezone': 'Europe/Paris', 'page[number]': 1, 'page[size]': ROWS,
+            'fields[tests_question]': 'id,question_text,pub_date,topic', 'fields[topic]': 'name',
+        }, max_peak=8600, max_retained=300)
+
+    def test_association_list(self):
+        self.assertMemory(self.association_url('list'), {
+            'timezone': 'Europe/Paris', 'page[number]': 1, 'page[size]': ROWS,
+        }, max_peak=7800, max_retained=300)
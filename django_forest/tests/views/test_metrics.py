@@ -0,0 +1,37 @@
+from unittest import mock
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from django_forest.utils.metrics import metrics
+
+
+class MetricsViewTests(TestCase):
+    def setUp(self):
+        self.url = reverse('django_forest:metrics')
+
+    def tearDown(self):
+        metrics.reset()
+
+    @mock.patch('jose.jwt.decode', return_value={'id': 1, 'rendering_id': 1})
+    def test_get(self, mocked_decode):
+        response = self.client.get(self.url, HTTP_AUTHORIZATION='Bearer token')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/plain; version=0.0.4; charset=utf-8')
+        self.assertIn('# TYPE forest_permission_cache_total counter', response.content.decode('utf-8'))
+
+        response = self.client.get(self.url, HTTP_AUTHORIZATION='Bearer token')
+        self.assertIn('forest_request_duration_seconds_count{view="django_forest:metrics",method="GET",status="200"} 1',
+                      response.content.decode('utf-8'))
+
+    @override_settings(FOREST={**settings.FOREST, 'FOREST_ENV_SECRET': 'secret'})
+    def test_get_scraper(self):
+        response = self.client.get(self.url, HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+
+    def test_get_unauthenticated(self):
+        response = self.client.get(self.url, HTTP_AUTHORIZATION='Bearer wrong')
+        self.assertEqual(response.status_code, 403)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 403)
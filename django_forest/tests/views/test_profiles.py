@@ -0,0 +1,51 @@
+import cProfile
+import tempfile
+from unittest import mock
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from django_forest.utils.profiler import profiler
+
+
+@mock.patch('jose.jwt.decode', return_value={'id': 1, 'email': 'admin@forest.com', 'rendering_id': 1})
+class ProfilesViewTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.override = override_settings(FOREST={
+            **settings.FOREST,
+            'PROFILER_DIR': self.directory.name,
+            'PROFILER_USERS': ['admin@forest.com'],
+        })
+        self.override.enable()
+        self.profile_id = profiler.save(cProfile.Profile())
+
+    def tearDown(self):
+        self.override.disable()
+        self.directory.cleanup()
+
+    def test_list(self, mocked_decode):
+        response = self.client.get(reverse('django_forest:profiles'), HTTP_AUTHORIZATION='Bearer token')
+        self.assertEqual(response.json(), {'profiles': [self.profile_id]})
+
+    def test_download(self, mocked_decode):
+        url = reverse('django_forest:profile', kwargs={'profile_id': self.profile_id})
+        response = self.client.get(url, HTTP_AUTHORIZATION='Bearer token')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Disposition'], f'attachment; filename="{self.profile_id}.prof"')
+        with open(profiler.get_path(self.profile_id), 'rb') as f:
+            self.assertEqual(b''.join(response.streaming_content), f.read())
+
+    def test_download_not_found(self, mocked_decode):
+        url = reverse('django_forest:profile', kwargs={'profile_id': '0' * 32})
+        response = self.client.get(url, HTTP_AUTHORIZATION='Bearer token')
+        self.assertEqual(response.status_code, 404)
+
+    def test_not_authorized(self, mocked_decode):
+        mocked_decode.return_value = {'id': 2, 'email': 'user@forest.com', 'rendering_id': 1}
+        response = self.client.get(reverse('django_forest:profiles'), HTTP_AUTHORIZATION='Bearer token')
+        self.assertEqual(response.status_code, 403)
+        url = reverse('django_forest:profile', kwargs={'profile_id': self.profile_id})
+        response = self.client.get(url, HTTP_AUTHORIZATION='Bearer token')
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,44 @@
+from unittest import mock
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from django_forest.utils.forest_api_requester import ForestApiRequester
+from django_forest.utils.ip_whitelist import IpWhitelist
+from django_forest.utils.warmup import Warmup
+
+
+class ReadinessViewTests(TestCase):
+    def setUp(self):
+        self.url = reverse('django_forest:readiness')
+        IpWhitelist.reset()
+
+    def tearDown(self):
+        Warmup.reset()
+        IpWhitelist.reset()
+
+    def test_get_disabled(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 204)
+
+    @override_settings(FOREST={**settings.FOREST, 'WARMUP': True})
+    @mock.patch.object(Warmup, 'start')
+    def test_get(self, mocked_start):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 503)
+        Warmup.ready.set()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 204)
+
+    @override_settings(FOREST={**settings.FOREST, 'WARMUP': True})
+    @mock.patch.object(IpWhitelist, 'get_rules')
+    @mock.patch.object(ForestApiRequester, 'get_from_rendering_id')
+    def test_get_not_forked(self, mocked_get_from_rendering_id, mocked_get_rules):
+        # Notice: no after fork hook ran, the first health check starts the warm up
+        self.assertIsNone(Warmup.thread)
+        self.client.get(self.url)
+        Warmup.thread.join()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 204)
+        mocked_get_rules.assert_called_once_with()
@@ -12,6 +12,10 @@ urlpatterns = [
     path('', views.IndexView.as_view(), name='index'),
     path('/scope-cache-invalidation', csrf_exempt(views.ScopeCacheInvalidationView.as_view()),
          name='scope-cache-invalidation'),
+    path('/_metrics', views.MetricsView.as_view(), name='metrics'),
+    path('/_profiles', views.ProfilesView.as_view(), name='profiles'),
+    path('/_profiles/<str:profile_id>', views.ProfileView.as_view(), name='profile'),
+    path('/_ready', views.ReadinessView.as_view(), name='readiness'),
     path('/authentication', include(authentication_urls)),
     path('/stats', include(stats_urls)),
     path('/actions', include(actions_urls)),
@@ -1,21 +1,13 @@
 import re
 
-from jose import jwt
-
 from django_forest.utils.forest_setting import get_forest_setting
-
-
-def get_accessor_name(field):
-    name = None
-    try:
-        # model_set
-        name = field.get_accessor_name()
-    except AttributeError:
-        name = field.name
-    return name
+from django_forest.utils.models import Models, get_accessor_name  # noqa: F401
 
 
 def get_token(request):
+    # Notice: imported on first use, django_forest.utils is imported with the app config of every process
+    from jose import jwt
+
     token = ''
     if 'Authorization' in request.headers:
         token = request.headers['Authorization'].split()[1]
@@ -30,8 +22,7 @@ def get_token(request):
 
 
 def get_association_field(Model, association_resource):
-    association_field = next((x for x in Model._meta.get_fields()
-                              if x.is_relation and get_accessor_name(x) == association_resource), None)
+    association_field = Models.get_metadata(Model).get_association_field(association_resource)
     if association_field is None:
         message = f'cannot find association resource {association_resource} for Model {Model._meta.db_table}'
         raise Exception(message)
@@ -1,5 +1,6 @@
 import copy
 
+from django_forest.utils.collection_cache import CollectionCache
 from django_forest.utils.schema.definitions import COLLECTION, ACTION, ACTION_FIELD, FIELD
 from django_forest.utils.schema import Schema
 
@@ -12,6 +13,7 @@ class Collection:
     only_for_relationships = None
     pagination_type = None
     search_fields = None
+    search_backend = None  # see django_forest.utils.search_backends
     actions = []
     fields = []
     segments = []
@@ -113,5 +115,6 @@ class Collection:
             self.handle_smart_fields(collection)
             self.handle_smart_actions(collection)
             self.handle_smart_segments(collection)
+            CollectionCache.invalidate_all(collection['name'])
 
         super().__init__()
@@ -0,0 +1,44 @@
+class CollectionCache:
+    """
+    Memoize a value computed from a schema collection.
+
+    An entry is reused as long as the collection object is the same, so replacing
+    the schema (or rebuilding it) transparently recomputes it.
+    Collections customized in place (smart fields, actions...) must be invalidated explicitly.
+    """
+    _caches = []
+    # Notice: called with the invalidated collection name (None for all), for the state derived elsewhere
+    _listeners = []
+
+    def __init__(self, build):
+        self.build = build
+        self.entries = {}
+        self._caches.append(self)
+
+    def get(self, collection):
+        entry = self.entries.get(collection['name'])
+        if entry is None or entry[0] is not collection:
+            entry = (collection, self.build(collection))
+            self.entries[collection['name']] = entry
+        return entry[1]
+
+    def warm(self, collections):
+        for collection in collections:
+            self.get(collection)
+
+    def invalidate(self, name=None):
+        if name is None:
+            self.entries = {}
+        else:
+            self.entries.pop(name, None)
+
+    @classmethod
+    def connect(cls, listener):
+        cls._listeners.append(listener)
+
+    @classmethod
+    def invalidate_all(cls, name=None):
+        for cache in cls._caches:
+            cache.invalidate(name)
+        for listener in cls._listeners:
+            listener(name)
@@ -1,5 +1,5 @@
 import json
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse
 
 import requests
 from django.conf import settings
@@ -7,6 +7,8 @@ from django.core.exceptions import ValidationError
 from django.core.validators import URLValidator
 
 from django_forest.utils.forest_setting import get_forest_setting
+from django_forest.utils.metrics import forest_api_request_duration
+from django_forest.utils.tracing import set_span_attributes, trace
 
 
 class ForestApiRequester:
@@ -84,7 +86,12 @@ class ForestApiRequester:
         if settings.DEBUG:
             kwargs['verify'] = False
 
-        return requests.get(url, **kwargs)
+        route = urlparse(url).path
+        with forest_api_request_duration.time(method='GET', route=route), \
+                trace('forest_api', method='GET', route=route):
+            response = requests.get(url, **kwargs)
+            set_span_attributes(status=response.status_code)
+            return response
 
     @classmethod
     def post(cls, url, body=None, query=None, headers=None):
@@ -97,4 +104,10 @@ class ForestApiRequester:
         }
         if settings.DEBUG:
             kwargs['verify'] = False
-        return requests.post(url, **kwargs)
+
+        route = urlparse(url).path
+        with forest_api_request_duration.time(method='POST', route=route), \
+                trace('forest_api', method='POST', route=route):
+            response = requests.post(url, **kwargs)
+            set_span_attributes(status=response.status_code)
+            return response
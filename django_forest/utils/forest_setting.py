@@ -1,8 +1,20 @@
 import os
-from distutils.util import strtobool
 
 from django.conf import settings
 
+TRUE_VALUES = ('y', 'yes', 't', 'true', 'on', '1')
+FALSE_VALUES = ('n', 'no', 'f', 'false', 'off', '0')
+
+
+def strtobool(value):
+    # Notice: distutils.util.strtobool, distutils is slow to import (through setuptools) and removed in python 3.12
+    value = value.lower()
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    raise ValueError(f'invalid truth value {value!r}')
+
 
 def get_forest_setting(setting, default=None):
     django_settings = getattr(settings, 'FOREST', {}).get(setting, default)
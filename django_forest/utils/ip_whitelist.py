@@ -1,4 +1,5 @@
 import ipaddress
+import threading
 
 import requests
 
@@ -10,6 +11,18 @@ class IpWhitelist:
     fetched = False
     use_ip_whitelist = False
     rules = []
+    # Notice: incremented on each fetch, for concurrent requests to share one fetch
+    generation = 0
+    _fetch_lock = threading.Lock()
+    _state_lock = threading.Lock()
+
+    @classmethod
+    def reset(cls):
+        cls.fetched = False
+        cls.use_ip_whitelist = False
+        cls.rules = []
+        cls._fetch_lock = threading.Lock()
+        cls._state_lock = threading.Lock()
 
     @classmethod
     def get_rules(cls):
@@ -18,10 +31,32 @@ class IpWhitelist:
         if response.status_code != requests.codes.ok:
             raise Exception('Unable to retrieve ip whitelist rules')
 
-        data = response.json()
-        cls.fetched = True
-        cls.use_ip_whitelist = data['data']['attributes']['use_ip_whitelist']
-        cls.rules = data['data']['attributes']['rules']
+        attributes = response.json()['data']['attributes']
+        use_ip_whitelist, rules = attributes['use_ip_whitelist'], attributes['rules']
+        # Notice: never seen half updated, e.g. the whitelist enabled with the previous rules
+        with cls._state_lock:
+            cls.use_ip_whitelist = use_ip_whitelist
+            cls.rules = rules
+            cls.fetched = True
+            cls.generation += 1
+
+    @classmethod
+    def refresh_rules(cls, generation):
+        with cls._fetch_lock:
+            # Notice: already fetched by a concurrent request while waiting for the lock
+            if cls.generation == generation:
+                cls.get_rules()
+
+    @classmethod
+    def warm(cls):
+        generation = cls.generation
+        if not cls.fetched:
+            cls.refresh_rules(generation)
+
+    @classmethod
+    def get_state(cls):
+        with cls._state_lock:
+            return cls.use_ip_whitelist, cls.rules
 
     @staticmethod
     def same_version(ip1, ip2):
@@ -64,8 +99,8 @@ class IpWhitelist:
             return cls.is_ip_match_subnet(ipaddress.ip_address(ip), rule['range'])
 
     @classmethod
-    def is_ip_matches_any_rule(cls, ip):
-        for rule in cls.rules:
+    def is_ip_matches_any_rule(cls, ip, rules=None):
+        for rule in cls.rules if rules is None else rules:
             if cls.is_ip_matches_rule(ip, rule):
                 return True
         else:
@@ -0,0 +1,67 @@
+import gc
+import os
+import threading
+
+from django_forest.authentication.oidc.client_manager import OidcClientManager
+from django_forest.resources.utils.queryset.filters import compiler
+from django_forest.utils.ip_whitelist import IpWhitelist
+from django_forest.utils.permissions import Permission
+from django_forest.utils.profiler import Profiler
+from django_forest.utils.schema import Schema
+from django_forest.utils.schema.json_api_schema import JsonApiSchema
+from django_forest.utils.scope import ScopeManager
+from django_forest.utils.slow_queries import SlowQueryRecorder
+from django_forest.utils.warmup import Warmup
+
+_after_fork_registered = False
+
+
+def prebuild():
+    """Build what is otherwise built on first use, for the workers forked afterwards to share it."""
+    for collection in Schema.schema['collections']:
+        JsonApiSchema.get(collection['name'])
+
+
+def freeze():
+    # Notice: the objects built so far are left out of the garbage collections, which would otherwise
+    # write their headers and copy the pages shared with the workers
+    if hasattr(gc, 'freeze'):
+        gc.collect()
+        gc.freeze()
+
+
+def after_fork():
+    """
+    Reset the state a forked worker must not share with its parent.
+
+    The Forest Admin API caches and the OIDC client (its HTTP session) are fetched again, and the locks
+    are replaced: a lock held by another thread of the parent at fork time would never be released.
+    The schema, the serializers and the compiled plans are kept, shared copy-on-write.
+    The caches are warmed up again in the background when FOREST['WARMUP'] is set, see Warmup.
+    Run in the children of os.fork once register_after_fork is called (by preload_forest), otherwise call it
+    from the post fork hook of the server (gunicorn post_fork, uwsgi @postfork).
+    """
+    # Notice: first, it keeps the renderings cached by the parent for the warm up
+    Warmup.reset()
+    Permission.reset()
+    ScopeManager.reset()
+    IpWhitelist.reset()
+    OidcClientManager.reset()
+    SlowQueryRecorder.reset()
+    JsonApiSchema._lock = threading.Lock()
+    Profiler.lock = threading.Lock()
+    compiler.reset_locks()
+    Warmup.start()
+
+
+def register_after_fork():
+    """
+    Run after_fork in the children of os.fork (python 3.7+), for the master process of a pre-forking server.
+
+    Opt-in rather than on import: the other forks of an application (multiprocessing, celery prefork,
+    parallel tests) keep their parent state.
+    """
+    global _after_fork_registered
+    if hasattr(os, 'register_at_fork') and not _after_fork_registered:
+        os.register_at_fork(after_in_child=after_fork)
+        _after_fork_registered = True
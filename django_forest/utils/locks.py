@@ -0,0 +1,17 @@
+import threading
+
+
+class KeyedLock:
+    """
+    One lock per key, e.g. per rendering id.
+
+    Used around the refresh of the Forest Admin caches, so that concurrent requests on an expired
+    entry wait for a single Forest Admin API call instead of each sending their own.
+    """
+
+    def __init__(self):
+        self.locks = {}
+
+    def __call__(self, key):
+        # Notice: dict.setdefault is atomic, two threads always get the same lock
+        return self.locks.setdefault(key, threading.Lock())
@@ -0,0 +1,276 @@
+import atexit
+import glob
+import json
+import logging
+import math
+import os
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from django_forest.utils.forest_setting import get_forest_setting
+
+# Notice: a worker writes its changed metrics once per interval, in seconds, from a background thread
+FLUSH_INTERVAL = 1
+FILE_PREFIX = 'forest_metrics_'
+
+logger = logging.getLogger(__name__)
+
+
+class Metric:
+    type = None
+
+    def __init__(self, name, documentation, labelnames=(), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.registry = registry if registry is not None else metrics
+        self.values = {}
+        self.registry.register(self)
+
+    def get_key(self, labels):
+        return tuple(str(labels[x]) for x in self.labelnames)
+
+    def snapshot(self):
+        return {
+            'type': self.type,
+            'help': self.documentation,
+            'labelnames': self.labelnames,
+            'samples': [[list(key), value] for key, value in self.values.items()],
+        }
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self.get_key(labels)
+        with self.registry.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+        self.registry.changed()
+
+
+class Histogram(Metric):
+    type = 'histogram'
+    DEFAULT_BUCKETS = (.005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10)
+
+    def __init__(self, name, documentation, labelnames=(), registry=None, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        super().__init__(name, documentation, labelnames, registry)
+
+    def observe(self, value, **labels):
+        key = self.get_key(labels)
+        with self.registry.lock:
+            # Notice: per bucket counts (not cumulative), then the +Inf bucket, the sum and the count
+            counts = self.values.setdefault(key, [0] * (len(self.buckets) + 3))
+            counts[next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))] += 1
+            counts[-2] += value
+            counts[-1] += 1
+        self.registry.changed()
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def snapshot(self):
+        return {**super().snapshot(), 'buckets': self.buckets}
+
+
+def merge_snapshots(snapshots):
+    merged = {}
+    for snapshot in snapshots:
+        for name, metric in snapshot.items():
+            values = merged.setdefault(name, {**metric, 'samples': {}})['samples']
+            for key, value in metric['samples']:
+                key = tuple(key)
+                if isinstance(value, list):
+                    previous = values.get(key, [0] * len(value))
+                    values[key] = [x + y for x, y in zip(previous, value)]
+                else:
+                    values[key] = values.get(key, 0) + value
+    return merged
+
+
+def format_value(value):
+    if isinstance(value, float) and math.isinf(value):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def format_labels(labelnames, key, extra=()):
+    labels = [*zip(labelnames, key), *extra]
+    if not labels:
+        return ''
+    content = ','.join('{}="{}"'.format(name, value.replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n'))
+                       for name, value in labels)
+    return f'{{{content}}}'
+
+
+def render_histogram(name, metric, key, counts):
+    lines = []
+    cumulative = 0
+    for bound, count in zip([*metric['buckets'], math.inf], counts):
+        cumulative += count
+        labels = format_labels(metric['labelnames'], key, [('le', format_value(float(bound)))])
+        lines.append(f'{name}_bucket{labels} {cumulative}')
+    labels = format_labels(metric['labelnames'], key)
+    lines.append(f'{name}_sum{labels} {format_value(counts[-2])}')
+    lines.append(f'{name}_count{labels} {counts[-1]}')
+    return lines
+
+
+def render(merged):
+    lines = []
+    for name, metric in sorted(merged.items()):
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['type']}")
+        for key, value in sorted(metric['samples'].items()):
+            if metric['type'] == 'histogram':
+                lines += render_histogram(name, metric, key, value)
+            else:
+                lines.append(f"{name}{format_labels(metric['labelnames'], key)} {format_value(value)}")
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsRegistry:
+    """
+    In-process counters and histograms, rendered in the Prometheus text format.
+
+    Set FOREST['METRICS_DIR'] to a directory shared by the workers of a server:
+    each worker writes its own file there, and a scrape aggregates all of them.
+    The file is written by a background thread when the metrics changed, on scrape and at exit, never by
+    the request updating a metric.
+    The files are named by process id and boot id: a new worker reusing the pid of an exited one writes its
+    own file, the counters of the exited one keep counting and the totals never go backwards. Empty the
+    directory when the server starts, as for the prometheus_client multiprocess mode.
+    """
+
+    def __init__(self):
+        self.metrics = {}
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.flusher = None
+        self.flusher_lock = threading.Lock()
+        self.exit_registered = False
+        self.boot_id = uuid.uuid4().hex
+
+    def register(self, metric):
+        self.metrics[metric.name] = metric
+
+    def get_directory(self):
+        return get_forest_setting('METRICS_DIR')
+
+    def reset(self):
+        with self.lock:
+            for metric in self.metrics.values():
+                metric.values = {}
+        self.dirty = False
+
+    def after_fork(self):
+        # Notice: metrics inherited from the parent process belong to it, and its locks may have been held
+        # by another of its threads, its flusher thread does not run in the child
+        self.lock = threading.Lock()
+        self.flusher = None
+        self.flusher_lock = threading.Lock()
+        self.boot_id = uuid.uuid4().hex
+        self.reset()
+
+    def snapshot(self):
+        with self.lock:
+            return {name: metric.snapshot() for name, metric in self.metrics.items()}
+
+    def get_path(self, directory):
+        return os.path.join(directory, f'{FILE_PREFIX}{os.getpid()}_{self.boot_id}.json')
+
+    def flush(self):
+        directory = self.get_directory()
+        if not directory:
+            return
+        # Notice: before the snapshot, a change made meanwhile is flushed next time
+        self.dirty = False
+        # Notice: written then renamed, a scrape never reads a partial file
+        fd, path = tempfile.mkstemp(dir=directory, prefix='.tmp_')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(self.snapshot(), f)
+        os.replace(path, self.get_path(directory))
+
+    def try_flush(self):
+        try:
+            self.flush()
+        except OSError as e:
+            logger.warning(f'Unable to write the metrics ({e})')
+
+    def run_flusher(self):
+        while True:
+            time.sleep(FLUSH_INTERVAL)
+            if self.dirty:
+                self.try_flush()
+
+    def flush_at_exit(self):
+        if self.dirty:
+            self.try_flush()
+
+    def start_flusher(self):
+        with self.flusher_lock:
+            if self.flusher is not None or not self.get_directory():
+                return
+            # Notice: daemon, the last changes are written by the exit handler
+            self.flusher = threading.Thread(target=self.run_flusher, name='forest-metrics', daemon=True)
+            self.flusher.start()
+            if not self.exit_registered:
+                atexit.register(self.flush_at_exit)
+                self.exit_registered = True
+
+    def changed(self):
+        # Notice: on the hot path, only the first change since the last flush does anything
+        if self.dirty:
+            return
+        self.dirty = True
+        if self.flusher is None:
+            self.start_flusher()
+
+    def read_directory(self, directory):
+        snapshots = []
+        for path in glob.glob(os.path.join(directory, f'{FILE_PREFIX}*.json')):
+            try:
+                with open(path) as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return snapshots
+
+    def collect(self):
+        directory = self.get_directory()
+        if not directory:
+            return merge_snapshots([self.snapshot()])
+        self.flush()
+        return merge_snapshots(self.read_directory(directory))
+
+    def render(self):
+        return render(self.collect())
+
+
+metrics = MetricsRegistry()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=metrics.after_fork)
+
+forest_api_request_duration = Histogram(
+    'forest_api_request_duration_seconds', 'Duration of the requests to the Forest Admin API.', ('method', 'route'))
+permission_cache = Counter(
+    'forest_permission_cache_total', 'Permission checks, by permission cache result.', ('result',))
+scope_cache = Counter(
+    'forest_scope_cache_total', 'Scope lookups, by scope cache result.', ('result',))
+ip_whitelist_cache = Counter(
+    'forest_ip_whitelist_cache_total', 'IP whitelist checks, by rules cache result.', ('result',))
+request_duration = Histogram(
+    'forest_request_duration_seconds', 'Duration of the Forest Admin views.', ('view', 'method', 'status'))
+serialized_records = Histogram(
+    'forest_serialized_records', 'Records serialized by a request.', ('collection',),
+    buckets=(0, 1, 10, 15, 50, 100, 500, 1000, 5000))
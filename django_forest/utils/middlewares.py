@@ -2,5 +2,4 @@ from django.conf import settings
 
 
 def set_middlewares():
-    settings.MIDDLEWARE.insert(0, 'django_forest.middleware.PermissionMiddleware')
-    settings.MIDDLEWARE.insert(0, 'django_forest.middleware.IpWhitelistMiddleware')
+    settings.MIDDLEWARE.insert(0, 'django_forest.middleware.ForestMiddleware')
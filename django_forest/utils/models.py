@@ -1,10 +1,48 @@
 from django.apps import apps
 
 from django_forest.utils.forest_setting import get_forest_setting
+from django_forest.utils.type_mapping import get_type
+
+
+def get_accessor_name(field):
+    name = None
+    try:
+        # model_set
+        name = field.get_accessor_name()
+    except AttributeError:
+        name = field.name
+    return name
+
+
+class ModelMetadata:
+    """Request-time lookups on a model, computed once from its `_meta`."""
+
+    def __init__(self, Model):
+        self.Model = Model
+        self.pk = Model._meta.pk
+        self.associations = {}
+        self.field_types = {}
+        for field in Model._meta.get_fields():
+            if field.is_relation:
+                # Notice: keep the first field for an accessor name, as a scan would
+                self.associations.setdefault(get_accessor_name(field), field)
+
+    def get_association_field(self, association_resource):
+        return self.associations.get(association_resource)
+
+    def get_field_type(self, name):
+        if name not in self.field_types:
+            self.field_types[name] = get_type(self.Model._meta.get_field(name))
+        return self.field_types[name]
 
 
 class Models:
     models = None
+    # Notice: derived from `models`, rebuilt whenever the list changes
+    resources = None
+    metadata = {}
+    included = frozenset()
+    _registry_models = None
 
     @classmethod
     def list(cls, force=False):
@@ -18,10 +56,39 @@ class Models:
                 cls.models = [m for m in cls.models if m._meta.db_table not in excluded_models]
         return cls.models
 
+    @classmethod
+    def build(cls):
+        models = cls.list()
+        resources = {}
+        for model in models:
+            db_table = model._meta.db_table.lower()
+            resources.setdefault(db_table, model)
+            resources.setdefault(f'{db_table}s', model)
+
+        cls.metadata = {model: ModelMetadata(model) for model in models}
+        cls.resources = resources
+        cls.included = frozenset(models)
+        cls._registry_models = models
+
+    @classmethod
+    def ensure_built(cls):
+        if cls._registry_models is None or cls._registry_models is not cls.list():
+            cls.build()
+
     @classmethod
     def get(cls, resource):
-        for model in cls.list():
-            if resource.lower() in (model._meta.db_table.lower(), f'{model._meta.db_table.lower()}s'):
-                return model
+        cls.ensure_built()
+        return cls.resources.get(resource.lower())
 
-        return None
+    @classmethod
+    def includes(cls, Model):
+        cls.ensure_built()
+        return Model in cls.included
+
+    @classmethod
+    def get_metadata(cls, Model):
+        metadata = cls.metadata.get(Model)
+        if metadata is None:
+            metadata = ModelMetadata(Model)
+            cls.metadata[Model] = metadata
+        return metadata
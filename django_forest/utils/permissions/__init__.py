@@ -4,15 +4,27 @@ import pytz
 
 from django_forest.utils.forest_api_requester import ForestApiRequester
 from django_forest.utils.forest_setting import get_forest_setting
+from django_forest.utils.locks import KeyedLock
+from django_forest.utils.metrics import permission_cache
+from django_forest.utils.server_timing import timed
+from django_forest.utils.tracing import set_span_attributes
 from django_forest.utils.permissions.utils import date_difference_in_seconds, is_stat_allowed, is_user_allowed,\
     is_smart_action_allowed
 
 
 class Permission:
     renderings_cached = {}
+    # Notice: by rendering id, the permissions (stats especially) differ from one rendering to another
     permissions_cached = {}
+    _locks = KeyedLock()
     expiration_in_seconds = get_forest_setting('FOREST_PERMISSIONS_EXPIRATION_IN_SECONDS', 3600)
 
+    @classmethod
+    def reset(cls):
+        cls.renderings_cached = {}
+        cls.permissions_cached = {}
+        cls._locks = KeyedLock()
+
     def __init__(self, *args, **kwargs):
         self.collection_name = args[0]
         self.permission_name = args[1]
@@ -23,43 +35,66 @@ class Permission:
         self.smart_action_request_info = kwargs.get('smart_action_request_info', None)
 
     @classmethod
+    @timed('permission')
     def is_authorized(cls, obj):
-        if not cls.have_permissions_expired() and cls.is_allowed(obj):
+        set_span_attributes(collection=obj.collection_name, permission=obj.permission_name)
+        permissions = cls.permissions_cached.get(obj.rendering_id)
+        if not cls.have_permissions_expired(permissions) and cls.is_allowed(obj, permissions):
+            permission_cache.inc(result='hit')
+            set_span_attributes(cache_hit=True)
             return True
 
         # Notice fetch if permissions have expired or not allowed, to get last update
-        cls.fetch_permissions(obj.rendering_id)
+        permission_cache.inc(result='miss')
+        set_span_attributes(cache_hit=False)
+        permissions = cls.refresh_permissions(obj.rendering_id, permissions)
 
-        return cls.is_allowed(obj)
+        return cls.is_allowed(obj, permissions)
 
     @classmethod
-    def have_permissions_expired(cls):
-        if 'last_fetch' in cls.permissions_cached:
-            elapsed_seconds = date_difference_in_seconds(datetime.now(pytz.UTC), cls.permissions_cached['last_fetch'])
+    def have_permissions_expired(cls, permissions):
+        if permissions and 'last_fetch' in permissions:
+            elapsed_seconds = date_difference_in_seconds(datetime.now(pytz.UTC), permissions['last_fetch'])
             return elapsed_seconds >= cls.expiration_in_seconds
 
         return True
 
+    @classmethod
+    def refresh_permissions(cls, rendering_id, stale_permissions):
+        with cls._locks(rendering_id):
+            permissions = cls.permissions_cached.get(rendering_id)
+            # Notice: already fetched by a concurrent request while waiting for the lock
+            if permissions is not stale_permissions:
+                return permissions
+            return cls.fetch_permissions(rendering_id)
+
+    @classmethod
+    def warm(cls, rendering_id):
+        permissions = cls.permissions_cached.get(rendering_id)
+        if cls.have_permissions_expired(permissions):
+            cls.refresh_permissions(rendering_id, permissions)
+
     @classmethod
     def fetch_permissions(cls, rendering_id):
         permissions = ForestApiRequester.get_from_rendering_id('/liana/v3/permissions', rendering_id)
         permissions['last_fetch'] = datetime.now(pytz.UTC)
-        cls.permissions_cached = permissions
+        cls.permissions_cached[rendering_id] = permissions
+        return permissions
 
     @classmethod
-    def is_allowed(cls, obj):
+    def is_allowed(cls, obj, permissions):
         # NOTICE: check liveQueries permissions
         if obj.permission_name == 'liveQueries':
-            return cls.live_query_allowed(obj)
+            return cls.live_query_allowed(obj, permissions)
         elif obj.permission_name == 'statsWithParameters':
-            return cls.stat_with_parameters_allowed(obj)
+            return cls.stat_with_parameters_allowed(obj, permissions)
 
-        return cls.permission_allowed(obj)
+        return cls.permission_allowed(obj, permissions)
 
     @classmethod
-    def permission_allowed(cls, obj):
+    def permission_allowed(cls, obj, permissions):
         try:
-            permissions = cls.permissions_cached['data']['collections'][obj.collection_name]
+            permissions = permissions['data']['collections'][obj.collection_name]
         except Exception:
             return False
         else:
@@ -69,8 +104,7 @@ class Permission:
                 return is_user_allowed(obj.user_id, permissions['collection'][obj.permission_name])
 
     @classmethod
-    def live_query_allowed(cls, obj):
-        permissions = cls.permissions_cached
+    def live_query_allowed(cls, obj, permissions):
         try:
             live_queries_permissions = permissions['stats']['queries']
         except Exception:
@@ -80,9 +114,8 @@ class Permission:
             return obj.query_request_info in live_queries_permissions
 
     @classmethod
-    def stat_with_parameters_allowed(cls, obj):
+    def stat_with_parameters_allowed(cls, obj, permissions):
         permission_type = f"{obj.query_request_info['type'].lower()}s"
-        permissions = cls.permissions_cached
 
         try:
             pool_permissions = permissions['stats'][permission_type]
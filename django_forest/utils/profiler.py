@@ -0,0 +1,114 @@
+import cProfile
+import logging
+import os
+import re
+import threading
+import uuid
+
+from django_forest.utils import get_token
+from django_forest.utils.forest_setting import get_forest_setting
+
+PROFILE_HEADER = 'X-Forest-Profile'
+PROFILE_ID_HEADER = 'X-Forest-Profile-Id'
+PROFILE_EXTENSION = '.prof'
+PROFILE_ID_REGEX = re.compile(r'^[0-9a-f]{32}$')
+
+logger = logging.getLogger(__name__)
+
+
+class Profiler:
+    """
+    Profile single Forest Admin requests with cProfile.
+
+    Set FOREST['PROFILER_DIR'] to enable it, and FOREST['PROFILER_USERS'] to the emails of the
+    users allowed to profile a request (with the X-Forest-Profile header) and to download profiles.
+    Only the FOREST['PROFILER_MAX_FILES'] (default 20) latest profiles are kept.
+    """
+    # Notice: a single profiler can be active at once in a process
+    lock = threading.Lock()
+
+    def get_directory(self):
+        return get_forest_setting('PROFILER_DIR')
+
+    def is_authorized(self, token):
+        users = get_forest_setting('PROFILER_USERS', [])
+        return bool(token) and token.get('email') in users
+
+    def get_user_token(self, request):
+        try:
+            return get_token(request)
+        except Exception:
+            return None
+
+    def is_requested(self, request):
+        return PROFILE_HEADER in request.headers \
+            and bool(self.get_directory()) \
+            and self.is_authorized(self.get_user_token(request))
+
+    def get_path(self, profile_id):
+        # Notice: profile ids come from the url, never build a path out of anything else
+        if not PROFILE_ID_REGEX.match(profile_id or ''):
+            return None
+        path = os.path.join(self.get_directory(), f'{profile_id}{PROFILE_EXTENSION}')
+        return path if os.path.isfile(path) else None
+
+    def get_mtimes(self, directory, names):
+        mtimes = {}
+        for name in names:
+            profile_id = name[:-len(PROFILE_EXTENSION)]
+            # Notice: the profiles only, as written by save
+            if not name.endswith(PROFILE_EXTENSION) or not PROFILE_ID_REGEX.match(profile_id):
+                continue
+            try:
+                mtimes[profile_id] = os.path.getmtime(os.path.join(directory, name))
+            except OSError:
+                # Notice: removed meanwhile, by the prune of another process or thread
+                continue
+        return mtimes
+
+    def list(self):
+        directory = self.get_directory()
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            return []
+        mtimes = self.get_mtimes(directory, names)
+        return sorted(mtimes, key=mtimes.get, reverse=True)
+
+    def prune(self):
+        max_files = int(get_forest_setting('PROFILER_MAX_FILES', 20))
+        for profile_id in self.list()[max_files:]:
+            try:
+                os.remove(os.path.join(self.get_directory(), f'{profile_id}{PROFILE_EXTENSION}'))
+            except OSError:
+                continue
+
+    def save(self, profile):
+        directory = self.get_directory()
+        profile_id = uuid.uuid4().hex
+        try:
+            os.makedirs(directory, exist_ok=True)
+            profile.dump_stats(os.path.join(directory, f'{profile_id}{PROFILE_EXTENSION}'))
+        except OSError as e:
+            logger.warning(f'Unable to write the profile ({e})')
+            return None
+        self.prune()
+        return profile_id
+
+    def profile(self, get_response, request):
+        if not self.lock.acquire(blocking=False):
+            return get_response(request)
+
+        try:
+            profile = cProfile.Profile()
+            response = profile.runcall(get_response, request)
+            profile_id = self.save(profile)
+        finally:
+            self.lock.release()
+
+        if profile_id is not None:
+            response[PROFILE_ID_HEADER] = profile_id
+        return response
+
+
+profiler = Profiler()
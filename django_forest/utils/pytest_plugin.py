@@ -0,0 +1,24 @@
+"""
+Pytest fixtures asserting the budget (queries, API calls, memory) of Forest Admin requests, enabled with:
+
+    pytest_plugins = ['django_forest.utils.pytest_plugin']
+"""
+import pytest
+
+from django_forest.utils.testing import ForestClient, forest_budget as get_forest_budget, \
+    forest_memory as get_forest_memory
+
+
+@pytest.fixture
+def forest_client(db):
+    return ForestClient()
+
+
+@pytest.fixture
+def forest_budget(db):
+    return get_forest_budget
+
+
+@pytest.fixture
+def forest_memory(db):
+    return get_forest_memory
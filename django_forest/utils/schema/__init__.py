@@ -1,17 +1,22 @@
+import atexit
 import copy
+import hashlib
 import json
 import os
 import logging
+import threading
+import time
 
 import django
 from django.conf import settings
 from django.db import connection
 from django.utils.module_loading import autodiscover_modules
 
+from django_forest.utils.collection_cache import CollectionCache
 from django_forest.utils.schema.apimap_errors import APIMAP_ERRORS
 from django_forest.utils.models import Models
 from django_forest.utils.type_mapping import get_type
-from django_forest.utils.schema.json_api_schema import create_json_api_schema
+from django_forest.utils.schema.json_api_schema import JsonApiSchema
 from django_forest.utils.forest_api_requester import ForestApiRequester
 from .definitions import COLLECTION, FIELD
 from .validations import handle_validations
@@ -26,35 +31,56 @@ from ..forest_setting import get_forest_setting
 # Get an instance of a logger
 logger = logging.getLogger(__name__)
 
+SERIALIZED_FIELD_KEYS = frozenset([*FIELD.keys(), 'validations', 'enums'])
+
+# Notice: seconds before the first retry of the apimap upload, doubled on each retry
+APIMAP_RETRY_DELAY = 1
+# Notice: seconds a process waits at exit for an ongoing apimap upload
+APIMAP_EXIT_TIMEOUT = 5
+
 
 class Schema:
     schema = {
         'collections': [],
-        'meta': {
-            'liana': 'django-forestadmin',
-            'liana_version': get_app_version(),
-            'stack': {
-                'database_type': connection.vendor,
-                'orm_version': django.get_version(),
-            }
-        }
+        # Notice: set on the first build of the schema, connection.vendor loads the database backend
+        'meta': {},
     }
 
     # schema to send to Forest Admin Server
     schema_data = None
 
+    # Notice: collections by name, rebuilt whenever the collections list is replaced or grows
+    _collections_index = (None, 0, {})
+
     @classmethod
     def get_collection(cls, resource):
-        collections = [collection for collection in cls.schema['collections'] if collection['name'] == resource]
-        if len(collections):
-            return collections[0]
+        collections = cls.schema['collections']
+        index_collections, size, index = cls._collections_index
+        if index_collections is not collections or size != len(collections):
+            index = {}
+            for collection in collections:
+                index.setdefault(collection['name'], collection)
+            cls._collections_index = (collections, len(collections), index)
+        return index.get(resource)
 
-        return None
+    @classmethod
+    def handle_meta(cls):
+        if not cls.schema.get('meta'):
+            cls.schema['meta'] = {
+                'liana': 'django-forestadmin',
+                'liana_version': get_app_version(),
+                'stack': {
+                    'database_type': connection.vendor,
+                    'orm_version': django.get_version(),
+                }
+            }
 
     @staticmethod
     def get_default(obj, definition):
-        for key, value in copy.deepcopy(definition).items():
-            obj[key] = value if key not in obj else obj[key]
+        for key, value in definition.items():
+            if key not in obj:
+                # Notice: only mutable defaults need their own copy
+                obj[key] = copy.deepcopy(value) if isinstance(value, (list, dict)) else value
 
         return obj
 
@@ -76,7 +102,7 @@ class Schema:
     def handle_relation(cls, field, f):
         if field.is_relation:
             # Notice: do not add if not in included/excluded models
-            if field.related_model not in Models.list():
+            if not Models.includes(field.related_model):
                 return None
 
             many = field.one_to_many or field.many_to_many
@@ -113,6 +139,8 @@ class Schema:
 
     @classmethod
     def build_schema(cls):
+        CollectionCache.invalidate_all()
+        cls.handle_meta()
         cls.schema['collections'] = []
         for model in Models.list():
             collection = cls.get_default({'name': model._meta.db_table}, COLLECTION)
@@ -127,9 +155,13 @@ class Schema:
 
     @classmethod
     def handle_json_api_schema(cls):
+        prebuilt = get_forest_setting('PREBUILT_SERIALIZERS', [])
         for collection in cls.schema['collections']:
-            # Notice: create marshmallow-jsonapi resource for json api serializer
-            create_json_api_schema(collection)
+            # Notice: the marshmallow-jsonapi resource for json api serializer is created on first use,
+            # except for the collections listed in FOREST['PREBUILT_SERIALIZERS']
+            JsonApiSchema.register(collection)
+            if collection['name'] in prebuilt:
+                JsonApiSchema.get(collection['name'])
 
     @classmethod
     def handle_schema_file_production(cls, file_path):
@@ -147,21 +179,33 @@ class Schema:
 
     @staticmethod
     def get_serialized_collection(collection):
-        for index, field in enumerate(collection['fields']):
-            fields = list(FIELD.keys()) + ['validations', 'enums']
-            collection['fields'][index] = {x: field[x] for x in field if x in fields}
-        return collection
+        return {
+            **collection,
+            'fields': [{x: field[x] for x in field if x in SERIALIZED_FIELD_KEYS} for field in collection['fields']],
+        }
+
+    @staticmethod
+    def read_schema_file(file_path):
+        try:
+            with open(file_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
 
     @classmethod
     def handle_schema_file(cls):
         file_path = os.path.join(os.getcwd(), '.forestadmin-schema.json')
         if settings.DEBUG:
-            cls.schema_data = copy.deepcopy(cls.schema)
-            for index, collection in enumerate(cls.schema_data['collections']):
-                cls.schema_data['collections'][index] = cls.get_serialized_collection(collection)
-
-            with open(file_path, 'w') as f:
-                f.write(json.dumps(cls.schema_data, indent=2))
+            schema_data = {
+                **cls.schema,
+                'collections': [cls.get_serialized_collection(x) for x in cls.schema['collections']],
+            }
+            # Notice: parsed back rather than deep copied, it does not share anything with the schema
+            cls.schema_data = json.loads(json.dumps(schema_data))
+            # Notice: the indented dump is slow on large projects, it is only done when the schema changes
+            if cls.read_schema_file(file_path) != cls.schema_data:
+                with open(file_path, 'w') as f:
+                    f.write(json.dumps(cls.schema_data, indent=2))
         else:
             cls.handle_schema_file_production(file_path)
 
@@ -228,15 +272,58 @@ class Schema:
         else:
             getattr(logger, APIMAP_ERRORS['error']['level'])(APIMAP_ERRORS['error']['message'])
 
+    @staticmethod
+    def get_schema_hash(serialized_schema):
+        # Notice: sorted keys, the hash only changes with the content of the schema
+        content = json.dumps(serialized_schema, sort_keys=True).encode('utf-8')
+        return hashlib.sha1(content).hexdigest()
+
+    @staticmethod
+    def has_apimap_changed(schema_hash):
+        url = ForestApiRequester.build_url('forest/apimaps/hashcheck')
+        try:
+            r = ForestApiRequester.post(url, {'schemaFileHash': schema_hash})
+            return r.status_code != 200 or r.json().get('sendSchema', True)
+        except Exception:
+            # Notice: the apimap is sent when its hash cannot be checked
+            return True
+
+    @classmethod
+    def upload_apimap(cls, serialized_schema):
+        """Send the apimap unless Forest already has it, return False when the upload should be retried."""
+        if not cls.has_apimap_changed(serialized_schema['meta']['schemaFileHash']):
+            logger.info('No change in the apimap, nothing sent to Forest.')
+            return True
+
+        url = ForestApiRequester.build_url('forest/apimaps')
+        try:
+            r = ForestApiRequester.post(url, serialized_schema)
+        except Exception:
+            logger.warning('Cannot send the apimap to Forest. Are you online?')
+            return False
+        cls.handle_status_code(r)
+        return r.status_code < 500
+
     @classmethod
     def send_apimap(cls):
         disable_auto_schema_apply = get_forest_setting('FOREST_DISABLE_AUTO_SCHEMA_APPLY', False)
-        if not disable_auto_schema_apply:
-            serialized_schema = cls.get_serialized_schema()
-            url = ForestApiRequester.build_url('forest/apimaps')
-            try:
-                r = ForestApiRequester.post(url, serialized_schema)
-            except Exception:
-                logger.warning('Cannot send the apimap to Forest. Are you online?')
-            else:
-                cls.handle_status_code(r)
+        if disable_auto_schema_apply:
+            return
+
+        serialized_schema = cls.get_serialized_schema()
+        schema_hash = cls.get_schema_hash(serialized_schema)
+        serialized_schema = {**serialized_schema, 'meta': {**serialized_schema['meta'], 'schemaFileHash': schema_hash}}
+        retries = int(get_forest_setting('APIMAP_RETRIES', 3))
+        for attempt in range(retries + 1):
+            if attempt:
+                time.sleep(APIMAP_RETRY_DELAY * 2 ** (attempt - 1))
+            if cls.upload_apimap(serialized_schema):
+                return
+
+    @classmethod
+    def send_apimap_in_background(cls):
+        # Notice: a daemon, the retries never hold a process at exit longer than APIMAP_EXIT_TIMEOUT
+        thread = threading.Thread(target=cls.send_apimap, name='forest-apimap', daemon=True)
+        thread.start()
+        atexit.register(thread.join, APIMAP_EXIT_TIMEOUT)
+        return thread
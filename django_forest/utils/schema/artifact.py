@@ -0,0 +1,129 @@
+import hashlib
+import json
+import logging
+import sys
+
+from django.core.exceptions import FieldDoesNotExist
+
+from django_forest.utils.collection_cache import CollectionCache
+from django_forest.utils.forest_setting import get_forest_setting
+from django_forest.utils.models import Models
+from django_forest.utils.schema import Schema
+from django_forest.utils.schema.version import get_app_version
+
+logger = logging.getLogger(__name__)
+
+# Notice: bumped whenever the content of the artifact changes
+ARTIFACT_VERSION = 1
+
+
+def get_source_hash(module_name, source_hashes):
+    if module_name not in source_hashes:
+        try:
+            with open(sys.modules[module_name].__file__, 'rb') as f:
+                source_hashes[module_name] = hashlib.sha1(f.read()).hexdigest()
+        except (KeyError, AttributeError, TypeError, OSError):
+            # Notice: builtins, frozen or generated modules
+            source_hashes[module_name] = module_name
+    return source_hashes[module_name]
+
+
+def get_model_modules(Model):
+    # Notice: the model and its bases, its field classes, and the models on the other side of its relations,
+    # which declare the reverse relations
+    modules = {klass.__module__ for klass in Model.__mro__}
+    for field in Model._meta.get_fields():
+        modules.add(type(field).__module__)
+        if field.related_model is not None:
+            modules.add(field.related_model.__module__)
+    return modules
+
+
+def get_model_fingerprint(Model, source_hashes=None):
+    """
+    Hash of the source of the modules defining a model.
+
+    Reading the fields definitions would cost as much as the introspection, the source files are read once.
+    """
+    source_hashes = {} if source_hashes is None else source_hashes
+    hashes = sorted(get_source_hash(module_name, source_hashes) for module_name in get_model_modules(Model))
+    return hashlib.sha1(json.dumps([Model._meta.db_table, hashes]).encode('utf-8')).hexdigest()
+
+
+def get_fingerprints():
+    source_hashes = {}
+    return {Model._meta.db_table: get_model_fingerprint(Model, source_hashes) for Model in Models.list()}
+
+
+def get_serializer_plan(collection):
+    Model = Models.get(collection['name'])
+    metadata = Models.get_metadata(Model)
+    plan = {}
+    for field in collection['fields']:
+        if field['reference'] is None:
+            try:
+                plan[field['field']] = metadata.get_field_type(field['field'])
+            except FieldDoesNotExist:
+                pass
+    return plan
+
+
+def build_artifact():
+    """Introspect the models, as init_forest does, and return the artifact to save at build time."""
+    Schema.build_schema()
+    Models.build()
+    collections = json.loads(json.dumps(Schema.schema['collections']))
+    return {
+        'version': ARTIFACT_VERSION,
+        'liana_version': get_app_version(),
+        'fingerprints': get_fingerprints(),
+        'collections': collections,
+        'serializers': {collection['name']: get_serializer_plan(collection) for collection in collections},
+    }
+
+
+def read_artifact(file_path):
+    try:
+        with open(file_path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        logger.warning(f'Cannot read the Forest schema artifact {file_path}, the models are introspected.')
+        return None
+
+
+def is_artifact_fresh(artifact):
+    if artifact.get('version') != ARTIFACT_VERSION or artifact.get('liana_version') != get_app_version():
+        logger.warning('The Forest schema artifact was built by another version, the models are introspected.')
+        return False
+
+    fingerprints = get_fingerprints()
+    stale = sorted(name for name in fingerprints.keys() | artifact['fingerprints'].keys()
+                   if fingerprints.get(name) != artifact['fingerprints'].get(name))
+    if stale:
+        logger.warning(f'The Forest schema artifact is stale ({", ".join(stale[:5])}), the models are introspected.')
+        return False
+    return True
+
+
+def load_artifact():
+    """
+    Load the collections from the FOREST['SCHEMA_ARTIFACT'] file instead of introspecting the models.
+
+    Returns False when no artifact is configured, or when it is missing or stale.
+    """
+    file_path = get_forest_setting('SCHEMA_ARTIFACT')
+    if not file_path:
+        return False
+
+    artifact = read_artifact(file_path)
+    if artifact is None or not is_artifact_fresh(artifact):
+        return False
+
+    CollectionCache.invalidate_all()
+    Schema.handle_meta()
+    Schema.schema['collections'] = artifact['collections']
+    Models.build()
+    # Notice: the field types the serializers need, without looking the fields up
+    for name, plan in artifact['serializers'].items():
+        Models.get_metadata(Models.get(name)).field_types.update(plan)
+    return True
@@ -0,0 +1,57 @@
+from django_forest.utils.collection_cache import CollectionCache
+from django_forest.utils.schema import Schema
+
+TO_ONE_RELATIONSHIPS = ('BelongsTo', 'HasOne')
+
+
+def get_serialized_name(field):
+    # Notice: the name in the `only` option of the serializer, smart relationships are serialized by reference
+    if field.is_virtual and field.reference and '_' in field.reference:
+        return field.reference.split('_')[1]
+    return field.name
+
+
+class FieldInfo:
+    """
+    Read-only view of a schema field, for the request hot paths.
+
+    The schema dict stays the reference (smart collections customize it, it is serialized as is in
+    .forestadmin-schema.json), it is kept as `schema` for the smart field methods.
+    """
+    __slots__ = ('schema', 'name', 'type', 'is_virtual', 'reference', 'reference_collection', 'is_to_one',
+                 'serialized_name')
+
+    def __init__(self, field):
+        self.schema = field
+        self.name = field['field']
+        self.type = field['type']
+        self.is_virtual = bool(field.get('is_virtual'))
+        self.reference = field.get('reference')
+        self.reference_collection = (self.reference or '').split('.')[0]
+        self.is_to_one = bool(self.reference) and field.get('relationship') in TO_ONE_RELATIONSHIPS
+        self.serialized_name = get_serialized_name(self)
+
+
+class CollectionInfo:
+    """Read-only view of a schema collection, see FieldInfo."""
+    __slots__ = ('name', 'fields', 'fields_by_name', 'smart_fields')
+
+    def __init__(self, collection):
+        self.name = collection['name']
+        self.fields = tuple(FieldInfo(x) for x in collection['fields'])
+        self.fields_by_name = {}
+        for field in self.fields:
+            # Notice: the first field of a name, as a scan would
+            self.fields_by_name.setdefault(field.name, field)
+        self.smart_fields = tuple(x for x in self.fields if x.is_virtual)
+
+
+# Notice: rebuilt when the collection changes, as the other collection caches
+collection_infos = CollectionCache(CollectionInfo)
+
+
+def get_collection_info(resource):
+    collection = Schema.get_collection(resource)
+    if collection is None:
+        return None
+    return collection_infos.get(collection)
@@ -1,11 +1,11 @@
 import re
+import threading
 
 import marshmallow as ma
 from marshmallow.schema import SchemaMeta
 from marshmallow_jsonapi import Schema, fields
 from django.core.exceptions import FieldDoesNotExist
 from django_forest.utils.models import Models
-from django_forest.utils.type_mapping import get_type
 
 
 TYPE_CHOICES = {
@@ -23,17 +23,38 @@ TYPE_CHOICES = {
 
 class JsonApiSchema(type):
     _registry = {}
+    # Notice: the collections of the schema classes not built yet, by class name (see register)
+    _pending = {}
+    _lock = threading.Lock()
 
     def __new__(mcs, model_name, bases, attrs):
         klass = super(JsonApiSchema, mcs).__new__(mcs, model_name, bases, attrs)
         mcs._registry[model_name] = klass
         return klass
 
+    @classmethod
+    def register(mcs, collection):
+        """Register a collection, its schema class is built on first use."""
+        model_name = f"{collection['name']}Schema"
+        mcs._pending[model_name] = collection
+        mcs._registry.pop(model_name, None)
+
+    @classmethod
+    def build(mcs, model_name):
+        # Notice: concurrent first requests on a collection build a single class
+        with mcs._lock:
+            if model_name in mcs._pending:
+                create_json_api_schema(mcs._pending[model_name])
+                del mcs._pending[model_name]
+            return mcs._registry[model_name]
+
     @classmethod
     def get(mcs, model_name):
         model_name = f'{model_name}Schema'
         if model_name in mcs._registry:
             return mcs._registry[model_name]
+        if model_name in mcs._pending:
+            return mcs.build(model_name)
         raise Exception(f'The {model_name} does not exist in the JsonApiSchema. Make sure you correctly set it.')
 
 
@@ -46,12 +67,20 @@ def get_type_name(name):
     return re.sub(r'(\w)([A-Z])', r'\1 \2', name)
 
 
-def get_marshmallow_field(field, Model):
+def get_field_type(field, Model):
     # Notice, handle Model is None (Smart Collection)
-    model_fields = [] if Model is None else Model._meta.get_fields()
+    if Model is None:
+        return field['type']
 
-    # Notice, handle smart field, default to type
-    _type = next((get_type(x) for x in model_fields if x.name == field['field']), field['type'])
+    try:
+        return Models.get_metadata(Model).get_field_type(field['field'])
+    except FieldDoesNotExist:
+        # Notice, handle smart field, default to type
+        return field['type']
+
+
+def get_marshmallow_field(field, Model):
+    _type = get_field_type(field, Model)
 
     if isinstance(_type, list):
         return fields.List(TYPE_CHOICES.get(_type[0], fields.Str)())
@@ -60,6 +89,20 @@ def get_marshmallow_field(field, Model):
 
 class DjangoRelationship(fields.Relationship):
 
+    def __init__(self, related_name, **kwargs):
+        # Notice: by module path, marshmallow keeps the first class of a short name, the last of a path
+        super(DjangoRelationship, self).__init__(schema=f'{__name__}.{related_name}Schema', **kwargs)
+        self.related_name = related_name
+        self.related_built = False
+
+    @property
+    def schema(self):
+        # Notice: marshmallow only knows the schema classes already built, the related one may not be
+        if not self.related_built:
+            JsonApiSchema.get(self.related_name)
+            self.related_built = True
+        return super(DjangoRelationship, self).schema
+
     def _serialize(self, value, attr, obj):
         if value and self.many:
             value = value.all()
@@ -74,9 +117,9 @@ def populate_attrs(collection, collection_name):
         if field['reference'] is not None:
             related_name = field['reference'].split('.')[0]
             attrs[field_name] = DjangoRelationship(
+                related_name,
                 type_=get_type_name(related_name).lower(),
                 many=field['relationship'] == 'HasMany',
-                schema=f'{related_name}Schema',
                 related_url=f'/forest/{collection_name}/{{{collection_name.lower()}_id}}/relationships/{field_name}',
                 related_url_kwargs={f'{collection_name.lower()}_id': '<pk>'},
                 id_field='pk'
@@ -126,7 +169,13 @@ class DjangoSchema(Schema):
     @ma.post_dump(pass_many=True, pass_original=True)
     def format_json_api_response(self, data, original, many):
         self._original = original  # needed to get the id value
-        return super(DjangoSchema, self).format_json_api_response(data, many)
+        try:
+            return super(DjangoSchema, self).format_json_api_response(data, many)
+        finally:
+            # Notice: marshmallow keeps the last schema instances (lru_cache on _has_processors),
+            # they must not keep the records nor the included data alive
+            self._original = None
+            self.included_data = {}
 
     def cast_value(self, field, value):
         return field.get_prep_value(value)
@@ -158,12 +207,11 @@ def create_json_api_schema(collection):
     collection_name = collection['name']
     attrs = populate_attrs(collection, collection_name)
 
-    class MarshmallowSchema(DjangoSchema):
-
-        class Meta:
-            type_ = get_type_name(collection_name).lower()
-            self_url = f'/forest/{collection_name}/{{{collection_name.lower()}_id}}'
-            self_url_kwargs = {f'{collection_name.lower()}_id': '<__id__>'}
-            strict = True
+    class Meta:
+        type_ = get_type_name(collection_name).lower()
+        self_url = f'/forest/{collection_name}/{{{collection_name.lower()}_id}}'
+        self_url_kwargs = {f'{collection_name.lower()}_id': '<__id__>'}
+        strict = True
 
-    return MarshmallowType(f'{collection_name}Schema', (MarshmallowSchema,), attrs)
+    # Notice: a single schema class per collection, marshmallow resolves the hooks of each class
+    return MarshmallowType(f'{collection_name}Schema', (DjangoSchema,), {**attrs, 'Meta': Meta, '__module__': __name__})
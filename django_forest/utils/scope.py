@@ -1,10 +1,15 @@
 import logging
 
 # 5 minutes expiration cache
+from django_forest.utils.collection_cache import CollectionCache
 from django_forest.utils.date import get_utc_now
 
 from django_forest.utils.forest_api_requester import ForestApiRequester
+from django_forest.utils.locks import KeyedLock
+from django_forest.utils.metrics import scope_cache
 from django_forest.utils.permissions import date_difference_in_seconds
+from django_forest.utils.server_timing import timed
+from django_forest.utils.tracing import set_span_attributes
 
 SCOPE_CACHE_EXPIRATION_DELTA = 60 * 5
 
@@ -12,59 +17,165 @@ SCOPE_CACHE_EXPIRATION_DELTA = 60 * 5
 logger = logging.getLogger(__name__)
 
 
+def is_dynamic_value(value):
+    return isinstance(value, str) and value.startswith('$currentUser')
+
+
+def has_dynamic_values(node):
+    if 'conditions' in node:
+        return any(has_dynamic_values(x) for x in node['conditions'])
+    return is_dynamic_value(node.get('value'))
+
+
+def bind_dynamic_values(node, values):
+    if 'conditions' in node:
+        return {**node, 'conditions': [bind_dynamic_values(x, values) for x in node['conditions']]}
+    if is_dynamic_value(node.get('value')):
+        return {**node, 'value': values[node['value']]}
+    return node
+
+
+class ScopeTemplate:
+    """
+    A collection scope as fetched from Forest Admin, never mutated.
+
+    `$currentUser` values are slots, filled for each user on bind.
+    """
+
+    def __init__(self, collection_scope):
+        scope = collection_scope['scope']
+        self.filter = scope['filter']
+        self.users = scope.get('dynamicScopesValues', {}).get('users', {})
+        self.is_dynamic = has_dynamic_values(self.filter)
+
+    def bind(self, user_id):
+        if not self.is_dynamic:
+            return self.filter
+        return bind_dynamic_values(self.filter, self.users[user_id])
+
+
+class UserScope:
+    def __init__(self, filter):
+        self.filter = filter
+        # Notice: the Q object, memoized by the caller when it does not depend on the request
+        self.q_object = None
+
+
 class ScopeManager:
     cache = {}
+    _locks = KeyedLock()
+
+    @classmethod
+    def reset(cls):
+        cls.cache = {}
+        cls._locks = KeyedLock()
 
     @classmethod
     def _has_cache_expired(cls, rendering_id):
-        if rendering_id not in cls.cache:
+        rendering_scopes = cls.cache.get(rendering_id)
+        if rendering_scopes is None:
             return True
-        rendering_scopes = cls.cache[rendering_id]
         seconds_since_last_fetch = date_difference_in_seconds(get_utc_now(), rendering_scopes['fetched_at'])
         return seconds_since_last_fetch > SCOPE_CACHE_EXPIRATION_DELTA
 
+    @classmethod
+    def _get_cached(cls, rendering_id):
+        # Notice: None when expired, or invalidated right after the expiration check
+        return None if cls._has_cache_expired(rendering_id) else cls.cache.get(rendering_id)
+
     @classmethod
     def _refresh_cache(cls, rendering_id):
-        try:
-            scopes = ForestApiRequester.get_from_rendering_id('/liana/scopes', rendering_id)
-        except Exception:
-            raise Exception('Unable to fetch scopes')
-        else:
-            cls.cache[rendering_id] = {
-                'scopes': scopes,
-                'fetched_at': get_utc_now()
-            }
+        with cls._locks(rendering_id):
+            # Notice: already fetched by a concurrent request while waiting for the lock
+            rendering_scopes = cls._get_cached(rendering_id)
+            if rendering_scopes is not None:
+                return rendering_scopes
+            try:
+                scopes = ForestApiRequester.get_from_rendering_id('/liana/scopes', rendering_id)
+            except Exception:
+                raise Exception('Unable to fetch scopes')
+            else:
+                rendering_scopes = cls.cache[rendering_id] = {
+                    'scopes': scopes,
+                    'fetched_at': get_utc_now()
+                }
+                return rendering_scopes
+
+    @classmethod
+    def warm(cls, rendering_id):
+        cls._refresh_cache(rendering_id)
 
     @staticmethod
-    def _format_dynamic_values(user_id, collection_scope):
+    def _get_template(rendering_scopes, collection_name):
+        templates = rendering_scopes.setdefault('templates', {})
+        if collection_name not in templates:
+            template = None
+            if collection_name in rendering_scopes['scopes']:
+                try:
+                    template = ScopeTemplate(rendering_scopes['scopes'][collection_name])
+                except Exception:
+                    logger.warning(f'Invalid scope for collection {collection_name}')
+            templates[collection_name] = template
+        return templates[collection_name]
+
+    @classmethod
+    def _bind_user_scope(cls, rendering_scopes, user_id, collection_name):
+        template = cls._get_template(rendering_scopes, collection_name)
+        if template is None:
+            return None
         try:
-            scope = collection_scope['scope']
-            for condition in scope['filter']['conditions']:
-                if condition['value'].startswith('$currentUser'):
-                    condition['value'] = scope['dynamicScopesValues']['users'][user_id][condition['value']]
-            return scope['filter']
-        except Exception:
+            return UserScope(template.bind(user_id))
+        except KeyError:
+            logger.warning(f'Missing dynamic scope values for user {user_id} on collection {collection_name}')
             return None
 
     @classmethod
-    def _get_scope_collection_scope(cls, rendering_id, collection_name):
+    def _get_rendering_scopes(cls, rendering_id):
         # TODO: handle cache stale true, do not wait for requests if cache expired using a ThreadPoolExecutor
         # https://stackoverflow.com/questions/14245989/python-requests-non-blocking
-        if cls._has_cache_expired(rendering_id):
-            cls._refresh_cache(rendering_id)
-
-        if collection_name in cls.cache[rendering_id]['scopes']:
-            return cls.cache[rendering_id]['scopes'][collection_name]
+        rendering_scopes = cls._get_cached(rendering_id)
+        if rendering_scopes is None:
+            scope_cache.inc(result='miss')
+            set_span_attributes(cache_hit=False)
+            return cls._refresh_cache(rendering_id)
+        scope_cache.inc(result='hit')
+        set_span_attributes(cache_hit=True)
+        return rendering_scopes
 
     @classmethod
-    def get_scope_for_user(cls, token, collection_name):
+    @timed('scope')
+    def get_user_scope(cls, token, collection_name):
         if 'rendering_id' not in token:
             raise Exception('Missing required rendering_id')
 
-        collection_scope = cls._get_scope_collection_scope(str(token['rendering_id']), collection_name)
-        return cls._format_dynamic_values(str(token['id']), collection_scope)
+        set_span_attributes(collection=collection_name)
+        rendering_scopes = cls._get_rendering_scopes(str(token['rendering_id']))
+        # Notice: bound scopes live as long as the fetched scopes
+        users = rendering_scopes.setdefault('users', {})
+        key = (str(token['id']), collection_name)
+        if key not in users:
+            users[key] = cls._bind_user_scope(rendering_scopes, *key)
+        return users[key]
+
+    @classmethod
+    def get_scope_for_user(cls, token, collection_name):
+        user_scope = cls.get_user_scope(token, collection_name)
+        if user_scope is not None:
+            return user_scope.filter
 
     @classmethod
     def invalidate_scope_cache(cls, rendering_id):
-        if rendering_id in cls.cache:
-            del cls.cache[rendering_id]
+        # Notice: waits for an ongoing fetch, its scopes may predate the invalidation
+        with cls._locks(rendering_id):
+            cls.cache.pop(rendering_id, None)
+
+    @classmethod
+    def invalidate_user_scopes(cls, collection_name=None):
+        # Notice: their memoized Q objects are compiled from the schema, the fetched scopes are kept
+        for rendering_scopes in list(cls.cache.values()):
+            users = rendering_scopes.get('users', {})
+            rendering_scopes['users'] = {key: user_scope for key, user_scope in users.items()
+                                         if collection_name is not None and key[1] != collection_name}
+
+
+CollectionCache.connect(ScopeManager.invalidate_user_scopes)
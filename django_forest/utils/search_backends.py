@@ -0,0 +1,87 @@
+from django.db import connections, router
+from django.db.models import Q
+
+try:
+    from django.contrib.postgres.search import SearchQuery, SearchVector
+except ImportError:  # psycopg2 is not installed
+    SearchQuery = SearchVector = None
+
+SEARCH_ANNOTATION = '_forest_search'
+
+
+class IcontainsSearchBackend:
+    """Default backend: one condition per field, `icontains` for strings."""
+
+    def bind(self, plan, term, related_field_name=None):
+        q_objects = Q()
+        for lookup, _type, enums in plan.get_lookups(related_field_name):
+            q_objects |= term.condition(_type, lookup, enums)
+        return q_objects
+
+
+class PostgresSearchBackend(IcontainsSearchBackend):
+    """
+    Full-text search on string fields, using django.contrib.postgres.
+
+    By default, a SearchVector is computed over the string fields of the collection.
+    Set `search_vector_field` to match against a stored tsvector column instead,
+    or `trigram` to use the `trigram_similar` lookup (requires 'django.contrib.postgres'
+    in INSTALLED_APPS and the pg_trgm extension).
+    Other databases fall back to the default backend.
+    """
+
+    def __init__(self, config=None, search_type='plain', search_vector_field=None, trigram=False):
+        self.config = config
+        self.search_type = search_type
+        self.search_vector_field = search_vector_field
+        self.trigram = trigram
+
+    def is_supported(self, Model):
+        if SearchQuery is None or Model is None:
+            return False
+        return connections[router.db_for_read(Model)].vendor == 'postgresql'
+
+    def get_search_query(self, term):
+        return SearchQuery(term.value, config=self.config, search_type=self.search_type)
+
+    def get_prefixed(self, name, related_field_name):
+        if related_field_name is None:
+            return name
+        return f'{related_field_name}__{name}'
+
+    def get_search_vector_condition(self, plan, term, lookups, related_field_name):
+        if self.search_vector_field is not None:
+            return Q(**{self.get_prefixed(self.search_vector_field, related_field_name): self.get_search_query(term)})
+
+        queryset = plan.Model._default_manager.annotate(**{
+            SEARCH_ANNOTATION: SearchVector(*lookups, config=self.config)
+        }).filter(**{SEARCH_ANNOTATION: self.get_search_query(term)})
+        return Q(**{self.get_prefixed('pk__in', related_field_name): queryset.values('pk')})
+
+    def get_text_condition(self, plan, term, related_field_name):
+        lookups = [lookup for lookup, _type, enums in plan.lookups if _type not in ('Enum', 'Number')]
+        if not lookups and self.search_vector_field is None:
+            return Q()
+
+        if self.trigram:
+            q_objects = Q()
+            for lookup in lookups:
+                q_objects |= Q(**{f'{self.get_prefixed(lookup, related_field_name)}__trigram_similar': term.value})
+            return q_objects
+
+        return self.get_search_vector_condition(plan, term, lookups, related_field_name)
+
+    def bind(self, plan, term, related_field_name=None):
+        # Notice: uuid values keep their exact match
+        if term.is_uuid or not self.is_supported(plan.Model):
+            return super().bind(plan, term, related_field_name)
+
+        q_objects = Q()
+        for lookup, _type, enums in plan.get_lookups(related_field_name):
+            if _type in ('Enum', 'Number'):
+                q_objects |= term.condition(_type, lookup, enums)
+
+        return q_objects | self.get_text_condition(plan, term, related_field_name)
+
+
+default_search_backend = IcontainsSearchBackend()
@@ -0,0 +1,148 @@
+import sys
+from collections import namedtuple
+from uuid import UUID
+
+from django.db.models import Q
+
+from django_forest.resources.utils.in_search_fields import in_search_fields
+from django_forest.utils.collection import Collection
+from django_forest.utils.collection_cache import CollectionCache
+from django_forest.utils.models import Models
+from django_forest.utils.search_backends import default_search_backend
+
+
+def parse_number(search):
+    try:
+        return int(search), True
+    except ValueError:
+        try:
+            return float(search), True
+        except ValueError:
+            return search, False
+
+
+def is_uuid(search):
+    try:
+        UUID(search)
+    except ValueError:
+        return False
+    else:
+        return True
+
+
+class SearchTerm:
+    """The search parameter, parsed once per request."""
+
+    def __init__(self, search):
+        self.value = search
+        self.is_uuid = is_uuid(search)
+        self.number, self.is_number = parse_number(search)
+
+    def handle_enum(self, lookup, enums):
+        # Notice: only add condition if search in enums
+        if self.value in enums:
+            return Q(**{lookup: self.value})
+        return Q()
+
+    def handle_number(self, lookup):
+        # Notice, only add condition if value is number
+        if not self.is_number:
+            return Q()
+        # Notice: use LIKE operator when too big
+        if self.number <= sys.maxsize:
+            return Q(**{lookup: self.number})
+        return Q(**{f'{lookup}__contains': self.number})
+
+    def handle_string(self, lookup):
+        if self.is_uuid:
+            return Q(**{lookup: self.value})
+        return Q(**{f'{lookup}__icontains': self.value})
+
+    def condition(self, _type, lookup, enums):
+        if _type == 'Enum':
+            return self.handle_enum(lookup, enums)
+        elif _type == 'Number':
+            return self.handle_number(lookup)
+        return self.handle_string(lookup)
+
+
+def get_fields_to_search(collection):
+    fields_to_search = []
+    for x in collection['fields']:
+        if x['type'] in ('String', 'Number', 'Enum') \
+                and not x['reference'] \
+                and not x['is_virtual'] \
+                and in_search_fields(x['field'], collection['search_fields']):
+            fields_to_search.append(x)
+    return fields_to_search
+
+
+def get_smart_field_search(smart_field, resource):
+    method = smart_field['search']
+    if isinstance(method, str):
+        return getattr(Collection._registry[resource], method)
+    elif callable(method):
+        return method
+
+
+def get_search_backend(resource):
+    collection = Collection._registry.get(resource)
+    return getattr(collection, 'search_backend', None) or default_search_backend
+
+
+# Notice: local/remote are the columns joining both models, None when the relation has no concrete column
+RelatedPath = namedtuple('RelatedPath', ['name', 'resource', 'local', 'remote'])
+
+
+def get_related_columns(field):
+    if field.concrete:
+        return field.attname, field.target_field.attname
+    elif hasattr(field, 'field') and field.field.concrete:
+        return field.field.target_field.attname, field.field.attname
+    return None, None
+
+
+def get_related_paths(Model):
+    if Model is None:
+        return ()
+    return tuple(RelatedPath(x.name, x.related_model._meta.db_table, *get_related_columns(x))
+                 for x in Model._meta.get_fields()
+                 if x.is_relation and not x.many_to_many and x.related_model is not None)
+
+
+class SearchPlan:
+    """Everything a collection search needs, except the search term itself."""
+
+    def __init__(self, collection):
+        resource = collection['name']
+        self.name = resource
+        self.lookups = tuple((x['field'], x['type'], tuple(x.get('enums') or ()))
+                             for x in get_fields_to_search(collection))
+        self.smart_searches = tuple(get_smart_field_search(x, resource) for x in collection['fields']
+                                    if x['is_virtual'] and 'search' in x)
+        self.Model = Models.get(resource)
+        self.related_paths = get_related_paths(self.Model)
+        self.backend = get_search_backend(resource)
+        self._prefixed_lookups = {}
+
+    def get_lookups(self, related_field_name=None):
+        if related_field_name is None:
+            return self.lookups
+        if related_field_name not in self._prefixed_lookups:
+            self._prefixed_lookups[related_field_name] = tuple(
+                (f'{related_field_name}__{lookup}', _type, enums) for lookup, _type, enums in self.lookups
+            )
+        return self._prefixed_lookups[related_field_name]
+
+    def bind(self, term, related_field_name=None):
+        q_objects = self.backend.bind(self, term, related_field_name)
+
+        # Notice handle smart fields
+        for search in self.smart_searches:
+            if search is not None:
+                q_objects |= search(term.value)
+
+        return q_objects
+
+
+search_plans = CollectionCache(SearchPlan)
@@ -0,0 +1,90 @@
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from functools import wraps
+
+from django.db import connections
+
+from django_forest.utils.tracing import get_tracer, trace
+
+_local = threading.local()
+
+
+class ServerTiming:
+    """
+    Durations and database queries of the phases of a request.
+
+    Phases are inclusive: a phase running inside another one is counted in both.
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self.queries = 0
+
+    def add(self, name, duration, queries=0):
+        phase = self.phases.setdefault(name, [0, 0])
+        phase[0] += duration
+        phase[1] += queries
+
+    def __call__(self, execute, sql, params, many, context):
+        # Notice: used as the execute wrapper of the database connections
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.add('db', time.perf_counter() - start, 1)
+
+    def get_header(self):
+        return ', '.join(
+            f'{name};dur={duration * 1000:.1f};desc="{queries} queries"'
+            for name, (duration, queries) in self.phases.items()
+        )
+
+
+def get_server_timing():
+    return getattr(_local, 'server_timing', None)
+
+
+@contextmanager
+def record_server_timing():
+    server_timing = ServerTiming()
+    _local.server_timing = server_timing
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(server_timing))
+            start = time.perf_counter()
+            yield server_timing
+            server_timing.add('total', time.perf_counter() - start, server_timing.queries)
+    finally:
+        _local.server_timing = None
+
+
+@contextmanager
+def record_phase(server_timing, name):
+    if server_timing is None:
+        yield
+        return
+
+    start, queries = time.perf_counter(), server_timing.queries
+    try:
+        yield
+    finally:
+        server_timing.add(name, time.perf_counter() - start, server_timing.queries - queries)
+
+
+def timed(name):
+    """Record a phase of the request, in the Server-Timing header and as a tracing span."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            server_timing, tracer = get_server_timing(), get_tracer()
+            # Notice: nothing else is done when the request is neither recorded nor traced
+            if server_timing is None and tracer is None:
+                return func(*args, **kwargs)
+
+            with trace(name, tracer), record_phase(server_timing, name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
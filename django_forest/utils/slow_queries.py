@@ -0,0 +1,166 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from django.db import DatabaseError, connections, router, transaction
+
+from django_forest.utils.forest_setting import get_forest_setting
+
+logger = logging.getLogger(__name__)
+
+# Notice: query shapes remembered for the rate limit, the least recently logged are forgotten first
+MAX_LOGGED_QUERIES = 1000
+
+
+def get_filters_shape(filters):
+    if 'conditions' in filters:
+        return {
+            'aggregator': filters.get('aggregator'),
+            'conditions': [get_filters_shape(x) for x in filters['conditions']],
+        }
+    return {'field': filters.get('field'), 'operator': filters.get('operator')}
+
+
+def get_params(request):
+    params = request.GET.dict()
+    if request.method == 'POST':
+        try:
+            params.update(json.loads(request.body.decode('utf-8')))
+        except ValueError:
+            pass
+    return params
+
+
+def get_query_shape(params):
+    """The filters, search and sort of a request, without their values."""
+    filters = params.get('filters')
+    try:
+        filters = get_filters_shape(json.loads(filters)) if filters else None
+    except (ValueError, AttributeError):
+        filters = None
+    return {
+        'filters': filters,
+        'search': bool(params.get('search')),
+        'search_extended': bool(params.get('searchExtended')),
+        'segment': params.get('segment'),
+        'sort': params.get('sort'),
+    }
+
+
+def format_params(params):
+    if isinstance(params, dict):
+        return {key: str(value) for key, value in params.items()}
+    return [str(x) for x in params or ()]
+
+
+class SlowQueryRecorder:
+    """
+    Database execute wrapper logging the queries slower than a threshold, with their EXPLAIN plan.
+
+    A query shape (collection and SQL) is logged at most once per SLOW_QUERY_LOG_INTERVAL seconds.
+    """
+    # Notice: shared by the requests, ordered from the least recently logged
+    last_logged = OrderedDict()
+    _lock = threading.Lock()
+
+    @classmethod
+    def reset(cls):
+        cls.last_logged = OrderedDict()
+        cls._lock = threading.Lock()
+
+    def __init__(self, collection, shape, threshold):
+        self.collection = collection
+        self.shape = shape
+        self.threshold = threshold
+        self.analyze = get_forest_setting('SLOW_QUERY_EXPLAIN_ANALYZE', False)
+        self.interval = float(get_forest_setting('SLOW_QUERY_LOG_INTERVAL', 60))
+        self.explaining = False
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration = time.perf_counter() - start
+        if duration >= self.threshold and not self.explaining and not many:
+            self.handle_slow_query(context['connection'], sql, params, duration)
+        return result
+
+    def is_rate_limited(self, sql):
+        key = (self.collection, sql)
+        now = time.monotonic()
+        with self._lock:
+            if key in self.last_logged and now - self.last_logged[key] < self.interval:
+                return True
+            self.last_logged[key] = now
+            self.last_logged.move_to_end(key)
+            self.purge(now)
+        return False
+
+    def purge(self, now):
+        # Notice: the entries older than the interval no longer limit anything
+        while self.last_logged:
+            oldest = next(iter(self.last_logged.values()))
+            if len(self.last_logged) <= MAX_LOGGED_QUERIES and now - oldest < self.interval:
+                break
+            self.last_logged.popitem(last=False)
+
+    def get_explain_prefix(self, connection):
+        options = {}
+        # Notice: ANALYZE runs the query again, only SELECT queries are explained
+        if self.analyze and connection.vendor == 'postgresql':
+            options['analyze'] = True
+        return connection.ops.explain_query_prefix(**options)
+
+    def explain(self, connection, sql, params):
+        if not connection.features.supports_explaining_query_execution \
+                or not sql.lstrip()[:6].upper() == 'SELECT':
+            return None
+
+        self.explaining = True
+        try:
+            with transaction.atomic(using=connection.alias):
+                try:
+                    with connection.cursor() as cursor:
+                        cursor.execute(f'{self.get_explain_prefix(connection)} {sql}', params)
+                        return '\n'.join(' '.join(str(x) for x in row) for row in cursor.fetchall())
+                finally:
+                    # Notice: ANALYZE executes the query, its effects (volatile functions, row locks) are rolled back
+                    transaction.set_rollback(True, using=connection.alias)
+        except DatabaseError:
+            return None
+        finally:
+            self.explaining = False
+
+    def handle_slow_query(self, connection, sql, params, duration):
+        if self.is_rate_limited(sql):
+            return
+
+        slow_query = {
+            'collection': self.collection,
+            'duration_ms': round(duration * 1000, 1),
+            'sql': sql,
+            'params': format_params(params),
+            'shape': self.shape,
+            'plan': self.explain(connection, sql, params),
+        }
+        logger.warning(f"Slow Forest Admin query on {self.collection} ({slow_query['duration_ms']} ms)",
+                       extra={'forest_slow_query': slow_query})
+
+
+def record_slow_queries(method):
+    """Log the slow queries of a view method, when FOREST['SLOW_QUERY_THRESHOLD_MS'] is set."""
+
+    @wraps(method)
+    def wrapper(view, request, *args, **kwargs):
+        threshold = get_forest_setting('SLOW_QUERY_THRESHOLD_MS')
+        if threshold is None:
+            return method(view, request, *args, **kwargs)
+
+        recorder = SlowQueryRecorder(view.Model._meta.db_table,
+                                     get_query_shape(get_params(request)),
+                                     float(threshold) / 1000)
+        with connections[router.db_for_read(view.Model)].execute_wrapper(recorder):
+            return method(view, request, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,279 @@
+import gc
+import threading
+import tracemalloc
+from contextlib import ExitStack
+from unittest import mock
+from urllib.parse import urlparse
+
+from django.db import connections
+from django.test import Client
+from jose import jwt
+
+from django_forest.utils.forest_api_requester import ForestApiRequester
+from django_forest.utils.forest_setting import get_forest_setting
+from django_forest.utils.ip_whitelist import IpWhitelist
+from django_forest.utils.permissions import Permission
+from django_forest.utils.schema import Schema
+from django_forest.utils.scope import ScopeManager
+from django_forest.utils.server_timing import record_server_timing
+
+DEFAULT_USER = {
+    'id': 1,
+    'email': 'test@forestadmin.com',
+    'first_name': 'Test',
+    'last_name': 'User',
+    'team': 'Operations',
+    'rendering_id': 1,
+}
+
+COLLECTION_PERMISSIONS = ('browseEnabled', 'readEnabled', 'editEnabled', 'addEnabled', 'deleteEnabled',
+                          'exportEnabled')
+
+
+def get_permissions(stats=None):
+    """Permissions allowing everything on the collections of the schema."""
+    collections = {}
+    for collection in Schema.schema['collections']:
+        collections[collection['name']] = {
+            'collection': {x: True for x in COLLECTION_PERMISSIONS},
+            'actions': {x['name']: {'triggerEnabled': True} for x in collection['actions']},
+        }
+    return {'data': {'collections': collections, 'renderings': {}}, 'stats': stats or {}}
+
+
+class StubResponse:
+    def __init__(self, data, status_code=200):
+        self.data = data
+        self.status_code = status_code
+        self.content = str(data).encode('utf-8')
+
+    def json(self):
+        return self.data
+
+
+class ForestApiStub:
+    """
+    Forest Admin API responses by route, recording the calls.
+
+    Permissions allow everything (see `get_permissions`), there are no scopes nor IP whitelist rules.
+    """
+
+    def __init__(self, permissions=None, scopes=None, ip_whitelist_rules=None):
+        self.routes = {
+            '/liana/v3/permissions': permissions if permissions is not None else get_permissions(),
+            '/liana/scopes': scopes or {},
+            '/liana/v1/ip-whitelist-rules': {
+                'data': {'attributes': {'use_ip_whitelist': bool(ip_whitelist_rules),
+                                        'rules': ip_whitelist_rules or []}}
+            },
+        }
+        self.calls = []
+
+    def request(self, method, url):
+        route = urlparse(url).path
+        self.calls.append((method, route))
+        if route not in self.routes:
+            return StubResponse({'errors': [{'detail': f'{route} is not stubbed'}]}, 404)
+        return StubResponse(self.routes[route])
+
+    def get(self, url, query=None, headers=None):
+        return self.request('GET', url)
+
+    def post(self, url, body=None, query=None, headers=None):
+        return self.request('POST', url)
+
+
+class ForestClient(Client):
+    """Django test client authenticated as a Forest Admin user, with a token signed by FOREST_AUTH_SECRET."""
+
+    def __init__(self, user=None, **defaults):
+        token = jwt.encode({**DEFAULT_USER, **(user or {})}, get_forest_setting('FOREST_AUTH_SECRET'),
+                           algorithm='HS256')
+        super().__init__(HTTP_AUTHORIZATION=f'Bearer {token}', **defaults)
+
+
+class ForestBudget:
+    """
+    Assert the maximum database queries, Forest Admin API calls and serialization time of a block.
+
+    The Forest Admin API is stubbed and the permission, scope and IP whitelist caches are emptied
+    on enter, so that the calls are counted the same way whatever the tests ran before.
+    """
+
+    def __init__(self, max_queries=None, max_api_calls=None, max_serialization_ms=None, api=None):
+        self.max_queries = max_queries
+        self.max_api_calls = max_api_calls
+        self.max_serialization_ms = max_serialization_ms
+        self.api = api or ForestApiStub()
+        self.stack = None
+        self.queries = []
+        self.server_timing = None
+
+    @property
+    def api_calls(self):
+        return self.api.calls
+
+    @property
+    def serialization_ms(self):
+        return self.server_timing.phases.get('serialize', [0, 0])[0] * 1000
+
+    def reset_caches(self):
+        self.stack.enter_context(mock.patch.object(Permission, 'permissions_cached', {}))
+        self.stack.enter_context(mock.patch.object(Permission, 'renderings_cached', {}))
+        self.stack.enter_context(mock.patch.object(ScopeManager, 'cache', {}))
+        self.stack.enter_context(mock.patch.object(IpWhitelist, 'fetched', False))
+
+    def __enter__(self):
+        self.stack = ExitStack()
+        self.reset_caches()
+        self.stack.enter_context(mock.patch.object(ForestApiRequester, 'get', self.api.get))
+        self.stack.enter_context(mock.patch.object(ForestApiRequester, 'post', self.api.post))
+        self.queries = []
+        for connection in connections.all():
+            self.stack.enter_context(connection.execute_wrapper(self))
+        self.server_timing = self.stack.enter_context(record_server_timing())
+        return self
+
+    def __call__(self, execute, sql, params, many, context):
+        # Notice: used as the execute wrapper of the database connections
+        self.queries.append(sql)
+        return execute(sql, params, many, context)
+
+    def get_errors(self):
+        errors = []
+        if self.max_queries is not None and len(self.queries) > self.max_queries:
+            queries = '\n'.join(f'{i}. {sql}' for i, sql in enumerate(self.queries, start=1))
+            errors.append(f'{len(self.queries)} queries executed, {self.max_queries} expected at most:\n{queries}')
+        if self.max_api_calls is not None and len(self.api_calls) > self.max_api_calls:
+            calls = ', '.join(f'{method} {route}' for method, route in self.api_calls)
+            errors.append(f'{len(self.api_calls)} Forest Admin API calls, {self.max_api_calls} expected at most: '
+                          f'{calls}')
+        if self.max_serialization_ms is not None and self.serialization_ms > self.max_serialization_ms:
+            errors.append(f'serialization took {self.serialization_ms:.1f}ms, '
+                          f'{self.max_serialization_ms}ms expected at most')
+        return errors
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stack.close()
+        if exc_type is None:
+            errors = self.get_errors()
+            if errors:
+                raise AssertionError('\n'.join(errors))
+        return False
+
+
+def forest_budget(max_queries=None, max_api_calls=None, max_serialization_ms=None, api=None):
+    """
+    Context manager asserting the budget of the Forest Admin requests of a block.
+
+        with forest_budget(max_queries=3, max_api_calls=2):
+            ForestClient().get('/forest/app_book')
+    """
+    return ForestBudget(max_queries, max_api_calls, max_serialization_ms, api)
+
+
+class ForestMemory:
+    """
+    Measure, and optionally assert, the peak and retained memory of a block, in bytes, with tracemalloc.
+
+    `peak` is the highest memory allocated in the block, `retained` what is still allocated after it
+    (garbage collected). With `rows`, the bounds are per row, e.g. the rows of an export.
+    """
+
+    def __init__(self, max_peak=None, max_retained=None, rows=None):
+        self.max_peak = max_peak
+        self.max_retained = max_retained
+        self.rows = rows
+        self.peak = None
+        self.retained = None
+        self.started = False
+        self.baseline = 0
+
+    def start(self):
+        gc.collect()
+        # Notice: the peak can only be reset by restarting the tracing before Python 3.9
+        if tracemalloc.is_tracing() and hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        else:
+            tracemalloc.stop()
+            tracemalloc.start()
+            self.started = True
+        self.baseline = tracemalloc.get_traced_memory()[0]
+
+    def stop(self):
+        peak = tracemalloc.get_traced_memory()[1]
+        gc.collect()
+        current = tracemalloc.get_traced_memory()[0]
+        if self.started:
+            tracemalloc.stop()
+        self.peak = peak - self.baseline
+        self.retained = max(current - self.baseline, 0)
+
+    def per_row(self, size):
+        return size / self.rows if self.rows else size
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def get_errors(self):
+        errors = []
+        unit = ' per row' if self.rows else ''
+        for name, size, limit in (('peak', self.peak, self.max_peak), ('retained', self.retained, self.max_retained)):
+            if limit is not None and self.per_row(size) > limit:
+                errors.append(f'{name} memory {self.per_row(size):.0f} bytes{unit}, '
+                              f'{limit} bytes{unit} expected at most')
+        return errors
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+        if exc_type is None:
+            errors = self.get_errors()
+            if errors:
+                raise AssertionError('\n'.join(errors))
+        return False
+
+    def __str__(self):
+        return f'peak {self.peak} bytes, retained {self.retained} bytes' + \
+            (f', {self.rows} rows' if self.rows else '')
+
+
+def forest_memory(max_peak=None, max_retained=None, rows=None):
+    """
+    Context manager asserting the peak and retained memory of a block, per row with `rows`.
+
+        with forest_memory(max_peak=2000, rows=1000):
+            ForestClient().get('/forest/app_book.csv', params)
+    """
+    return ForestMemory(max_peak, max_retained, rows)
+
+
+def join_threads(target, count):
+    threads = [threading.Thread(target=target, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def run_in_threads(func, count=8):
+    """
+    Call `func` from `count` threads started together, return their results.
+
+    The first exception raised in a thread is raised again.
+    """
+    barrier = threading.Barrier(count)
+    results = [None] * count
+    errors = []
+
+    def run(index):
+        barrier.wait()
+        try:
+            results[index] = func()
+        except Exception as e:
+            errors.append(e)
+
+    join_threads(run, count)
+    if errors:
+        raise errors[0]
+    return results
@@ -0,0 +1,129 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.signals import setting_changed
+from django.utils.module_loading import import_string
+
+from django_forest.utils.forest_setting import get_forest_setting
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+# Notice: the tracer of FOREST['TRACER'], loaded on the first span and reset when the settings change
+_tracer = _unset = object()
+
+
+class Span:
+    def __init__(self, name, attributes=None, parent=None):
+        self.name = name
+        self.attributes = attributes or {}
+        self.parent = parent
+        self.start_time = time.time()
+        self.end_time = None
+        self.error = None
+        # Notice: free for the tracers, e.g. to keep the span of their own tracing library
+        self.context = None
+
+    @property
+    def duration(self):
+        return self.end_time - self.start_time if self.end_time is not None else None
+
+    def __repr__(self):
+        return f'<Span {self.name} {self.attributes}>'
+
+
+class Tracer:
+    """
+    No-op tracer, to subclass in the tracer set as FOREST['TRACER'] (an instance, a class or their dotted path).
+
+    `start_span` is called when a Forest Admin phase starts, `end_span` when it ends, with its attributes.
+    """
+
+    def start_span(self, span):
+        pass
+
+    def end_span(self, span):
+        pass
+
+
+class MemoryTracer(Tracer):
+    """Keep the ended spans in memory, for tests."""
+
+    def __init__(self):
+        self.spans = []
+
+    def end_span(self, span):
+        self.spans.append(span)
+
+    def get_spans(self, name=None):
+        return [x for x in self.spans if name is None or x.name == name]
+
+    def clear(self):
+        self.spans = []
+
+
+def load_tracer(tracer):
+    if isinstance(tracer, str):
+        tracer = import_string(tracer)
+    if isinstance(tracer, type):
+        tracer = tracer()
+    return tracer
+
+
+def get_tracer():
+    global _tracer
+    # Notice: not a settings lookup on each of the instrumented calls, tracing is mostly off
+    if _tracer is _unset:
+        tracer = get_forest_setting('TRACER')
+        _tracer = load_tracer(tracer) if tracer else None
+    return _tracer
+
+
+def reset_tracers(setting, **kwargs):
+    global _tracer
+    if setting == 'FOREST':
+        _tracer = _unset
+
+
+setting_changed.connect(reset_tracers)
+
+
+def get_current_span():
+    return getattr(_local, 'span', None)
+
+
+def set_span_attributes(**attributes):
+    span = get_current_span()
+    if span is not None:
+        span.attributes.update(attributes)
+
+
+def call_tracer(method, span):
+    # Notice: a failing tracer never breaks a request
+    try:
+        method(span)
+    except Exception as e:
+        logger.warning(f'Tracer failed on span {span.name} ({e})')
+
+
+@contextmanager
+def trace(name, tracer=None, **attributes):
+    tracer = tracer or get_tracer()
+    if tracer is None:
+        yield None
+        return
+
+    span = Span(name, attributes, get_current_span())
+    _local.span = span
+    call_tracer(tracer.start_span, span)
+    try:
+        yield span
+    except Exception as e:
+        span.error = e
+        raise
+    finally:
+        span.end_time = time.time()
+        _local.span = span.parent
+        call_tracer(tracer.end_span, span)
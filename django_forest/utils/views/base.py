@@ -1,14 +1,24 @@
 import json
+import time
 
 from django.http import JsonResponse
 from django.views import generic
 
 from django_forest.resources.utils.queryset import QuerysetMixin
 from django_forest.utils import get_association_field, get_token
+from django_forest.utils.metrics import request_duration
 from django_forest.utils.models import Models
 
 
 class BaseView(QuerysetMixin, generic.View):
+    def dispatch(self, request, *args, **kwargs):
+        start = time.perf_counter()
+        response = super().dispatch(request, *args, **kwargs)
+        view = getattr(request.resolver_match, 'view_name', None) or self.__class__.__name__
+        request_duration.observe(time.perf_counter() - start,
+                                 view=view, method=request.method, status=response.status_code)
+        return response
+
     def is_authenticated(self, request):
         try:
             token = get_token(request)
@@ -0,0 +1,99 @@
+import logging
+import threading
+import time
+from functools import partial
+
+from django_forest.utils.forest_setting import get_forest_setting
+from django_forest.utils.ip_whitelist import IpWhitelist
+from django_forest.utils.permissions import Permission
+from django_forest.utils.scope import ScopeManager
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 10
+
+
+def get_rendering_ids_setting():
+    rendering_ids = get_forest_setting('WARMUP_RENDERING_IDS', [])
+    # Notice: comma separated from the environment
+    if isinstance(rendering_ids, str):
+        rendering_ids = rendering_ids.split(',')
+    return [str(x).strip() for x in rendering_ids if str(x).strip()]
+
+
+class Warmup:
+    """
+    Prefetch of the Forest Admin caches of a process: the IP whitelist rules, the permissions and the scopes.
+
+    Enabled by FOREST['WARMUP'], it runs in the background in the server workers only: started by
+    django_forest.utils.lifecycle.after_fork (the forks of preload_forest, or the post fork hook of the server),
+    or else by the first request of the readiness view, never by init_forest, which also runs in management
+    commands and task workers. The renderings are the
+    FOREST['WARMUP_RENDERING_IDS'] ones, and the ones cached by the parent before the fork.
+    The fetches run concurrently, `ready` is set when they are all done or after FOREST['WARMUP_TIMEOUT']
+    seconds, whichever comes first: a failing Forest Admin API never blocks the workers, it leaves the
+    fetches to the first requests.
+    """
+    ready = threading.Event()
+    thread = None
+    # Notice: the renderings cached before the last fork
+    cached_rendering_ids = []
+
+    @classmethod
+    def reset(cls):
+        # Notice: before the caches resets, see django_forest.utils.lifecycle.after_fork
+        cls.cached_rendering_ids = sorted(Permission.permissions_cached.keys() | ScopeManager.cache.keys())
+        cls.ready = threading.Event()
+        cls.thread = None
+
+    @staticmethod
+    def is_enabled():
+        return get_forest_setting('WARMUP', False)
+
+    @classmethod
+    def is_ready(cls):
+        return not cls.is_enabled() or cls.ready.is_set()
+
+    @classmethod
+    def get_rendering_ids(cls):
+        rendering_ids = get_rendering_ids_setting()
+        return rendering_ids + [x for x in cls.cached_rendering_ids if x not in rendering_ids]
+
+    @classmethod
+    def get_tasks(cls):
+        tasks = [('ip whitelist rules', IpWhitelist.warm)]
+        for rendering_id in cls.get_rendering_ids():
+            tasks.append((f'permissions of rendering {rendering_id}', partial(Permission.warm, rendering_id)))
+            tasks.append((f'scopes of rendering {rendering_id}', partial(ScopeManager.warm, rendering_id)))
+        return tasks
+
+    @staticmethod
+    def run_task(name, task):
+        try:
+            task()
+        except Exception as e:
+            logger.warning(f'Unable to warm up the {name} ({e}), it is fetched by the first request.')
+
+    @classmethod
+    def run(cls, timeout):
+        threads = [threading.Thread(target=cls.run_task, args=task, name='forest-warmup-task', daemon=True)
+                   for task in cls.get_tasks()]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + timeout
+        for thread in threads:
+            thread.join(max(deadline - time.monotonic(), 0))
+        if any(thread.is_alive() for thread in threads):
+            logger.warning(f'The Forest Admin caches warm up timed out after {timeout}s, the workers are ready anyway.')
+        cls.ready.set()
+
+    @classmethod
+    def start(cls):
+        if not cls.is_enabled() or cls.thread is not None:
+            return cls.thread
+
+        timeout = float(get_forest_setting('WARMUP_TIMEOUT', DEFAULT_TIMEOUT))
+        # Notice: daemon, a hanging fetch never delays the shutdown
+        cls.thread = threading.Thread(target=cls.run, args=(timeout,), name='forest-warmup', daemon=True)
+        cls.thread.start()
+        return cls.thread
@@ -1,4 +1,8 @@
 from django_forest.views.index import IndexView
+from django_forest.views.metrics import MetricsView
+from django_forest.views.profiles import ProfilesView, ProfileView
+from django_forest.views.readiness import ReadinessView
 from django_forest.views.scope_cache_invalidation import ScopeCacheInvalidationView
 
-__all__ = ['IndexView', 'ScopeCacheInvalidationView']
+__all__ = ['IndexView', 'MetricsView', 'ProfilesView', 'ProfileView', 'ReadinessView',
+           'ScopeCacheInvalidationView']
@@ -0,0 +1,23 @@
+import hmac
+
+from django.http import HttpResponse, JsonResponse
+
+from django_forest.utils.forest_setting import get_forest_setting
+from django_forest.utils.metrics import metrics
+from django_forest.utils.views.base import BaseView
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class MetricsView(BaseView):
+    def is_scraper(self, request):
+        # Notice: a scraper authenticates with the environment secret as a bearer token
+        secret = get_forest_setting('FOREST_ENV_SECRET')
+        authorization = request.headers.get('Authorization', '').split()
+        return bool(secret) and len(authorization) == 2 and hmac.compare_digest(authorization[1], secret)
+
+    def get(self, request, *args, **kwargs):
+        if not self.is_scraper(request) and not self.is_authenticated(request):
+            return JsonResponse({'errors': [{'detail': 'Please authenticate'}]}, status=403)
+
+        return HttpResponse(metrics.render(), content_type=CONTENT_TYPE)
@@ -0,0 +1,23 @@
+from django.http import FileResponse, JsonResponse
+
+from django_forest.utils.profiler import profiler
+from django_forest.utils.views.base import BaseView
+
+
+class ProfilesView(BaseView):
+    def dispatch(self, request, *args, **kwargs):
+        if not profiler.get_directory() or not profiler.is_authorized(self.is_authenticated(request)):
+            return JsonResponse({'errors': [{'detail': 'Not allowed to access the profiles'}]}, status=403)
+        return super().dispatch(request, *args, **kwargs)
+
+    def get(self, request, *args, **kwargs):
+        return JsonResponse({'profiles': profiler.list()})
+
+
+class ProfileView(ProfilesView):
+    def get(self, request, profile_id, *args, **kwargs):
+        path = profiler.get_path(profile_id)
+        if path is None:
+            return JsonResponse({'errors': [{'detail': f'profile {profile_id} not found'}]}, status=404)
+        return FileResponse(open(path, 'rb'), as_attachment=True, filename=f'{profile_id}.prof',
+                            content_type='application/octet-stream')
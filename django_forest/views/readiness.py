@@ -0,0 +1,15 @@
+from django.http import HttpResponse
+from django.views.generic import View
+
+from django_forest.utils.warmup import Warmup
+
+
+class ReadinessView(View):
+    """204 once the Forest Admin caches are warm (see Warmup), 503 before, for the health checks to wait on."""
+    # Notice: no Forest Admin checks, the health checks do not come from the whitelisted IPs
+    forest_checks_exempt = True
+
+    def get(self, request, *args, **kwargs):
+        # Notice: started by the first health check when no after fork hook did (no preload, runserver)
+        Warmup.start()
+        return HttpResponse(status=204 if Warmup.is_ready() else 503)